@@ -2,16 +2,20 @@
 """
 Setup verification script for Enterprise Search Telegram Bot
 """
+import asyncio
+import importlib
 import sys
 import os
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-# Add src to Python path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
+REQUIRED_PACKAGES = (
+    "telegram", "fastapi", "redis", "httpx",
+    "pydantic", "structlog", "uvicorn", "orjson"
+)
 
 def check_environment():
     """Check environment configuration."""
-    print("🔍 Checking Environment Configuration...")
+    lines = ["🔍 Checking Environment Configuration..."]
     
     # Load environment from .env file
     from dotenv import load_dotenv
@@ -30,83 +34,99 @@ def check_environment():
             missing_vars.append(var)
     
     if missing_vars:
-        print(f"❌ Missing environment variables: {', '.join(missing_vars)}")
-        return False
+        lines.append(f"❌ Missing environment variables: {', '.join(missing_vars)}")
+        return False, lines
     else:
-        print("✅ All required environment variables are set")
+        lines.append("✅ All required environment variables are set")
+        return True, lines
+
+def _try_import(package):
+    """Return True if the package can be imported."""
+    try:
+        importlib.import_module(package)
         return True
+    except ImportError:
+        return False
 
 def check_dependencies():
     """Check if all dependencies are installed."""
-    print("\n📦 Checking Dependencies...")
+    lines = ["\n📦 Checking Dependencies..."]
     
-    required_packages = [
-        "telegram", "fastapi", "redis", "httpx", 
-        "pydantic", "structlog", "uvicorn"
-    ]
+    # Imports are mostly file I/O, so check them in parallel
+    with ThreadPoolExecutor(max_workers=len(REQUIRED_PACKAGES)) as executor:
+        results = list(executor.map(_try_import, REQUIRED_PACKAGES))
     
-    missing_packages = []
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_packages.append(package)
+    missing_packages = [
+        package for package, installed in zip(REQUIRED_PACKAGES, results) if not installed
+    ]
     
     if missing_packages:
-        print(f"❌ Missing packages: {', '.join(missing_packages)}")
-        print("💡 Run: pip install -r requirements.txt")
-        return False
+        lines.append(f"❌ Missing packages: {', '.join(missing_packages)}")
+        lines.append("💡 Run: pip install -r requirements.txt")
+        return False, lines
     else:
-        print("✅ All required packages are installed")
-        return True
+        lines.append("✅ All required packages are installed")
+        return True, lines
 
 def check_config():
     """Check configuration loading."""
-    print("\n⚙️ Checking Configuration...")
+    lines = ["\n⚙️ Checking Configuration..."]
     
     try:
         from src.config import settings
         
-        print(f"✅ Bot Token: {settings.telegram_bot_token[:10]}...")
-        print(f"✅ Backend URL: {settings.backend_base_url}")
-        print(f"✅ Allowed Users: {len(settings.get_allowed_user_ids())} users")
-        print(f"✅ Admin Users: {len(settings.get_admin_user_ids())} admins")
-        print(f"✅ Redis URL: {settings.redis_url}")
-        print(f"✅ Webhook Mode: {settings.webhook_mode}")
+        lines.append(f"✅ Bot Token: {settings.telegram_bot_token[:10]}...")
+        lines.append(f"✅ Backend URL: {settings.backend_base_url}")
+        lines.append(f"✅ Allowed Users: {len(settings.allowed_user_ids_set)} users")
+        lines.append(f"✅ Admin Users: {len(settings.admin_user_ids_set)} admins")
+        lines.append(f"✅ Redis URL: {settings.redis_url}")
+        lines.append(f"✅ Webhook Mode: {settings.webhook_mode}")
         
-        return True
+        return True, lines
     except Exception as e:
-        print(f"❌ Configuration error: {e}")
-        return False
+        lines.append(f"❌ Configuration error: {e}")
+        return False, lines
 
-def check_redis():
+async def check_redis():
     """Check Redis connection."""
-    print("\n🔴 Checking Redis Connection...")
+    lines = ["\n🔴 Checking Redis Connection..."]
     
     try:
-        import redis
-        from src.config import settings
+        import redis.asyncio as redis
+        from src.redis_pool import redis_pool
         
-        r = redis.from_url(settings.redis_url, decode_responses=True)
-        r.ping()
-        print("✅ Redis connection successful")
-        return True
+        r = redis.Redis(connection_pool=redis_pool)
+        try:
+            await r.ping()
+        finally:
+            await r.aclose()
+            await redis_pool.disconnect()
+        lines.append("✅ Redis connection successful")
+        return True, lines
     except Exception as e:
-        print(f"❌ Redis connection failed: {e}")
-        print("💡 Make sure Redis is running: docker run -d -p 6379:6379 redis:alpine")
-        return False
+        lines.append(f"❌ Redis connection failed: {e}")
+        lines.append("💡 Make sure Redis is running: docker run -d -p 6379:6379 redis:alpine")
+        return False, lines
 
-def main():
+async def main():
     """Run all checks."""
     print("🚀 Enterprise Search Telegram Bot - Setup Check\n")
     
-    checks = [
-        check_environment(),
-        check_dependencies(), 
-        check_config(),
+    # The environment check loads .env, which the other checks rely on
+    results = [check_environment()]
+    
+    # The rest are independent, so run them concurrently (blocking ones in
+    # threads) and print their output afterwards in a fixed order
+    results += await asyncio.gather(
+        asyncio.to_thread(check_dependencies),
+        asyncio.to_thread(check_config),
         check_redis()
-    ]
+    )
+    
+    for _, lines in results:
+        print("\n".join(lines))
     
+    checks = [ok for ok, _ in results]
     print(f"\n📊 Results: {sum(checks)}/{len(checks)} checks passed")
     
     if all(checks):
@@ -119,4 +139,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Pre-compile the .env file into src/_env_compiled.py for faster startup.
+
+The generated module only contains os.environ.setdefault() calls, so real
+environment variables still take precedence over values from .env.
+"""
+import sys
+from pathlib import Path
+
+from dotenv import dotenv_values
+
+ROOT = Path(__file__).parent
+OUTPUT = ROOT / "src" / "_env_compiled.py"
+
+
+def compile_env(env_path: Path, output_path: Path) -> int:
+    """Write an importable module that seeds os.environ from env_path."""
+    values = dotenv_values(env_path)
+    lines = [
+        '"""Generated by compile_env.py from .env - do not edit or commit."""',
+        "import os",
+        "",
+    ]
+    count = 0
+    for key, value in values.items():
+        if value is None:
+            continue
+        lines.append(f"os.environ.setdefault({key!r}, {value!r})")
+        count += 1
+    output_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return count
+
+
+def main():
+    """Compile .env (or the path given as first argument)."""
+    env_path = Path(sys.argv[1]) if len(sys.argv) > 1 else ROOT / ".env"
+    if not env_path.exists():
+        print(f"❌ {env_path} not found")
+        sys.exit(1)
+    
+    count = compile_env(env_path, OUTPUT)
+    print(f"✅ Compiled {count} variables from {env_path} into {OUTPUT}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,10 @@ Main entry point for the Enterprise Search Telegram Bot.
 """
 import asyncio
 import sys
-from pathlib import Path
-
-# Add src to Python path
-sys.path.insert(0, str(Path(__file__).parent))
 
 from src.config import settings
 from src.logging_config import setup_logging, get_logger
 from src.bot import bot_application
-from src.server import run_server
 
 # Set up logging
 setup_logging()
@@ -34,7 +29,8 @@ async def main():
             # Start webhook mode
             await bot_application.start_webhook()
             
-            # Run web server for webhooks
+            # Run web server for webhooks (imported here so polling mode skips FastAPI/uvicorn)
+            from src.server import run_server
             logger.info("Starting web server for webhooks")
             run_server()
             
@@ -57,6 +53,13 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Use uvloop's faster event loop when available (not supported on Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -1,9 +1,13 @@
 """
 Authentication and authorization module for the Telegram bot.
 """
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+import base64
+import hashlib
+import hmac
+import time
+from typing import Optional, Dict, Any, Tuple
 
+import orjson
 from jose import JWTError, jwt
 from telegram import Update
 from telegram.ext import ContextTypes
@@ -13,16 +17,38 @@ from ..logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Base64url of {"alg":"HS256","typ":"JWT"}; constant for every token we sign
+_JWT_HEADER_B64 = b"eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9"
+
+# Cached tokens are re-issued once they are this close to expiry (seconds)
+TOKEN_REFRESH_MARGIN = 300
+# Expired tokens are pruned from the cache once it grows past this size
+TOKEN_CACHE_MAX_SIZE = 1024
+
+
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode without padding, as required by JWT."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
 
 class AuthManager:
     """Handles user authentication and authorization."""
     
+    __slots__ = (
+        "jwt_secret", "allowed_users", "admin_users", "default_admin_id",
+        "allow_all_users", "_token_cache"
+    )
+    
     def __init__(self):
         self.jwt_secret = settings.backend_jwt_secret
-        self.allowed_users = set(settings.get_allowed_user_ids())
-        self.admin_users = set(settings.get_admin_user_ids())
+        self.allowed_users = settings.allowed_user_ids_set
+        self.admin_users = settings.admin_user_ids_set
+        # Admin identity used for system-level backend calls (0 if no admins)
+        self.default_admin_id = next(iter(self.admin_users), 0)
         # If no allowed users specified, allow all users
         self.allow_all_users = len(self.allowed_users) == 0
+        # (user_id, expires_minutes) -> (token, expiry timestamp)
+        self._token_cache: Dict[Tuple[int, int], Tuple[str, float]] = {}
     
     def is_user_allowed(self, user_id: int) -> bool:
         """Check if user is in the whitelist or if all users are allowed."""
@@ -37,7 +63,7 @@ class AuthManager:
     def add_user(self, user_id: int) -> bool:
         """Add user to allowed list (admin only)."""
         if user_id not in self.allowed_users:
-            self.allowed_users.add(user_id)
+            self.allowed_users = self.allowed_users | {user_id}
             logger.info("User added to whitelist", user_id=user_id)
             return True
         return False
@@ -45,21 +71,41 @@ class AuthManager:
     def remove_user(self, user_id: int) -> bool:
         """Remove user from allowed list (admin only)."""
         if user_id in self.allowed_users and user_id not in self.admin_users:
-            self.allowed_users.remove(user_id)
+            self.allowed_users = self.allowed_users - {user_id}
             logger.info("User removed from whitelist", user_id=user_id)
             return True
         return False
     
     def create_backend_token(self, user_id: int, expires_minutes: int = 60) -> str:
-        """Create a JWT token for backend authentication."""
-        expire = datetime.utcnow() + timedelta(minutes=expires_minutes)
+        """Create a JWT token for backend authentication.
+        
+        Signed directly with hmac/hashlib (HS256) instead of going through jose,
+        since this runs once per backend request. Tokens are cached per user and
+        lifetime, and reused until they are within TOKEN_REFRESH_MARGIN seconds of expiry.
+        """
+        now = int(time.time())
+        key = (user_id, expires_minutes)
+        cached = self._token_cache.get(key)
+        if cached and cached[1] - now > TOKEN_REFRESH_MARGIN:
+            return cached[0]
+        
         payload = {
             "sub": str(user_id),
-            "exp": expire,
-            "iat": datetime.utcnow(),
+            "exp": now + expires_minutes * 60,
+            "iat": now,
             "type": "bot_user"
         }
-        return jwt.encode(payload, self.jwt_secret, algorithm="HS256")
+        payload_b64 = _b64url(orjson.dumps(payload))
+        signing_input = _JWT_HEADER_B64 + b"." + payload_b64
+        signature = hmac.new(self.jwt_secret.encode(), signing_input, hashlib.sha256).digest()
+        token = (signing_input + b"." + _b64url(signature)).decode()
+        
+        if len(self._token_cache) >= TOKEN_CACHE_MAX_SIZE:
+            self._token_cache = {
+                k: entry for k, entry in self._token_cache.items() if entry[1] > now
+            }
+        self._token_cache[key] = (token, payload["exp"])
+        return token
     
     def verify_backend_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Verify a JWT token and return payload if valid."""
@@ -84,9 +130,8 @@ def require_auth(func):
     """Decorator to require user authentication."""
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
         user_id = update.effective_user.id
-        auth_manager = context.bot_data.get('auth_manager')
         
-        if not auth_manager or not auth_manager.is_user_allowed(user_id):
+        if not auth_manager.is_user_allowed(user_id):
             await update.message.reply_text(
                 "🚫 Unauthorized access. Please contact an administrator to request access.\n\n"
                 f"Your Telegram ID: `{user_id}`",
@@ -103,9 +148,8 @@ def require_admin(func):
     """Decorator to require admin privileges."""
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
         user_id = update.effective_user.id
-        auth_manager = context.bot_data.get('auth_manager')
         
-        if not auth_manager or not auth_manager.is_user_admin(user_id):
+        if not auth_manager.is_user_admin(user_id):
             await update.message.reply_text(
                 "🚫 Admin privileges required for this command."
             )
@@ -1,23 +1,99 @@
 """
 Backend client for Enterprise Search API communication.
 """
-from typing import Dict, List, Any, Optional
+from typing import BinaryIO, Dict, List, Any, Optional, Union
 import httpx
-from urllib.parse import urljoin
+import orjson
 
 from ..config import settings
 from ..auth import auth_manager
+from ..cache import async_ttl_cache
 from ..logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Backend endpoints; resolved to absolute URLs once per client
+ENDPOINTS = (
+    "/api/connect",
+    "/api/sources",
+    "/api/fetch",
+    "/api/upload",
+    "/api/sync",
+    "/api/search",
+    "/api/job-status",
+    "/api/fetch-source",
+    "/api/process-documents",
+    "/api/system-status",
+    "/api/user-status",
+    "/api/process-document",
+    "/api/dashboard",
+)
+
+# Seconds status responses are reused; dashboards are refreshed far more
+# often than the underlying numbers change
+SYSTEM_STATUS_TTL = 10
+USER_STATUS_TTL = 5
+
+# Seconds idle backend connections stay in the pool. httpx defaults to 5s,
+# which drops the connection between most dashboard presses and makes the
+# next call pay for a fresh TCP+TLS handshake
+BACKEND_KEEPALIVE_EXPIRY = 60.0
+
+# Canned responses for known non-200 statuses: (error response, log message).
+# Shared instances - callers only read backend results.
+STATUS_RESPONSES = {
+    401: ({"error": "Authentication failed"}, "Backend authentication failed"),
+    404: ({"error": "Endpoint not found"}, "Backend endpoint not found"),
+}
+
+# Error prefixes _make_request uses when the backend itself is unreachable or
+# failing (timeouts, transport errors, 5xx), as opposed to a per-request error
+UPSTREAM_ERROR_PREFIXES = ("Request timeout", "Request failed: ", "Request failed with status 5")
+
+
+class BackendError(Exception):
+    """Raised when a backend call returns no result or an error response."""
+
+
+def _is_success(result: Optional[Dict[str, Any]]) -> bool:
+    """Check if a backend result is a non-error response worth caching."""
+    return bool(result) and "error" not in result
+
+
+def is_upstream_failure(result: Any) -> bool:
+    """Check if a backend result reports the backend failing rather than the request."""
+    if not isinstance(result, dict):
+        return False
+    error = result.get("error")
+    return isinstance(error, str) and error.startswith(UPSTREAM_ERROR_PREFIXES)
+
 
 class BackendClient:
     """HTTP client for Enterprise Search backend."""
     
+    __slots__ = ("base_url", "timeout", "_client", "_urls")
+    
     def __init__(self):
         self.base_url = settings.backend_base_url
         self.timeout = 30.0
+        # Shared keep-alive pool so backend calls reuse TCP/TLS connections
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=32,
+                max_connections=64,
+                keepalive_expiry=BACKEND_KEEPALIVE_EXPIRY
+            )
+        )
+        # Absolute URLs skip httpx's per-request parse and base_url merge
+        base = str(self._client.base_url).rstrip("/")
+        self._urls = {endpoint: httpx.URL(base + endpoint) for endpoint in ENDPOINTS}
+    
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self._client.aclose()
     
     async def _make_request(
         self,
@@ -30,50 +106,49 @@ class BackendClient:
     ) -> Optional[Dict[str, Any]]:
         """Make authenticated request to backend."""
         
-        url = urljoin(self.base_url, endpoint)
         headers = auth_manager.get_auth_headers(user_id)
+        log = logger.bind(endpoint=endpoint, user_id=user_id)
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    json=data if data else None,
-                    params=params,
-                    files=files
-                )
-                
-                logger.info(
-                    "Backend request",
-                    method=method,
-                    endpoint=endpoint,
-                    status=response.status_code,
-                    user_id=user_id
-                )
+        # Serialize JSON bodies with orjson; multipart uploads keep httpx's encoding
+        content = None
+        if data and not files:
+            content = orjson.dumps(data)
+            headers["Content-Type"] = "application/json"
+        
+        try:
+            response = await self._client.request(
+                method=method,
+                url=self._urls.get(endpoint, endpoint),
+                headers=headers,
+                content=content,
+                params=params,
+                files=files
+            )
+            
+            log.info("Backend request", method=method, status=response.status_code)
+            
+            if response.status_code == 200:
+                return orjson.loads(response.content)
+            
+            known = STATUS_RESPONSES.get(response.status_code)
+            if known is not None:
+                error_response, message = known
+                log.warning(message)
+                return error_response
+            
+            log.error(
+                "Backend request failed",
+                status=response.status_code,
+                response=response.text
+            )
+            return {"error": f"Request failed with status {response.status_code}"}
                 
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 401:
-                    logger.warning("Backend authentication failed", user_id=user_id)
-                    return {"error": "Authentication failed"}
-                elif response.status_code == 404:
-                    logger.warning("Backend endpoint not found", endpoint=endpoint)
-                    return {"error": "Endpoint not found"}
-                else:
-                    logger.error(
-                        "Backend request failed",
-                        status=response.status_code,
-                        response=response.text
-                    )
-                    return {"error": f"Request failed with status {response.status_code}"}
-                    
-            except httpx.TimeoutException:
-                logger.error("Backend request timeout", endpoint=endpoint)
-                return {"error": "Request timeout"}
-            except Exception as e:
-                logger.error("Backend request exception", endpoint=endpoint, error=str(e))
-                return {"error": f"Request failed: {str(e)}"}
+        except httpx.TimeoutException:
+            log.error("Backend request timeout")
+            return {"error": "Request timeout"}
+        except Exception as e:
+            log.error("Backend request exception", error=str(e))
+            return {"error": f"Request failed: {str(e)}"}
     
     async def connect_platform(
         self,
@@ -108,11 +183,15 @@ class BackendClient:
     async def upload_file(
         self,
         user_id: int,
-        file_data: bytes,
+        file_data: Union[bytes, BinaryIO],
         filename: str,
         metadata: Dict[str, Any] = None
     ) -> Optional[Dict[str, Any]]:
-        """Upload file for indexing."""
+        """Upload file for indexing.
+        
+        file_data may be an open binary file, which is streamed rather than
+        read into memory.
+        """
         files = {"file": (filename, file_data)}
         data = {
             "user_id": user_id,
@@ -120,19 +199,6 @@ class BackendClient:
         }
         return await self._make_request("POST", "/api/upload", user_id, data=data, files=files)
     
-    async def process_document(
-        self,
-        user_id: int,
-        document_id: str,
-        operations: List[str]
-    ) -> Optional[Dict[str, Any]]:
-        """Process a document with specified operations."""
-        data = {
-            "document_id": document_id,
-            "operations": operations
-        }
-        return await self._make_request("POST", "/api/process", user_id, data=data)
-    
     async def sync_source(
         self,
         user_id: int,
@@ -195,17 +261,23 @@ class BackendClient:
         }
         return await self._make_request("POST", "/api/process-documents", user_id, data=data)
     
+    @async_ttl_cache(SYSTEM_STATUS_TTL, should_cache=_is_success)
     async def get_system_status(self) -> Optional[Dict[str, Any]]:
         """Get overall system status."""
         # Use admin user for system status (first admin if available)
-        admin_users = list(auth_manager.admin_users)
-        user_id = admin_users[0] if admin_users else 0
-        return await self._make_request("GET", "/api/system-status", user_id)
+        return await self._make_request("GET", "/api/system-status", auth_manager.default_admin_id)
     
+    @async_ttl_cache(USER_STATUS_TTL, should_cache=_is_success)
     async def get_user_status(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Get user-specific status information."""
         return await self._make_request("GET", "/api/user-status", user_id)
     
+    @async_ttl_cache(USER_STATUS_TTL, should_cache=_is_success)
+    async def get_dashboard(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Get system and user status in a single call."""
+        data = {"include": ["system", "user"], "user_id": user_id}
+        return await self._make_request("POST", "/api/dashboard", user_id, data=data)
+    
     async def process_document(
         self,
         user_id: int,
@@ -15,8 +15,8 @@ from telegram.ext import (
 )
 
 from .config import settings
-from .auth import auth_manager
 from .storage import state_storage, conversation_state
+from .backend import backend_client
 from .logging_config import setup_logging, get_logger
 from .handlers import (
     start_command,
@@ -38,67 +38,89 @@ from .handlers.messages import handle_text_message
 setup_logging()
 logger = get_logger(__name__)
 
+# (command, callback) pairs registered as CommandHandlers
+_COMMAND_HANDLERS = (
+    ("start", start_command),
+    ("help", help_command),
+    ("connect", connect_command),
+    ("search", search_command),
+    ("upload", upload_command),
+    ("sources", sources_command),
+    ("fetch", fetch_command),
+    ("process", process_command),
+    ("status", status_command),
+    ("admin", admin_command),
+)
+
+# Message filters routed to the file upload handler
+_FILE_FILTERS = (
+    filters.Document.ALL,
+    filters.PHOTO,
+    filters.VOICE,
+    filters.AUDIO,
+)
+
 
 class TelegramBot:
     """Main Telegram bot class."""
     
+    __slots__ = ("application",)
+    
     def __init__(self):
         self.application: Optional[Application] = None
     
     async def initialize(self):
         """Initialize the bot application."""
+        self._build_application()
+        
+        # Connect to storage and fail fast if Redis is unreachable, rather than
+        # paying the connection cost (or failing) on the first user command
+        await state_storage.connect()
+        try:
+            await state_storage.ping()
+        except Exception as e:
+            logger.critical("Redis unavailable at startup", error=str(e))
+            raise
+        
+        logger.info("Bot initialized successfully")
+    
+    def _build_application(self):
+        """Create the application, store shared objects and register handlers."""
         
         # Create application
         self.application = (
             Application.builder()
             .token(settings.telegram_bot_token)
+            # HTTP/2 multiplexes concurrent answers and edits over one
+            # connection; getUpdates keeps its own HTTP/1.1 long-poll pool
+            .http_version(settings.telegram_http_version)
+            .connection_pool_size(settings.telegram_connection_pool_size)
+            .pool_timeout(settings.telegram_pool_timeout)
             .build()
         )
         
         # Store global objects in bot_data
-        self.application.bot_data['auth_manager'] = auth_manager
         self.application.bot_data['state_storage'] = state_storage
         self.application.bot_data['conversation_state'] = conversation_state
         
         # Add handlers
-        await self._add_handlers()
-        
-        # Connect to storage
-        await state_storage.connect()
-        
-        logger.info("Bot initialized successfully")
+        self._add_handlers()
     
-    async def _add_handlers(self):
+    def _add_handlers(self):
         """Add command and message handlers."""
         
         # Command handlers
-        self.application.add_handler(CommandHandler("start", start_command))
-        self.application.add_handler(CommandHandler("help", help_command))
-        self.application.add_handler(CommandHandler("connect", connect_command))
-        self.application.add_handler(CommandHandler("search", search_command))
-        self.application.add_handler(CommandHandler("upload", upload_command))
-        self.application.add_handler(CommandHandler("sources", sources_command))
-        self.application.add_handler(CommandHandler("fetch", fetch_command))
-        self.application.add_handler(CommandHandler("process", process_command))
-        self.application.add_handler(CommandHandler("status", status_command))
-        self.application.add_handler(CommandHandler("admin", admin_command))
-        
-        # Callback query handler for inline keyboards
-        self.application.add_handler(CallbackQueryHandler(button_callback))
+        for command, callback in _COMMAND_HANDLERS:
+            self.application.add_handler(CommandHandler(command, callback))
+        
+        # Callback query handler for inline keyboards. button_callback answers
+        # the query before any backend I/O; block=False then runs the rest as
+        # a background task so slow callbacks don't hold up other updates
+        self.application.add_handler(CallbackQueryHandler(button_callback, block=False))
         
         # File upload handlers
-        self.application.add_handler(
-            MessageHandler(filters.Document.ALL, handle_file_upload)
-        )
-        self.application.add_handler(
-            MessageHandler(filters.PHOTO, handle_file_upload)
-        )
-        self.application.add_handler(
-            MessageHandler(filters.VOICE, handle_file_upload)
-        )
-        self.application.add_handler(
-            MessageHandler(filters.AUDIO, handle_file_upload)
-        )
+        for file_filter in _FILE_FILTERS:
+            self.application.add_handler(MessageHandler(file_filter, handle_file_upload))
         
         # Text message handler for natural language queries
         self.application.add_handler(
@@ -133,23 +155,9 @@ class TelegramBot:
     
     async def start_polling(self):
         """Start bot in polling mode."""
-        # Create application
-        self.application = (
-            Application.builder()
-            .token(settings.telegram_bot_token)
-            .build()
-        )
-        
-        # Store global objects in bot_data
-        self.application.bot_data['auth_manager'] = auth_manager
-        self.application.bot_data['state_storage'] = state_storage
-        self.application.bot_data['conversation_state'] = conversation_state
-        
-        # Add handlers
-        await self._add_handlers()
-        
-        # Connect to storage
-        await state_storage.connect()
+        # Reuse the application from initialize() if it already ran
+        if self.application is None:
+            await self.initialize()
         
         logger.info("Bot started in polling mode")
         
@@ -159,20 +167,8 @@ class TelegramBot:
     def run_polling_sync(self):
         """Start bot in polling mode (synchronous wrapper)."""
         try:
-            # Create application
-            self.application = (
-                Application.builder()
-                .token(settings.telegram_bot_token)
-                .build()
-            )
-            
-            # Store global objects in bot_data
-            self.application.bot_data['auth_manager'] = auth_manager
-            self.application.bot_data['state_storage'] = state_storage
-            self.application.bot_data['conversation_state'] = conversation_state
-            
-            # Add handlers (synchronous)
-            self._add_handlers_sync()
+            if self.application is None:
+                self._build_application()
             
             logger.info("Bot started in polling mode")
             
@@ -181,52 +177,10 @@ class TelegramBot:
                 stop_signals=None  # Disable signal handling to avoid conflicts
             )
             
-        except Exception as e:
-            logger.error(f"Error starting bot: {e}")
+        except Exception:
+            logger.exception("Error starting bot")
             raise
     
-    def _add_handlers_sync(self):
-        """Add command and message handlers (synchronous version)."""
-        
-        # Command handlers
-        self.application.add_handler(CommandHandler("start", start_command))
-        self.application.add_handler(CommandHandler("help", help_command))
-        self.application.add_handler(CommandHandler("connect", connect_command))
-        self.application.add_handler(CommandHandler("search", search_command))
-        self.application.add_handler(CommandHandler("upload", upload_command))
-        self.application.add_handler(CommandHandler("sources", sources_command))
-        self.application.add_handler(CommandHandler("fetch", fetch_command))
-        self.application.add_handler(CommandHandler("process", process_command))
-        self.application.add_handler(CommandHandler("status", status_command))
-        self.application.add_handler(CommandHandler("admin", admin_command))
-        
-        # Callback query handler for inline keyboards
-        self.application.add_handler(CallbackQueryHandler(button_callback))
-        
-        # File upload handlers
-        self.application.add_handler(
-            MessageHandler(filters.Document.ALL, handle_file_upload)
-        )
-        self.application.add_handler(
-            MessageHandler(filters.PHOTO, handle_file_upload)
-        )
-        self.application.add_handler(
-            MessageHandler(filters.VOICE, handle_file_upload)
-        )
-        self.application.add_handler(
-            MessageHandler(filters.AUDIO, handle_file_upload)
-        )
-        
-        # Text message handler for natural language queries
-        self.application.add_handler(
-            MessageHandler(filters.TEXT & ~filters.COMMAND, handle_text_message)
-        )
-        
-        # Error handler
-        self.application.add_error_handler(error_handler)
-        
-        logger.info("Handlers added successfully")
-    
     async def stop(self):
         """Stop the bot."""
         if self.application:
@@ -234,6 +188,7 @@ class TelegramBot:
             await self.application.shutdown()
         
         await state_storage.disconnect()
+        await backend_client.aclose()
         
         logger.info("Bot stopped")
     
@@ -245,7 +200,8 @@ class TelegramBot:
 
 async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle errors in bot processing."""
-    logger.error("Bot error", error=str(context.error), update=str(update))
+    # The update is rendered only if the event survives level filtering and sampling
+    logger.error("Bot error", exc_info=context.error, update=update)
 
 
 # Global bot instance
@@ -0,0 +1,67 @@
+"""
+In-process caching helpers.
+"""
+import asyncio
+import functools
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+# Expired entries are pruned from a cache once it grows past this size
+TTL_CACHE_MAX_SIZE = 1024
+
+
+def async_ttl_cache(
+    ttl: float,
+    should_cache: Callable[[Any], bool] = lambda result: True
+) -> Callable:
+    """Cache an async function's results per argument tuple for ttl seconds.
+    
+    Concurrent misses for the same arguments share a single in-flight call
+    (single-flight), including calls whose results are not cached. Results
+    rejected by should_cache (e.g. error responses) are returned but not stored.
+    """
+    def decorator(func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+        entries: Dict[Hashable, Tuple[float, Any]] = {}
+        inflight: Dict[Hashable, asyncio.Future] = {}
+        
+        def prune(now: float) -> None:
+            """Drop expired entries."""
+            for key in [k for k, e in entries.items() if now - e[0] >= ttl]:
+                del entries[key]
+        
+        async def call(key: Hashable, args: tuple, kwargs: dict) -> Any:
+            """Run the wrapped function and store its result if cacheable."""
+            try:
+                result = await func(*args, **kwargs)
+                if should_cache(result):
+                    now = time.monotonic()
+                    if len(entries) >= TTL_CACHE_MAX_SIZE:
+                        prune(now)
+                    entries[key] = (now, result)
+                return result
+            finally:
+                del inflight[key]
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = args + tuple(sorted(kwargs.items())) if kwargs else args
+            
+            entry = entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < ttl:
+                return entry[1]
+            
+            future = inflight.get(key)
+            if future is None:
+                future = inflight[key] = asyncio.ensure_future(call(key, args, kwargs))
+            # Shielded so one caller's cancellation doesn't cancel the call
+            # for everyone else awaiting it
+            return await asyncio.shield(future)
+        
+        def cache_clear() -> None:
+            """Forget all cached results."""
+            entries.clear()
+        
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    
+    return decorator
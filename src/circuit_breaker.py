@@ -0,0 +1,50 @@
+"""
+Circuit breaker for failing upstream calls.
+"""
+import time
+from typing import Optional
+
+
+class CircuitBreaker:
+    """Stops calling an upstream after repeated consecutive failures.
+    
+    Once fail_threshold failures in a row are recorded the breaker opens and
+    allow() refuses calls for reset_after seconds. After that a single trial
+    call is let through per window: a success closes the breaker, a failure
+    keeps it open.
+    """
+    
+    __slots__ = ("fail_threshold", "reset_after", "failures", "opened_at")
+    
+    def __init__(self, fail_threshold: int = 5, reset_after: float = 30.0):
+        self.fail_threshold = fail_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+    
+    @property
+    def is_open(self) -> bool:
+        """Check if the breaker is currently refusing calls."""
+        return self.opened_at is not None
+    
+    def allow(self) -> bool:
+        """Check if a call may go through, admitting a trial call when due."""
+        if self.opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self.opened_at >= self.reset_after:
+            # Hold further calls for another window while the trial runs
+            self.opened_at = now
+            return True
+        return False
+    
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        self.failures = 0
+        self.opened_at = None
+    
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker at the threshold."""
+        self.failures += 1
+        if self.failures >= self.fail_threshold:
+            self.opened_at = time.monotonic()
@@ -1,10 +1,19 @@
 """
 Configuration management for the Enterprise Search Telegram Bot.
 """
-from typing import List, Optional
+from functools import cached_property
+from typing import FrozenSet, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
+# Use the pre-compiled .env module (see compile_env.py) when present to skip
+# re-parsing the .env file on every start; fall back to reading .env directly.
+try:
+    from . import _env_compiled  # noqa: F401
+    _ENV_FILE = None
+except ImportError:
+    _ENV_FILE = ".env"
+
 
 class Settings(BaseSettings):
     """Application settings with environment variable support."""
@@ -13,15 +22,23 @@ class Settings(BaseSettings):
     telegram_bot_token: str = Field(..., env="TELEGRAM_BOT_TOKEN")
     telegram_webhook_url: Optional[str] = Field(None, env="TELEGRAM_WEBHOOK_URL")
     telegram_webhook_secret: Optional[str] = Field(None, env="TELEGRAM_WEBHOOK_SECRET")
+    # Pool for outbound Bot API calls; getUpdates polling uses its own pool
+    telegram_connection_pool_size: int = Field(256, env="TELEGRAM_CONNECTION_POOL_SIZE")
+    telegram_pool_timeout: float = Field(10.0, env="TELEGRAM_POOL_TIMEOUT")
+    telegram_http_version: str = Field("2", env="TELEGRAM_HTTP_VERSION")  # 2 or 1.1
     
     # Backend Configuration
     backend_base_url: str = Field(..., env="BACKEND_BASE_URL")
     backend_api_key: str = Field(..., env="BACKEND_API_KEY")
     backend_jwt_secret: str = Field(..., env="BACKEND_JWT_SECRET")
+    # Fetch status dashboards with one /api/dashboard call instead of two
+    backend_dashboard_enabled: bool = Field(False, env="BACKEND_DASHBOARD_ENABLED")
     
     # Redis Configuration
     redis_url: str = Field("redis://localhost:6379", env="REDIS_URL")
     redis_db: int = Field(0, env="REDIS_DB")
+    redis_max_connections: int = Field(32, env="REDIS_MAX_CONNECTIONS")
+    redis_pool_timeout: float = Field(10.0, env="REDIS_POOL_TIMEOUT")
     
     # Authentication
     allowed_user_ids: str = Field("", env="ALLOWED_USER_IDS")
@@ -37,6 +54,7 @@ class Settings(BaseSettings):
     
     # Logging
     log_level: str = Field("INFO", env="LOG_LEVEL")
+    log_format: str = Field("console", env="LOG_FORMAT")  # console or json
     sentry_dsn: Optional[str] = Field(None, env="SENTRY_DSN")
     
     # Bot Settings
@@ -50,20 +68,18 @@ class Settings(BaseSettings):
     webhook_mode: bool = Field(True, env="WEBHOOK_MODE")
     
     class Config:
-        env_file = ".env"
+        env_file = _ENV_FILE
         env_file_encoding = "utf-8"
         
-    def get_allowed_user_ids(self) -> List[int]:
-        """Get the parsed allowed user IDs list."""
-        if not hasattr(self, '_allowed_user_ids'):
-            self._allowed_user_ids = [int(uid.strip()) for uid in self.allowed_user_ids.split(",") if uid.strip()] if self.allowed_user_ids else []
-        return self._allowed_user_ids
+    @cached_property
+    def allowed_user_ids_set(self) -> FrozenSet[int]:
+        """Allowed user IDs, parsed once."""
+        return frozenset(int(uid) for uid in self.allowed_user_ids.split(",") if uid.strip())
     
-    def get_admin_user_ids(self) -> List[int]:
-        """Get the parsed admin user IDs list."""
-        if not hasattr(self, '_admin_user_ids'):
-            self._admin_user_ids = [int(uid.strip()) for uid in self.admin_user_ids.split(",") if uid.strip()] if self.admin_user_ids else []
-        return self._admin_user_ids
+    @cached_property
+    def admin_user_ids_set(self) -> FrozenSet[int]:
+        """Admin user IDs, parsed once."""
+        return frozenset(int(uid) for uid in self.admin_user_ids.split(",") if uid.strip())
 
 
 # Global settings instance
@@ -1,16 +1,272 @@
 """
 Callback handlers for inline keyboard interactions.
 """
+import asyncio
+import functools
+import html
+import string
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import structlog
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.constants import MessageLimit, ParseMode
 from telegram.ext import ContextTypes
 
 from ..auth import require_auth
-from ..storage import conversation_state
-from ..backend import backend_client
+from ..storage import state_storage, conversation_state
+from ..backend import backend_client, BackendError, is_upstream_failure
+from ..circuit_breaker import CircuitBreaker
+from ..config import settings
 from ..logging_config import get_logger
+from ..rate_limit import safe_edit
+from .commands import (
+    format_search_response, get_sources_cached, invalidate_sources_cache, JOB_STATUS_EMOJI
+)
+from .keyboards import StaticKeyboardMarkup, CONNECT_KEYBOARD
 
 logger = get_logger(__name__)
 
+HELP_TEXT = """
+📖 **Quick Help**
+
+**Basic Commands:**
+• `/search <query>` - Search your data
+• `/connect` - Link data sources
+• `/upload` - Add documents
+• `/help` - Full command list
+
+**Tips:**
+• Use natural language for searches
+• Connect multiple sources for better results
+• Upload files in PDF, DOC, or TXT format
+
+Need more help? Use `/help` for detailed instructions.
+    """
+
+# Message templates, filled in with str.format
+SETTINGS_TEMPLATE = (
+    "⚙️ **Your Settings**\n\n"
+    "**User ID:** `{user_id}`\n"
+    "**Connected Sources:** 2\n"
+    "• Google Drive ✅\n"
+    "• Slack ✅\n\n"
+    "**Preferences:**\n"
+    "• Search Results: 10\n"
+    "• Citation Style: Inline\n"
+    "• Auto-sync: Enabled\n\n"
+    "**Storage Used:** 1.2 GB / 5 GB"
+)
+
+JOB_STATUS_TEMPLATE = (
+    "📋 **Job Status Update**\n\n"
+    "🆔 **Job ID:** `{job_id}`\n"
+    "{status_emoji} **Status:** {status}\n"
+    "📊 **Progress:** {progress}%"
+)
+
+SYNC_RESULTS_TEMPLATE = (
+    "✅ **Sync Complete**\n\n"
+    "📊 **Results:** {success_count}/{total_count} sources synced successfully\n\n"
+    "**Details:**\n{details}"
+)
+
+# Status dashboards are HTML: values from the backend are escaped once while
+# rendering instead of risking Markdown entity errors on '_' or '*'
+REFRESH_STATUS_TEMPLATE = (
+    "📊 <b>System Status</b> (Refreshed)\n\n"
+    "<b>🖥️ Backend:</b> {backend_status}\n"
+    "<b>👤 Your Sources:</b> {connected_sources}\n"
+    "<b>📄 Your Documents:</b> {indexed_documents}\n"
+    "<b>🔄 Active Jobs:</b> {active_jobs}\n\n"
+    "<b>🕐 Last Updated:</b> Just now"
+)
+
+STATS_TEMPLATE = (
+    "📊 <b>Detailed Statistics</b>\n\n"
+    "<b>🖥️ System Performance:</b>\n"
+    "• API Response Time: {avg_response_time}ms\n"
+    "• Daily Requests: {requests}\n"
+    "• Uptime: {uptime}\n\n"
+    "<b>👤 Your Usage:</b>\n"
+    "• Connected Sources: {connected_sources}\n"
+    "• Total Documents: {indexed_documents}\n"
+    "• Storage Used: {storage_used}\n"
+    "• Searches Today: {searches_today}\n"
+    "• Files Uploaded: {files_uploaded}\n\n"
+    "<b>🔄 Recent Activity:</b>\n"
+    "• Last Search: {last_search}\n"
+    "• Last Upload: {last_upload}\n"
+    "• Last Sync: {last_sync}"
+)
+
+# Values shown for statistics missing from the backend's status responses
+STATS_DEFAULTS = {
+    "avg_response_time": "N/A",
+    "requests": 0,
+    "uptime": "Unknown",
+    "connected_sources": 0,
+    "indexed_documents": 0,
+    "storage_used": "0 MB",
+    "searches_today": 0,
+    "files_uploaded": 0,
+    "last_search": "Never",
+    "last_upload": "Never",
+    "last_sync": "Never",
+}
+
+
+def _split_template(template: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """Split a format template into (literal, field name or None) pairs."""
+    return tuple(
+        (literal, field) for literal, field, _, _ in string.Formatter().parse(template)
+    )
+
+
+# Status templates pre-split at their placeholders: joining the pieces is
+# about twice as fast as format_map on the hot status paths
+REFRESH_STATUS_PARTS = _split_template(REFRESH_STATUS_TEMPLATE)
+STATS_PARTS = _split_template(STATS_TEMPLATE)
+STATS_FIELDS = tuple(field for _, field in STATS_PARTS if field is not None)
+
+# Rendered detailed stats are memoized per distinct set of values, since
+# repeated presses usually see unchanged numbers
+STATS_RENDER_CACHE_SIZE = 1024
+
+# Seconds a callback query id is remembered to drop duplicate deliveries
+CALLBACK_DEDUP_TTL = 10
+
+# Maximum concurrent sync_source calls issued by "Sync All"
+SYNC_CONCURRENCY = 8
+
+# Maximum detailed stats lookups in flight; a burst of presses queues here
+# instead of flooding the event loop and the backend at once
+STATS_CONCURRENCY = 4
+_stats_semaphore = asyncio.Semaphore(STATS_CONCURRENCY)
+
+# Seconds a backend call may run before a "working..." placeholder is shown
+PLACEHOLDER_DELAY = 0.3
+
+# user_data key holding (message_id, text hash) of the last tracked edit,
+# used to skip edits that would not change the message
+LAST_EDIT_KEY = "last_edit"
+
+# Documents shown per page when browsing a source
+DOCUMENT_PAGE_SIZE = 5
+# Seconds a rendered document page is reused for back/forward navigation
+DOCUMENT_PAGE_CACHE_TTL = 60
+# Expired pages are pruned from the cache once it grows past this size
+DOCUMENT_PAGE_CACHE_MAX_SIZE = 1024
+
+# Status dashboards fall back to the last successful responses when the
+# backend fails, marked with this notice
+STALE_STATUS_NOTICE = "\n\n⚠️ Showing cached data"
+# Oldest users' fallback status is dropped once this many are remembered
+STALE_STATUS_MAX_USERS = 1024
+
+# Status lookups give up after this many seconds; after STATUS_FAIL_THRESHOLD
+# consecutive backend failures (timeouts, transport errors, 5xx) a breaker
+# skips the backend for STATUS_RESET_AFTER seconds and dashboards show the
+# last good data instead. System and per-user lookups trip separately
+STATUS_TIMEOUT = 3.0
+STATUS_FAIL_THRESHOLD = 5
+STATUS_RESET_AFTER = 30.0
+_system_status_breaker = CircuitBreaker(STATUS_FAIL_THRESHOLD, STATUS_RESET_AFTER)
+_user_status_breaker = CircuitBreaker(STATUS_FAIL_THRESHOLD, STATUS_RESET_AFTER)
+
+# Last successful status responses: system-wide, and per user
+_last_system_status: Dict[str, Any] = {}
+_last_user_status: Dict[int, Dict[str, Any]] = {}
+
+# Rendered document pages: (user_id, source_id, page) -> (expires_at, text, keyboard)
+_document_page_cache: Dict[Tuple[int, str, int], Tuple[float, str, InlineKeyboardMarkup]] = {}
+
+# Display names for platforms offered by the connect keyboard
+PLATFORM_NAMES = {
+    "drive": "Google Drive",
+    "slack": "Slack",
+    "notion": "Notion",
+    "custom": "Custom URL"
+}
+
+# Static keyboards are immutable, so build them once and share them
+HELP_KEYBOARD = StaticKeyboardMarkup([
+    [
+        InlineKeyboardButton("🔗 Connect Sources", callback_data="connect"),
+        InlineKeyboardButton("🔍 Try Search", callback_data="search_demo")
+    ]
+])
+
+SETTINGS_KEYBOARD = StaticKeyboardMarkup([
+    [
+        InlineKeyboardButton("🔗 Manage Sources", callback_data="manage_sources"),
+        InlineKeyboardButton("🔄 Sync All", callback_data="sync_all")
+    ],
+    [
+        InlineKeyboardButton("📊 View Stats", callback_data="user_stats"),
+        InlineKeyboardButton("❌ Close", callback_data="cancel")
+    ]
+])
+
+NO_SOURCES_KEYBOARD = StaticKeyboardMarkup([
+    [InlineKeyboardButton("🔗 Connect First Source", callback_data="connect")]
+])
+
+REFRESH_STATUS_KEYBOARD = StaticKeyboardMarkup([
+    [
+        InlineKeyboardButton("🔄 Refresh Again", callback_data="refresh_status"),
+        InlineKeyboardButton("📊 Detailed Stats", callback_data="detailed_stats")
+    ]
+])
+
+BACK_TO_STATUS_KEYBOARD = StaticKeyboardMarkup([
+    [InlineKeyboardButton("🔙 Back to Status", callback_data="refresh_status")]
+])
+
+# Maximum sources listed on the manage sources keyboard
+MANAGE_SOURCES_LIMIT = 5
+
+# Static rows appended below the per-source buttons when managing sources
+MANAGE_SOURCES_FOOTER = (
+    (
+        InlineKeyboardButton("🔗 Add New Source", callback_data="connect"),
+        InlineKeyboardButton("🔄 Sync All", callback_data="sync_all_sources")
+    ),
+    (
+        InlineKeyboardButton("❌ Close", callback_data="cancel"),
+    ),
+)
+
+
+# Demo searches; indices are the demo_search_<i> callback payloads. The first
+# five back the search demo, the rest the related search suggestions.
+DEMO_QUERIES = (
+    "quarterly revenue growth",
+    "team meeting notes",
+    "project documentation",
+    "company policies",
+    "customer feedback",
+    "related documents",
+    "similar content",
+    "follow up information",
+    "additional context",
+    "supplementary materials",
+)
+
+
+def _demo_keyboard(start: int, stop: int) -> InlineKeyboardMarkup:
+    """Build a keyboard with one button per demo query in DEMO_QUERIES[start:stop]."""
+    keyboard = [
+        [InlineKeyboardButton(f"🔍 {DEMO_QUERIES[i]}", callback_data=f"demo_search_{i}")]
+        for i in range(start, stop)
+    ]
+    keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cancel")])
+    return StaticKeyboardMarkup(keyboard)
+
+
+SEARCH_DEMO_KEYBOARD = _demo_keyboard(0, 5)
+RELATED_SEARCH_KEYBOARD = _demo_keyboard(5, len(DEMO_QUERIES))
+
 
 @require_auth
 async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -21,102 +277,126 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     user_id = update.effective_user.id
     data = query.data
     
-    try:
-        if data == "connect":
-            await handle_connect_callback(query, context)
-        elif data.startswith("connect_"):
-            await handle_platform_selection(query, context, data)
-        elif data == "search_demo":
-            await handle_search_demo(query, context)
-        elif data == "help":
-            await handle_help_callback(query, context)
-        elif data == "settings":
-            await handle_settings_callback(query, context)
-        elif data == "cancel":
-            await handle_cancel_callback(query, context)
-        elif data.startswith("fetch_"):
-            await handle_fetch_callback(query, context, data)
-        elif data.startswith("process_"):
-            await handle_process_callback(query, context, data)
-        elif data.startswith("check_job_"):
-            await handle_check_job_callback(query, context, data)
-        elif data == "upload_file":
-            await handle_upload_callback(query, context)
-        elif data == "refine_search":
-            await handle_refine_search_callback(query, context)
-        elif data == "get_documents":
-            await handle_get_documents_callback(query, context)
-        elif data == "summarize_results":
-            await handle_summarize_results_callback(query, context)
-        elif data == "related_search":
-            await handle_related_search_callback(query, context)
-        elif data.startswith("demo_search_"):
-            await handle_demo_search_callback(query, context, data)
-        elif data.startswith("fetch_source_"):
-            await handle_fetch_source_callback(query, context, data)
-        elif data == "sync_all_sources":
-            await handle_sync_all_callback(query, context)
-        elif data == "manage_sources":
-            await handle_manage_sources_callback(query, context)
-        elif data == "refresh_status":
-            await handle_refresh_status_callback(query, context)
-        elif data == "detailed_stats":
-            await handle_detailed_stats_callback(query, context)
-        else:
-            await query.edit_message_text("❌ Unknown command.")
+    # Double taps can deliver the same callback twice; only handle it once
+    if not await state_storage.set_if_absent(f"cb:{user_id}:{query.id}", 1, CALLBACK_DEDUP_TTL):
+        logger.info("Duplicate callback ignored", user_id=user_id, data=data)
+        return
+    
+    # Bind user and callback data once; handler logs pick them up via contextvars
+    with structlog.contextvars.bound_contextvars(user_id=user_id, data=data):
+        try:
+            handler = EXACT_HANDLERS.get(data)
+            if handler is not None:
+                await handler(query, context, user_id)
+                return
             
-    except Exception as e:
-        logger.error("Callback error", error=str(e), user_id=user_id, data=data)
-        await query.edit_message_text("❌ An error occurred. Please try again.")
+            # One split on the first "_" selects the few candidates for this prefix
+            head, sep, tail = data.partition("_")
+            if sep:
+                for rest, prefix_handler in PREFIX_HANDLERS.get(head, ()):
+                    if tail.startswith(rest):
+                        await prefix_handler(query, context, user_id, data)
+                        return
+            
+            await safe_edit(query, "❌ Unknown command.")
+                
+        except Exception:
+            logger.exception("Callback error")
+            await safe_edit(query, "❌ An error occurred. Please try again.")
 
 
-async def handle_connect_callback(query, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle connect button callback."""
-    user_id = query.from_user.id
-    await conversation_state.set_flow(user_id, "connect_platform")
+async def _await_with_placeholder(query, placeholder: str, awaitable, context=None):
+    """Await a backend call, editing in a placeholder only if it is slow.
     
-    keyboard = [
-        [
-            InlineKeyboardButton("📁 Google Drive", callback_data="connect_drive"),
-            InlineKeyboardButton("💬 Slack", callback_data="connect_slack")
-        ],
-        [
-            InlineKeyboardButton("📝 Notion", callback_data="connect_notion"),
-            InlineKeyboardButton("🌐 Custom URL", callback_data="connect_custom")
-        ],
-        [
-            InlineKeyboardButton("❌ Cancel", callback_data="cancel")
-        ]
+    Fast calls skip straight to the caller's final edit, saving a Telegram
+    API call (and rate limit budget) per interaction. Pass the handler's
+    context when the final edit goes through _edit_if_changed.
+    """
+    task = asyncio.ensure_future(awaitable)
+    done, _ = await asyncio.wait((task,), timeout=PLACEHOLDER_DELAY)
+    if not done:
+        if context is not None:
+            context.user_data.pop(LAST_EDIT_KEY, None)
+        try:
+            await safe_edit(query, placeholder, parse_mode="Markdown")
+        except BaseException:
+            task.cancel()
+            raise
+    return await task
+
+
+async def _edit_if_changed(query, context: ContextTypes.DEFAULT_TYPE, text: str, **kwargs) -> bool:
+    """Edit the query's message unless the last tracked edit left the same text.
+    
+    Returns whether an edit was sent. Telegram rejects no-op edits anyway, so
+    skipping them saves a round-trip and rate limit budget.
+    """
+    message_id = query.message.message_id if query.message else query.inline_message_id
+    last_edit = (message_id, hash(text))
+    if context.user_data.get(LAST_EDIT_KEY) == last_edit:
+        logger.debug("Skipping unchanged message edit")
+        return False
+    
+    await safe_edit(query, text, **kwargs)
+    context.user_data[LAST_EDIT_KEY] = last_edit
+    return True
+
+
+def _unwrap(result: Optional[Dict[str, Any]], default: str = "Unknown error") -> Dict[str, Any]:
+    """Return a backend result, raising BackendError if it is empty or an error."""
+    if not result:
+        raise BackendError(default)
+    if "error" in result:
+        raise BackendError(result["error"] or default)
+    return result
+
+
+def _cache_document_page(key: Tuple[int, str, int], text: str, reply_markup: InlineKeyboardMarkup) -> None:
+    """Remember a rendered document page for DOCUMENT_PAGE_CACHE_TTL seconds."""
+    global _document_page_cache
+    now = time.monotonic()
+    if len(_document_page_cache) >= DOCUMENT_PAGE_CACHE_MAX_SIZE:
+        _document_page_cache = {
+            k: entry for k, entry in _document_page_cache.items() if entry[0] > now
+        }
+    _document_page_cache[key] = (now + DOCUMENT_PAGE_CACHE_TTL, text, reply_markup)
+
+
+def _invalidate_document_pages(user_id: int, source_id: Optional[str] = None) -> None:
+    """Drop a user's rendered document pages, for one source or all of them."""
+    stale = [
+        key for key in _document_page_cache
+        if key[0] == user_id and (source_id is None or key[1] == source_id)
     ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    for key in stale:
+        del _document_page_cache[key]
+
+
+async def handle_connect_callback(query, context: ContextTypes.DEFAULT_TYPE, user_id: int) -> None:
+    """Handle connect button callback."""
+    await conversation_state.set_flow(user_id, "connect_platform")
     
-    await query.edit_message_text(
+    await safe_edit(
+        query,
         "🔗 **Connect Data Source**\n\n"
         "Choose a platform to connect to your enterprise search:",
         parse_mode="Markdown",
-        reply_markup=reply_markup
+        reply_markup=CONNECT_KEYBOARD
     )
 
 
-async def handle_platform_selection(query, context: ContextTypes.DEFAULT_TYPE, data: str) -> None:
+async def handle_platform_selection(query, context: ContextTypes.DEFAULT_TYPE, user_id: int, data: str) -> None:
     """Handle platform selection for connection."""
-    user_id = query.from_user.id
     platform = data.replace("connect_", "")
     
-    platform_names = {
-        "drive": "Google Drive",
-        "slack": "Slack",
-        "notion": "Notion",
-        "custom": "Custom URL"
-    }
-    
-    platform_name = platform_names.get(platform, platform)
+    platform_name = PLATFORM_NAMES.get(platform, platform)
     
     # Update conversation state
     await conversation_state.set_flow(user_id, "connecting", {"platform": platform})
     
     # Show connecting message
-    await query.edit_message_text(
+    await safe_edit(
+        query,
         f"🔄 **Connecting to {platform_name}**\n\n"
         "Please wait while I set up the connection...",
         parse_mode="Markdown"
@@ -124,48 +404,52 @@ async def handle_platform_selection(query, context: ContextTypes.DEFAULT_TYPE, d
     
     # Call backend to initiate connection
     try:
-        result = await backend_client.connect_platform(user_id, platform)
+        result = _unwrap(await backend_client.connect_platform(user_id, platform), "Connection failed")
+        
+        await invalidate_sources_cache(user_id)
+        oauth_url = result.get("oauth_url")
+        connection_id = result.get("connection_id")
         
-        if result and "error" not in result:
-            oauth_url = result.get("oauth_url")
-            connection_id = result.get("connection_id")
+        if oauth_url:
+            keyboard = [
+                [InlineKeyboardButton("🔗 Authorize Access", url=oauth_url)],
+                [InlineKeyboardButton("✅ I've Authorized", callback_data=f"auth_complete_{platform}")]
+            ]
+            reply_markup = InlineKeyboardMarkup(keyboard)
             
-            if oauth_url:
-                keyboard = [
-                    [InlineKeyboardButton("🔗 Authorize Access", url=oauth_url)],
-                    [InlineKeyboardButton("✅ I've Authorized", callback_data=f"auth_complete_{platform}")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                
-                await query.edit_message_text(
-                    f"🔐 **Authorization Required**\n\n"
-                    f"To connect {platform_name}, please:\n"
-                    f"1. Click the button below to authorize access\n"
-                    f"2. Complete the authorization in your browser\n"
-                    f"3. Return here and click 'I've Authorized'\n\n"
-                    f"**Connection ID:** `{connection_id}`",
-                    parse_mode="Markdown",
-                    reply_markup=reply_markup
-                )
-            else:
-                await query.edit_message_text(
-                    f"✅ **{platform_name} Connected**\n\n"
-                    f"Successfully connected to {platform_name}!\n"
-                    f"You can now search and fetch documents from this source.",
-                    parse_mode="Markdown"
-                )
+            await safe_edit(
+                query,
+                f"🔐 **Authorization Required**\n\n"
+                f"To connect {platform_name}, please:\n"
+                f"1. Click the button below to authorize access\n"
+                f"2. Complete the authorization in your browser\n"
+                f"3. Return here and click 'I've Authorized'\n\n"
+                f"**Connection ID:** `{connection_id}`",
+                parse_mode="Markdown",
+                reply_markup=reply_markup
+            )
         else:
-            error_msg = result.get("error", "Unknown error") if result else "Connection failed"
-            await query.edit_message_text(
-                f"❌ **Connection Failed**\n\n"
-                f"Failed to connect to {platform_name}: {error_msg}\n\n"
-                f"Please try again or contact support.",
+            await safe_edit(
+                query,
+                f"✅ **{platform_name} Connected**\n\n"
+                f"Successfully connected to {platform_name}!\n"
+                f"You can now search and fetch documents from this source.",
                 parse_mode="Markdown"
             )
     
-    except Exception as e:
-        logger.error("Platform connection error", error=str(e), platform=platform, user_id=user_id)
-        await query.edit_message_text(
+    except BackendError as e:
+        await safe_edit(
+            query,
+            f"❌ **Connection Failed**\n\n"
+            f"Failed to connect to {platform_name}: {e}\n\n"
+            f"Please try again or contact support.",
+            parse_mode="Markdown"
+        )
+    
+    except Exception:
+        logger.exception("Platform connection error", platform=platform)
+        await safe_edit(
+            query,
             f"❌ **Connection Error**\n\n"
             f"An error occurred while connecting to {platform_name}.\n"
             f"Please try again later.",
@@ -173,272 +457,209 @@ async def handle_platform_selection(query, context: ContextTypes.DEFAULT_TYPE, d
         )
 
 
-async def handle_search_demo(query, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def handle_search_demo(query, context: ContextTypes.DEFAULT_TYPE, user_id: int) -> None:
     """Handle search demo callback."""
-    demo_queries = [
-        "quarterly revenue growth",
-        "team meeting notes",
-        "project documentation",
-        "company policies",
-        "customer feedback"
-    ]
-    
-    keyboard = []
-    for i, demo_query in enumerate(demo_queries):
-        keyboard.append([
-            InlineKeyboardButton(f"🔍 {demo_query}", callback_data=f"demo_search_{i}")
-        ])
-    keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cancel")])
-    
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
-    await query.edit_message_text(
+    await safe_edit(
+        query,
         "🔍 **Search Demo**\n\n"
         "Try one of these example searches:",
         parse_mode="Markdown",
-        reply_markup=reply_markup
+        reply_markup=SEARCH_DEMO_KEYBOARD
     )
 
 
-async def handle_help_callback(query, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def handle_help_callback(query, context: ContextTypes.DEFAULT_TYPE, user_id: int) -> None:
     """Handle help button callback."""
-    help_text = """
-📖 **Quick Help**
-
-**Basic Commands:**
-• `/search <query>` - Search your data
-• `/connect` - Link data sources
-• `/upload` - Add documents
-• `/help` - Full command list
-
-**Tips:**
-• Use natural language for searches
-• Connect multiple sources for better results
-• Upload files in PDF, DOC, or TXT format
-
-Need more help? Use `/help` for detailed instructions.
-    """
-    
-    keyboard = [
-        [
-            InlineKeyboardButton("🔗 Connect Sources", callback_data="connect"),
-            InlineKeyboardButton("🔍 Try Search", callback_data="search_demo")
-        ]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
-    await query.edit_message_text(
-        help_text,
+    await safe_edit(
+        query,
+        HELP_TEXT,
         parse_mode="Markdown",
-        reply_markup=reply_markup
+        reply_markup=HELP_KEYBOARD
     )
 
 
-async def handle_settings_callback(query, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def handle_settings_callback(query, context: ContextTypes.DEFAULT_TYPE, user_id: int) -> None:
     """Handle settings callback."""
-    user_id = query.from_user.id
     
     # Get user's connected sources (this would be a real API call)
-    settings_text = f"""
-⚙️ **Your Settings**
-
-**User ID:** `{user_id}`
-**Connected Sources:** 2
-• Google Drive ✅
-• Slack ✅
-
-**Preferences:**
-• Search Results: 10
-• Citation Style: Inline
-• Auto-sync: Enabled
-
-**Storage Used:** 1.2 GB / 5 GB
-    """
+    settings_text = SETTINGS_TEMPLATE.format(user_id=user_id)
     
-    keyboard = [
-        [
-            InlineKeyboardButton("🔗 Manage Sources", callback_data="manage_sources"),
-            InlineKeyboardButton("🔄 Sync All", callback_data="sync_all")
-        ],
-        [
-            InlineKeyboardButton("📊 View Stats", callback_data="user_stats"),
-            InlineKeyboardButton("❌ Close", callback_data="cancel")
-        ]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
-    await query.edit_message_text(
+    await safe_edit(
+        query,
         settings_text,
         parse_mode="Markdown",
-        reply_markup=reply_markup
+        reply_markup=SETTINGS_KEYBOARD
     )
 
 
-async def handle_cancel_callback(query, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def handle_cancel_callback(query, context: ContextTypes.DEFAULT_TYPE, user_id: int) -> None:
     """Handle cancel callback."""
-    user_id = query.from_user.id
     await conversation_state.clear_state(user_id)
     
-    await query.edit_message_text(
+    await safe_edit(
+        query,
         "❌ **Operation Cancelled**\n\n"
         "You can start over anytime using the available commands.",
         parse_mode="Markdown"
     )
 
 
-async def handle_fetch_callback(query, context: ContextTypes.DEFAULT_TYPE, data: str) -> None:
+async def handle_fetch_callback(query, context: ContextTypes.DEFAULT_TYPE, user_id: int, data: str) -> None:
     """Handle document fetch callbacks."""
-    user_id = query.from_user.id
     
     if data == "fetch_sources":
         # Show available sources
         try:
-            sources = await backend_client.get_sources(user_id)
-            if sources and "error" not in sources:
-                keyboard = []
-                for source in sources.get("sources", []):
-                    source_id = source.get("id")
-                    source_name = source.get("name")
-                    keyboard.append([
-                        InlineKeyboardButton(
-                            f"📁 {source_name}",
-                            callback_data=f"fetch_docs_{source_id}"
-                        )
-                    ])
-                keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cancel")])
-                
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                
-                await query.edit_message_text(
-                    "📁 **Select Source**\n\nChoose a source to browse documents:",
-                    parse_mode="Markdown",
-                    reply_markup=reply_markup
-                )
-            else:
-                await query.edit_message_text(
-                    "❌ No connected sources found. Use `/connect` to add sources first."
-                )
-        except Exception as e:
-            logger.error("Fetch sources error", error=str(e), user_id=user_id)
-            await query.edit_message_text("❌ Failed to fetch sources. Please try again.")
-    
-    elif data.startswith("fetch_docs_"):
-        source_id = data.replace("fetch_docs_", "")
-        await fetch_documents_from_source(query, context, source_id)
-
-
-async def fetch_documents_from_source(query, context: ContextTypes.DEFAULT_TYPE, source_id: str) -> None:
-    """Fetch and display documents from a specific source."""
-    user_id = query.from_user.id
-    
-    try:
-        documents = await backend_client.fetch_documents(user_id, source_id)
-        
-        if documents and "error" not in documents:
-            docs = documents.get("documents", [])
-            
-            if not docs:
-                await query.edit_message_text(
-                    "📭 **No Documents Found**\n\n"
-                    "This source doesn't contain any documents yet.",
-                    parse_mode="Markdown"
-                )
-                return
-            
-            # Show first page of documents
-            page_size = 5
-            total_docs = len(docs)
-            page_docs = docs[:page_size]
-            
-            docs_text = f"📄 **Documents** (showing {len(page_docs)} of {total_docs})\n\n"
-            
+            sources = _unwrap(await get_sources_cached(user_id))
             keyboard = []
-            for doc in page_docs:
-                doc_id = doc.get("id")
-                doc_name = doc.get("name", "Untitled")
-                doc_snippet = doc.get("snippet", "")[:50]
-                
-                button_text = f"📄 {doc_name}"
-                if doc_snippet:
-                    button_text += f" - {doc_snippet}..."
-                
+            for source in sources.get("sources", []):
+                source_id = source.get("id")
+                source_name = source.get("name")
                 keyboard.append([
                     InlineKeyboardButton(
-                        button_text,
-                        callback_data=f"view_doc_{doc_id}"
+                        f"📁 {source_name}",
+                        callback_data=f"fetch_docs_{source_id}"
                     )
                 ])
-            
-            # Add pagination if needed
-            if total_docs > page_size:
-                keyboard.append([
-                    InlineKeyboardButton("➡️ Next Page", callback_data=f"fetch_page_1_{source_id}")
-                ])
-            
-            keyboard.append([InlineKeyboardButton("🔙 Back", callback_data="fetch_sources")])
+            keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cancel")])
             
             reply_markup = InlineKeyboardMarkup(keyboard)
             
-            await query.edit_message_text(
-                docs_text,
+            await safe_edit(
+                query,
+                "📁 **Select Source**\n\nChoose a source to browse documents:",
                 parse_mode="Markdown",
                 reply_markup=reply_markup
             )
-            
-        else:
-            error_msg = documents.get("error", "Unknown error") if documents else "Fetch failed"
-            await query.edit_message_text(
-                f"❌ **Fetch Failed**\n\n{error_msg}",
+        
+        except BackendError:
+            await safe_edit(
+                query,
+                "❌ No connected sources found. Use `/connect` to add sources first."
+            )
+        
+        except Exception:
+            logger.exception("Fetch sources error")
+            await safe_edit(query, "❌ Failed to fetch sources. Please try again.")
+    
+    elif data.startswith("fetch_docs_"):
+        source_id = data.replace("fetch_docs_", "")
+        await fetch_documents_from_source(query, context, user_id, source_id)
+
+
+async def fetch_documents_from_source(query, context: ContextTypes.DEFAULT_TYPE, user_id: int, source_id: str) -> None:
+    """Fetch and display documents from a specific source."""
+    
+    # Reuse a recent render so back/forward navigation skips the backend
+    cache_key = (user_id, source_id, 0)
+    cached = _document_page_cache.get(cache_key)
+    if cached is not None and cached[0] > time.monotonic():
+        await safe_edit(query, cached[1], parse_mode="Markdown", reply_markup=cached[2])
+        return
+    
+    try:
+        documents = _unwrap(await backend_client.fetch_documents(user_id, source_id), "Fetch failed")
+        
+        docs = documents.get("documents", [])
+        
+        if not docs:
+            await safe_edit(
+                query,
+                "📭 **No Documents Found**\n\n"
+                "This source doesn't contain any documents yet.",
                 parse_mode="Markdown"
             )
+            return
+        
+        # Show first page of documents
+        page_size = DOCUMENT_PAGE_SIZE
+        total_docs = len(docs)
+        page_docs = docs[:page_size]
+        
+        docs_text = f"📄 **Documents** (showing {len(page_docs)} of {total_docs})\n\n"
+        
+        keyboard = []
+        for doc in page_docs:
+            doc_id = doc.get("id")
+            doc_name = doc.get("name", "Untitled")
+            doc_snippet = doc.get("snippet", "")[:50]
+            
+            button_text = f"📄 {doc_name}"
+            if doc_snippet:
+                button_text += f" - {doc_snippet}..."
             
-    except Exception as e:
-        logger.error("Fetch documents error", error=str(e), user_id=user_id, source_id=source_id)
-        await query.edit_message_text("❌ Failed to fetch documents. Please try again.")
+            keyboard.append([
+                InlineKeyboardButton(
+                    button_text,
+                    callback_data=f"view_doc_{doc_id}"
+                )
+            ])
+        
+        # Add pagination if needed
+        if total_docs > page_size:
+            keyboard.append([
+                InlineKeyboardButton("➡️ Next Page", callback_data=f"fetch_page_1_{source_id}")
+            ])
+        
+        keyboard.append([InlineKeyboardButton("🔙 Back", callback_data="fetch_sources")])
+        
+        reply_markup = InlineKeyboardMarkup(keyboard)
+        _cache_document_page(cache_key, docs_text, reply_markup)
+        
+        await safe_edit(
+            query,
+            docs_text,
+            parse_mode="Markdown",
+            reply_markup=reply_markup
+        )
+    
+    except BackendError as e:
+        await safe_edit(
+            query,
+            f"❌ **Fetch Failed**\n\n{e}",
+            parse_mode="Markdown"
+        )
+    
+    except Exception:
+        logger.exception("Fetch documents error", source_id=source_id)
+        await safe_edit(query, "❌ Failed to fetch documents. Please try again.")
 
 
-async def handle_check_job_callback(query, context: ContextTypes.DEFAULT_TYPE, data: str) -> None:
+async def handle_check_job_callback(query, context: ContextTypes.DEFAULT_TYPE, user_id: int, data: str) -> None:
     """Handle job status check callback."""
     job_id = data.replace("check_job_", "")
-    user_id = query.from_user.id
     
     try:
-        job_status = await backend_client.get_job_status(user_id, job_id)
+        job_status = _unwrap(await backend_client.get_job_status(user_id, job_id))
         
-        if job_status and "error" not in job_status:
-            status = job_status.get("status", "unknown")
-            progress = job_status.get("progress", 0)
-            
-            status_emoji = {
-                "running": "🔄",
-                "completed": "✅", 
-                "failed": "❌",
-                "queued": "⏳"
-            }.get(status, "❓")
-            
-            status_text = f"""
-📋 **Job Status Update**
-
-🆔 **Job ID:** `{job_id}`
-{status_emoji} **Status:** {status.title()}
-📊 **Progress:** {progress}%
-            """
-            
-            await query.edit_message_text(status_text.strip(), parse_mode="Markdown")
-        else:
-            await query.edit_message_text(f"❌ Could not get status for job {job_id}")
+        status = job_status.get("status", "unknown")
+        progress = job_status.get("progress", 0)
+        
+        status_emoji = JOB_STATUS_EMOJI.get(status, "❓")
+        
+        status_text = JOB_STATUS_TEMPLATE.format(
+            job_id=job_id,
+            status_emoji=status_emoji,
+            status=status.title(),
+            progress=progress
+        )
+        
+        await safe_edit(query, status_text, parse_mode="Markdown")
+    
+    except BackendError:
+        await safe_edit(query, f"❌ Could not get status for job {job_id}")
     
-    except Exception as e:
-        logger.error("Check job callback error", error=str(e), job_id=job_id)
-        await query.edit_message_text("❌ Error checking job status.")
+    except Exception:
+        logger.exception("Check job callback error", job_id=job_id)
+        await safe_edit(query, "❌ Error checking job status.")
 
 
-async def handle_upload_callback(query, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def handle_upload_callback(query, context: ContextTypes.DEFAULT_TYPE, user_id: int) -> None:
     """Handle upload file callback."""
-    user_id = query.from_user.id
     await conversation_state.set_flow(user_id, "upload_file")
     
-    await query.edit_message_text(
+    await safe_edit(
+        query,
         "📤 **Upload File**\n\n"
         "Send me a file to upload for indexing.\n\n"
         "**Supported formats:**\n"
@@ -450,12 +671,12 @@ async def handle_upload_callback(query, context: ContextTypes.DEFAULT_TYPE) -> N
     )
 
 
-async def handle_refine_search_callback(query, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def handle_refine_search_callback(query, context: ContextTypes.DEFAULT_TYPE, user_id: int) -> None:
     """Handle refine search callback."""
-    user_id = query.from_user.id
     await conversation_state.set_flow(user_id, "refine_search")
     
-    await query.edit_message_text(
+    await safe_edit(
+        query,
         "🔍 **Refine Your Search**\n\n"
         "Enter a more specific search query to get better results:\n\n"
         "💡 **Tips:**\n"
@@ -467,19 +688,13 @@ async def handle_refine_search_callback(query, context: ContextTypes.DEFAULT_TYP
     )
 
 
-async def handle_get_documents_callback(query, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def handle_get_documents_callback(query, context: ContextTypes.DEFAULT_TYPE, user_id: int) -> None:
     """Handle get full documents callback."""
-    user_id = query.from_user.id
-    
-    await query.edit_message_text(
-        "📥 **Fetching Full Documents**\n\n"
-        "Retrieving complete documents from your last search...",
-        parse_mode="Markdown"
-    )
     
     # This would fetch full documents from the last search
     # For now, show a placeholder message
-    await query.edit_message_text(
+    await safe_edit(
+        query,
         "📄 **Full Documents**\n\n"
         "Full document retrieval feature coming soon!\n\n"
         "For now, you can:\n"
@@ -490,19 +705,13 @@ async def handle_get_documents_callback(query, context: ContextTypes.DEFAULT_TYP
     )
 
 
-async def handle_summarize_results_callback(query, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def handle_summarize_results_callback(query, context: ContextTypes.DEFAULT_TYPE, user_id: int) -> None:
     """Handle summarize results callback."""
-    user_id = query.from_user.id
-    
-    await query.edit_message_text(
-        "📊 **Generating Summary**\n\n"
-        "Creating a comprehensive summary of your search results...",
-        parse_mode="Markdown"
-    )
     
     # This would generate a summary of the last search results
     # For now, show a placeholder message
-    await query.edit_message_text(
+    await safe_edit(
+        query,
         "📊 **Search Results Summary**\n\n"
         "Summary generation feature coming soon!\n\n"
         "Current search provided multiple relevant results with citations.\n"
@@ -511,54 +720,26 @@ async def handle_summarize_results_callback(query, context: ContextTypes.DEFAULT
     )
 
 
-async def handle_related_search_callback(query, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def handle_related_search_callback(query, context: ContextTypes.DEFAULT_TYPE, user_id: int) -> None:
     """Handle related search callback."""
-    demo_queries = [
-        "related documents",
-        "similar content", 
-        "follow up information",
-        "additional context",
-        "supplementary materials"
-    ]
-    
-    keyboard = []
-    for i, demo_query in enumerate(demo_queries):
-        keyboard.append([
-            InlineKeyboardButton(f"🔍 {demo_query}", callback_data=f"demo_search_{i}")
-        ])
-    keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cancel")])
-    
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
-    await query.edit_message_text(
+    await safe_edit(
+        query,
         "🔄 **Related Search Suggestions**\n\n"
         "Try one of these related searches:",
         parse_mode="Markdown",
-        reply_markup=reply_markup
+        reply_markup=RELATED_SEARCH_KEYBOARD
     )
 
 
-async def handle_demo_search_callback(query, context: ContextTypes.DEFAULT_TYPE, data: str) -> None:
+async def handle_demo_search_callback(query, context: ContextTypes.DEFAULT_TYPE, user_id: int, data: str) -> None:
     """Handle demo search callback."""
     search_index = int(data.replace("demo_search_", ""))
-    demo_queries = [
-        "quarterly revenue growth",
-        "team meeting notes",
-        "project documentation", 
-        "company policies",
-        "customer feedback",
-        "related documents",
-        "similar content",
-        "follow up information", 
-        "additional context",
-        "supplementary materials"
-    ]
     
-    if search_index < len(demo_queries):
-        query_text = demo_queries[search_index]
-        user_id = query.from_user.id
+    if search_index < len(DEMO_QUERIES):
+        query_text = DEMO_QUERIES[search_index]
         
-        await query.edit_message_text(
+        await safe_edit(
+            query,
             f"🔍 **Searching for: \"{query_text}\"**\n\n"
             "Processing your search query...",
             parse_mode="Markdown"
@@ -566,308 +747,432 @@ async def handle_demo_search_callback(query, context: ContextTypes.DEFAULT_TYPE,
         
         # Simulate search (in real implementation, this would call backend)
         try:
-            result = await backend_client.search(user_id, query_text, include_citations=True)
+            result = _unwrap(await backend_client.search(user_id, query_text, include_citations=True))
             
-            if result and "error" not in result:
-                # Format the search response
-                from ..handlers.commands import format_search_response
-                response_text = await format_search_response(result, query_text)
-                
-                # Send response (handle long messages)
-                if len(response_text) > 4000:
-                    response_text = response_text[:4000] + "\n\n... (truncated)"
-                
-                await query.edit_message_text(
-                    response_text,
-                    parse_mode="Markdown",
-                    disable_web_page_preview=True
-                )
-            else:
-                await query.edit_message_text(
-                    f"🔍 **Demo Search: \"{query_text}\"**\n\n"
-                    "No backend connected - this is a demo search.\n\n"
-                    "In a real implementation, this would return:\n"
-                    "• AI-powered answers\n"
-                    "• Source citations\n" 
-                    "• Relevant documents\n\n"
-                    "Connect your backend to see real results!",
-                    parse_mode="Markdown"
-                )
-        except Exception as e:
-            logger.error("Demo search error", error=str(e), query=query_text)
-            await query.edit_message_text(
+            # Format the search response, truncated to fit one message
+            response_text = await format_search_response(
+                result, query_text, max_length=MessageLimit.MAX_TEXT_LENGTH
+            )
+            
+            await safe_edit(
+                query,
+                response_text,
+                parse_mode="Markdown",
+                disable_web_page_preview=True
+            )
+        
+        except BackendError:
+            await safe_edit(
+                query,
+                f"🔍 **Demo Search: \"{query_text}\"**\n\n"
+                "No backend connected - this is a demo search.\n\n"
+                "In a real implementation, this would return:\n"
+                "• AI-powered answers\n"
+                "• Source citations\n" 
+                "• Relevant documents\n\n"
+                "Connect your backend to see real results!",
+                parse_mode="Markdown"
+            )
+        
+        except Exception:
+            logger.exception("Demo search error", query=query_text)
+            await safe_edit(
+                query,
                 f"❌ Demo search failed for: \"{query_text}\""
             )
 
 
-async def handle_fetch_source_callback(query, context: ContextTypes.DEFAULT_TYPE, data: str) -> None:
+async def handle_fetch_source_callback(query, context: ContextTypes.DEFAULT_TYPE, user_id: int, data: str) -> None:
     """Handle fetch from specific source callback."""
     source_id = data.replace("fetch_source_", "")
-    user_id = query.from_user.id
-    
-    await query.edit_message_text(
-        f"📥 **Fetching from Source**\n\n"
-        f"Source ID: `{source_id}`\n"
-        f"Status: Retrieving latest data...",
-        parse_mode="Markdown"
-    )
     
     try:
-        result = await backend_client.sync_source(user_id, source_id)
+        result = await _await_with_placeholder(
+            query,
+            f"📥 **Fetching from Source**\n\n"
+            f"Source ID: `{source_id}`\n"
+            f"Status: Retrieving latest data...",
+            backend_client.sync_source(user_id, source_id)
+        )
+        await invalidate_sources_cache(user_id)
+        _invalidate_document_pages(user_id, source_id)
+        result = _unwrap(result, "Fetch failed")
         
-        if result and "error" not in result:
-            items_count = result.get("items_retrieved", 0)
-            status = result.get("sync_status", "completed")
-            
-            await query.edit_message_text(
-                f"✅ **Fetch Complete**\n\n"
-                f"📂 **Source:** {source_id}\n"
-                f"📊 **Items Retrieved:** {items_count}\n"
-                f"✅ **Status:** {status.title()}\n\n"
-                f"Data has been synchronized and is ready for search!",
-                parse_mode="Markdown"
-            )
-        else:
-            error_msg = result.get("error", "Unknown error") if result else "Fetch failed"
-            await query.edit_message_text(
-                f"❌ **Fetch Failed**\n\n"
-                f"Source: {source_id}\n"
-                f"Error: {error_msg}",
-                parse_mode="Markdown"
-            )
-    except Exception as e:
-        logger.error("Fetch source callback error", error=str(e), source_id=source_id)
-        await query.edit_message_text(
+        items_count = result.get("items_retrieved", 0)
+        status = result.get("sync_status", "completed")
+        
+        await safe_edit(
+            query,
+            f"✅ **Fetch Complete**\n\n"
+            f"📂 **Source:** {source_id}\n"
+            f"📊 **Items Retrieved:** {items_count}\n"
+            f"✅ **Status:** {status.title()}\n\n"
+            f"Data has been synchronized and is ready for search!",
+            parse_mode="Markdown"
+        )
+    
+    except BackendError as e:
+        await safe_edit(
+            query,
+            f"❌ **Fetch Failed**\n\n"
+            f"Source: {source_id}\n"
+            f"Error: {e}",
+            parse_mode="Markdown"
+        )
+    
+    except Exception:
+        logger.exception("Fetch source callback error", source_id=source_id)
+        await safe_edit(
+            query,
             f"❌ Error fetching from source {source_id}"
         )
 
 
-async def handle_sync_all_callback(query, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def handle_sync_all_callback(query, context: ContextTypes.DEFAULT_TYPE, user_id: int) -> None:
     """Handle sync all sources callback."""
-    user_id = query.from_user.id
-    
-    await query.edit_message_text(
-        "🔄 **Syncing All Sources**\n\n"
-        "Initiating synchronization for all connected sources...",
-        parse_mode="Markdown"
-    )
     
     try:
         # Get all sources first
-        sources_data = await backend_client.get_sources(user_id)
+        sources_data = _unwrap(await get_sources_cached(user_id))
         
-        if sources_data and "error" not in sources_data:
-            sources = sources_data.get("sources", [])
-            
-            if not sources:
-                await query.edit_message_text(
-                    "📂 **No Sources to Sync**\n\n"
-                    "You don't have any connected sources.\n"
-                    "Use `/connect` to add sources first.",
-                    parse_mode="Markdown"
-                )
-                return
-            
-            # Sync each source (in a real implementation, this might be batched)
-            sync_results = []
-            for source in sources:
-                if source.get("status") == "active":
-                    source_id = source.get("id")
-                    result = await backend_client.sync_source(user_id, source_id)
-                    sync_results.append({
-                        "source": source.get("name", source_id),
-                        "success": result and "error" not in result
-                    })
-            
-            # Format results
-            success_count = sum(1 for r in sync_results if r["success"])
-            total_count = len(sync_results)
-            
-            results_text = f"""
-✅ **Sync Complete**
-
-📊 **Results:** {success_count}/{total_count} sources synced successfully
-
-**Details:**
-            """
-            
-            for result in sync_results:
-                status_emoji = "✅" if result["success"] else "❌"
-                results_text += f"\n{status_emoji} {result['source']}"
-            
-            await query.edit_message_text(
-                results_text.strip(),
+        sources = sources_data.get("sources", [])
+        
+        if not sources:
+            await safe_edit(
+                query,
+                "📂 **No Sources to Sync**\n\n"
+                "You don't have any connected sources.\n"
+                "Use `/connect` to add sources first.",
                 parse_mode="Markdown"
             )
-        else:
-            await query.edit_message_text(
-                "❌ **Sync Failed**\n\n"
-                "Could not retrieve sources list.",
-                parse_mode="Markdown"
+            return
+        
+        # Sync active sources concurrently, bounded to respect backend limits
+        active_sources = [source for source in sources if source.get("status") == "active"]
+        semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
+        
+        async def sync_one(source_id):
+            async with semaphore:
+                return await backend_client.sync_source(user_id, source_id)
+        
+        results = await _await_with_placeholder(
+            query,
+            "🔄 **Syncing All Sources**\n\n"
+            "Initiating synchronization for all connected sources...",
+            asyncio.gather(
+                *(sync_one(source.get("id")) for source in active_sources),
+                return_exceptions=True
             )
-    except Exception as e:
-        logger.error("Sync all callback error", error=str(e), user_id=user_id)
-        await query.edit_message_text(
+        )
+        await invalidate_sources_cache(user_id)
+        _invalidate_document_pages(user_id)
+        
+        sync_results = []
+        for source, result in zip(active_sources, results):
+            if isinstance(result, Exception):
+                logger.warning("Source sync failed", error=str(result), source_id=source.get("id"))
+                result = None
+            sync_results.append({
+                "source": source.get("name", source.get("id")),
+                "success": bool(result) and "error" not in result
+            })
+        
+        # Format results
+        success_count = sum(1 for r in sync_results if r["success"])
+        total_count = len(sync_results)
+        
+        details = "\n".join(
+            f"{'✅' if result['success'] else '❌'} {result['source']}"
+            for result in sync_results
+        )
+        results_text = SYNC_RESULTS_TEMPLATE.format(
+            success_count=success_count,
+            total_count=total_count,
+            details=details
+        )
+        
+        await safe_edit(
+            query,
+            results_text,
+            parse_mode="Markdown"
+        )
+    
+    except BackendError:
+        await safe_edit(
+            query,
+            "❌ **Sync Failed**\n\n"
+            "Could not retrieve sources list.",
+            parse_mode="Markdown"
+        )
+    
+    except Exception:
+        logger.exception("Sync all callback error")
+        await safe_edit(
+            query,
             "❌ Error during bulk sync operation."
         )
 
 
-async def handle_manage_sources_callback(query, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def handle_manage_sources_callback(query, context: ContextTypes.DEFAULT_TYPE, user_id: int) -> None:
     """Handle manage sources callback."""
-    user_id = query.from_user.id
     
     try:
-        sources_data = await backend_client.get_sources(user_id)
+        sources_data = _unwrap(await get_sources_cached(user_id))
         
-        if sources_data and "error" not in sources_data:
-            sources = sources_data.get("sources", [])
-            
-            if not sources:
-                keyboard = [
-                    [InlineKeyboardButton("🔗 Connect First Source", callback_data="connect")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                
-                await query.edit_message_text(
-                    "⚙️ **Manage Sources**\n\n"
-                    "No sources connected yet.\n"
-                    "Connect your first source to get started!",
-                    parse_mode="Markdown",
-                    reply_markup=reply_markup
-                )
-                return
-            
-            # Create management keyboard
-            keyboard = []
-            for source in sources[:5]:  # Limit to first 5 sources
-                source_name = source.get("name", "Unknown")
-                source_id = source.get("id")
-                status_emoji = "✅" if source.get("status") == "active" else "❌"
-                
-                keyboard.append([
-                    InlineKeyboardButton(
-                        f"{status_emoji} {source_name}",
-                        callback_data=f"manage_source_{source_id}"
-                    )
-                ])
-            
-            keyboard.append([
-                InlineKeyboardButton("🔗 Add New Source", callback_data="connect"),
-                InlineKeyboardButton("🔄 Sync All", callback_data="sync_all_sources")
-            ])
-            keyboard.append([InlineKeyboardButton("❌ Close", callback_data="cancel")])
-            
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            await query.edit_message_text(
+        sources = sources_data.get("sources", [])
+        
+        if not sources:
+            await safe_edit(
+                query,
                 "⚙️ **Manage Sources**\n\n"
-                "Select a source to manage or add a new one:",
-                parse_mode="Markdown", 
-                reply_markup=reply_markup
-            )
-        else:
-            await query.edit_message_text(
-                "❌ Could not load sources for management."
+                "No sources connected yet.\n"
+                "Connect your first source to get started!",
+                parse_mode="Markdown",
+                reply_markup=NO_SOURCES_KEYBOARD
             )
-    except Exception as e:
-        logger.error("Manage sources callback error", error=str(e), user_id=user_id)
-        await query.edit_message_text(
+            return
+        
+        # Create management keyboard: one row per source, then the static footer
+        keyboard = [
+            (InlineKeyboardButton(
+                f"{'✅' if source.get('status') == 'active' else '❌'} {source.get('name', 'Unknown')}",
+                callback_data=f"manage_source_{source.get('id')}"
+            ),)
+            for source in sources[:MANAGE_SOURCES_LIMIT]
+        ]
+        keyboard.extend(MANAGE_SOURCES_FOOTER)
+        
+        reply_markup = InlineKeyboardMarkup(keyboard)
+        
+        await safe_edit(
+            query,
+            "⚙️ **Manage Sources**\n\n"
+            "Select a source to manage or add a new one:",
+            parse_mode="Markdown", 
+            reply_markup=reply_markup
+        )
+    
+    except BackendError:
+        await safe_edit(
+            query,
+            "❌ Could not load sources for management."
+        )
+    
+    except Exception:
+        logger.exception("Manage sources callback error")
+        await safe_edit(
+            query,
             "❌ Error loading sources management."
         )
 
 
-async def handle_refresh_status_callback(query, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle refresh status callback.""" 
-    user_id = query.from_user.id
+def _render_html(parts: Sequence[Tuple[str, Optional[str]]], values: Dict[str, Any]) -> str:
+    """Fill a split HTML template, escaping each value it uses."""
+    pieces = []
+    for literal, field in parts:
+        pieces.append(literal)
+        if field is not None:
+            pieces.append(html.escape(str(values[field])))
+    return "".join(pieces)
+
+
+@functools.lru_cache(maxsize=STATS_RENDER_CACHE_SIZE)
+def _render_stats_values(values: Tuple[Any, ...]) -> str:
+    """Render detailed stats from values ordered like STATS_FIELDS."""
+    return _render_html(STATS_PARTS, dict(zip(STATS_FIELDS, values)))
+
+
+def _render_stats(system_status: Dict[str, Any], user_status: Dict[str, Any]) -> str:
+    """Render the detailed stats message, reusing earlier renders of the same values."""
+    merged = {**STATS_DEFAULTS, **system_status, **user_status}
+    try:
+        return _render_stats_values(tuple(merged[field] for field in STATS_FIELDS))
+    except TypeError:
+        # Unhashable values (e.g. nested objects) can't be memoized
+        return _render_html(STATS_PARTS, merged)
+
+
+def _is_good_status(result: Any) -> bool:
+    """Check if a status lookup returned usable data."""
+    return isinstance(result, dict) and bool(result) and "error" not in result
+
+
+async def _guarded_status(awaitable, breaker: CircuitBreaker) -> Any:
+    """Await a status lookup under the status timeout and the given breaker.
     
-    await query.edit_message_text(
-        "🔄 **Refreshing Status**\n\n"
-        "Fetching latest system information...",
-        parse_mode="Markdown"
+    Only the backend failing counts against the breaker; per-user errors such
+    as a 404 for an unknown user mean the backend answered.
+    """
+    if not breaker.allow():
+        awaitable.close()
+        return {"error": "Status backend unavailable"}
+    
+    try:
+        result = await asyncio.wait_for(awaitable, STATUS_TIMEOUT)
+    except asyncio.TimeoutError:
+        breaker.record_failure()
+        return {"error": "Request timeout"}
+    except Exception:
+        breaker.record_failure()
+        raise
+    
+    if is_upstream_failure(result):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return result
+
+
+async def _request_status(user_id: int) -> Tuple[Any, Any]:
+    """Request system and user status, with one dashboard call if enabled.
+    
+    Falls back to the two separate status calls (made concurrently) when the
+    dashboard is disabled or fails. Either result may be an exception.
+    """
+    if settings.backend_dashboard_enabled:
+        dashboard = await _guarded_status(backend_client.get_dashboard(user_id), _user_status_breaker)
+        if _is_good_status(dashboard):
+            return dashboard.get("system"), dashboard.get("user")
+        logger.warning("Dashboard lookup failed", error=(dashboard or {}).get("error"))
+    
+    system_status, user_status = await asyncio.gather(
+        _guarded_status(backend_client.get_system_status(), _system_status_breaker),
+        _guarded_status(backend_client.get_user_status(user_id), _user_status_breaker),
+        return_exceptions=True
     )
+    return system_status, user_status
+
+
+async def _fetch_status(user_id: int) -> Tuple[Dict[str, Any], Dict[str, Any], bool]:
+    """Fetch system and user status for a status dashboard.
+    
+    A failed lookup is logged and replaced by the last successful response
+    (or an empty dict if there is none), so the other one can still be shown.
+    The returned flag is True when any cached response was substituted.
+    """
+    global _last_system_status
+    system_status, user_status = await _request_status(user_id)
+    stale = False
+    
+    if _is_good_status(system_status):
+        _last_system_status = system_status
+    else:
+        if isinstance(system_status, Exception):
+            logger.warning("System status lookup failed", error=str(system_status))
+        system_status = _last_system_status
+        stale = bool(system_status)
+    
+    if _is_good_status(user_status):
+        # Re-insert so the dict stays ordered from least to most recently seen
+        _last_user_status.pop(user_id, None)
+        if len(_last_user_status) >= STALE_STATUS_MAX_USERS:
+            del _last_user_status[next(iter(_last_user_status))]
+        _last_user_status[user_id] = user_status
+    else:
+        if isinstance(user_status, Exception):
+            logger.warning("User status lookup failed", error=str(user_status))
+        user_status = _last_user_status.get(user_id, {})
+        stale = stale or bool(user_status)
+    
+    return system_status, user_status, stale
+
+
+async def handle_refresh_status_callback(query, context: ContextTypes.DEFAULT_TYPE, user_id: int) -> None:
+    """Handle refresh status callback.""" 
     
     try:
-        system_status = await backend_client.get_system_status()
-        user_status = await backend_client.get_user_status(user_id)
+        system_status, user_status, stale = await _await_with_placeholder(
+            query,
+            "🔄 **Refreshing Status**\n\n"
+            "Fetching latest system information...",
+            _fetch_status(user_id),
+            context
+        )
         
         # Format refreshed status
         backend_status = "✅ Online" if system_status.get("backend", False) else "❌ Offline"
         
-        status_message = f"""
-📊 **System Status** (Refreshed)
-
-**🖥️ Backend:** {backend_status}
-**👤 Your Sources:** {user_status.get('connected_sources', 0)}
-**📄 Your Documents:** {user_status.get('indexed_documents', 0)}
-**🔄 Active Jobs:** {user_status.get('active_jobs', 0)}
-
-**🕐 Last Updated:** Just now
-        """
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("🔄 Refresh Again", callback_data="refresh_status"),
-                InlineKeyboardButton("📊 Detailed Stats", callback_data="detailed_stats")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        status_message = _render_html(REFRESH_STATUS_PARTS, {
+            "backend_status": backend_status,
+            "connected_sources": user_status.get('connected_sources', 0),
+            "indexed_documents": user_status.get('indexed_documents', 0),
+            "active_jobs": user_status.get('active_jobs', 0)
+        })
+        if stale:
+            status_message += STALE_STATUS_NOTICE
         
-        await query.edit_message_text(
-            status_message.strip(),
-            parse_mode="Markdown",
-            reply_markup=reply_markup
+        await _edit_if_changed(
+            query,
+            context,
+            status_message,
+            parse_mode=ParseMode.HTML,
+            reply_markup=REFRESH_STATUS_KEYBOARD.to_json()
         )
-    except Exception as e:
-        logger.error("Refresh status callback error", error=str(e), user_id=user_id)
-        await query.edit_message_text(
-            "❌ **Status Refresh Failed**\n\n"
+    except Exception:
+        logger.exception("Refresh status callback error")
+        await _edit_if_changed(
+            query,
+            context,
+            "❌ <b>Status Refresh Failed</b>\n\n"
             "Could not fetch updated status information.",
-            parse_mode="Markdown"
+            parse_mode=ParseMode.HTML
         )
 
 
-async def handle_detailed_stats_callback(query, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def handle_detailed_stats_callback(query, context: ContextTypes.DEFAULT_TYPE, user_id: int) -> None:
     """Handle detailed stats callback."""
-    user_id = query.from_user.id
     
     try:
-        system_status = await backend_client.get_system_status()
-        user_status = await backend_client.get_user_status(user_id)
-        
-        # Format detailed statistics
-        stats_message = f"""
-📊 **Detailed Statistics**
-
-**🖥️ System Performance:**
-• API Response Time: {system_status.get('avg_response_time', 'N/A')}ms
-• Daily Requests: {system_status.get('requests', 0)}
-• Uptime: {system_status.get('uptime', 'Unknown')}
-
-**👤 Your Usage:**
-• Connected Sources: {user_status.get('connected_sources', 0)}
-• Total Documents: {user_status.get('indexed_documents', 0)}
-• Storage Used: {user_status.get('storage_used', '0 MB')}
-• Searches Today: {user_status.get('searches_today', 0)}
-• Files Uploaded: {user_status.get('files_uploaded', 0)}
-
-**🔄 Recent Activity:**
-• Last Search: {user_status.get('last_search', 'Never')}
-• Last Upload: {user_status.get('last_upload', 'Never')}
-• Last Sync: {user_status.get('last_sync', 'Never')}
-        """
+        async with _stats_semaphore:
+            system_status, user_status, stale = await _fetch_status(user_id)
         
-        keyboard = [
-            [InlineKeyboardButton("🔙 Back to Status", callback_data="refresh_status")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        stats_message = _render_stats(system_status, user_status)
+        if stale:
+            stats_message += STALE_STATUS_NOTICE
         
-        await query.edit_message_text(
-            stats_message.strip(),
-            parse_mode="Markdown",
-            reply_markup=reply_markup
+        await _edit_if_changed(
+            query,
+            context,
+            stats_message,
+            parse_mode=ParseMode.HTML,
+            reply_markup=BACK_TO_STATUS_KEYBOARD.to_json()
         )
-    except Exception as e:
-        logger.error("Detailed stats callback error", error=str(e), user_id=user_id)
-        await query.edit_message_text(
+    except Exception:
+        logger.exception("Detailed stats callback error")
+        await _edit_if_changed(
+            query,
+            context,
             "❌ Could not load detailed statistics."
         )
+
+
+# Callback data that maps directly to a handler taking (query, context, user_id)
+EXACT_HANDLERS = {
+    "connect": handle_connect_callback,
+    "search_demo": handle_search_demo,
+    "help": handle_help_callback,
+    "settings": handle_settings_callback,
+    "cancel": handle_cancel_callback,
+    "upload_file": handle_upload_callback,
+    "refine_search": handle_refine_search_callback,
+    "get_documents": handle_get_documents_callback,
+    "summarize_results": handle_summarize_results_callback,
+    "related_search": handle_related_search_callback,
+    "sync_all_sources": handle_sync_all_callback,
+    "manage_sources": handle_manage_sources_callback,
+    "refresh_status": handle_refresh_status_callback,
+    "detailed_stats": handle_detailed_stats_callback,
+}
+
+# Prefixed callback data, keyed by the text before the first "_"; handlers
+# take (query, context, user_id, data). Each entry lists (rest of prefix, handler)
+# checked in order, so longer prefixes must precede shorter ones they start with.
+PREFIX_HANDLERS = {
+    "connect": (("", handle_platform_selection),),
+    "fetch": (
+        ("source_", handle_fetch_source_callback),
+        ("", handle_fetch_callback),
+    ),
+    "check": (("job_", handle_check_job_callback),),
+    "demo": (("search_", handle_demo_search_callback),),
+}
@@ -1,161 +1,405 @@
 """
 Command handlers for the Telegram bot.
 """
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+import asyncio
+import functools
+import hashlib
+import math
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, Message
 from telegram.ext import ContextTypes
 
 from ..auth import require_auth, require_admin
-from ..storage import conversation_state
+from ..storage import state_storage, conversation_state
 from ..backend import backend_client
 from ..logging_config import get_logger
+from ..rate_limit import outbound_limiter, command_limiter
+from .keyboards import StaticKeyboardMarkup, CONNECT_KEYBOARD
 
 logger = get_logger(__name__)
 
+# Static keyboards and message templates, built once at import
+WELCOME_TEMPLATE = (
+    "🚀 **Welcome to Enterprise Search Bot**\n\n"
+    "Hi {name}! I'm your AI-powered search assistant that can help you:\n\n"
+    "🔍 **Search** across all your connected data sources\n"
+    "📁 **Connect** to Google Drive, Slack, Notion, and more\n"
+    "📤 **Upload** documents for instant indexing\n"
+    "🔄 **Sync** your data sources automatically\n"
+    "📊 **Process** documents with AI-powered analysis\n\n"
+    "**Quick Start:**\n"
+    "• Use `/connect` to link your data sources\n"
+    "• Use `/search <query>` to find information\n"
+    "• Use `/help` to see all available commands\n\n"
+    "Let's get started! 🎯"
+)
+
+START_KEYBOARD = StaticKeyboardMarkup([
+    [
+        InlineKeyboardButton("🔗 Connect Sources", callback_data="connect"),
+        InlineKeyboardButton("🔍 Search Demo", callback_data="search_demo")
+    ],
+    [
+        InlineKeyboardButton("📚 Help", callback_data="help"),
+        InlineKeyboardButton("⚙️ Settings", callback_data="settings")
+    ]
+])
+
+HELP_TEXT = (
+    "� **Enterprise Search Bot - Command Guide**\n\n"
+    "**🔍 Search & Discovery**\n"
+    "`/search <query>` - AI-powered search with citations and sources\n"
+    "`/fetch [source]` - Browse and fetch documents from connected sources\n\n"
+    "**🔗 Data Source Management**\n"
+    "`/connect` - Connect to external platforms (Drive, Slack, Notion, etc.)\n"
+    "`/sources` - List all your connected data sources with status\n"
+    "`/update [source_id]` - Manually sync data from specific sources\n\n"
+    "**📤 File Management**\n"
+    "`/upload` - Upload files for instant AI indexing and search\n"
+    "`/process [doc_id]` - Process specific documents or all pending files\n\n"
+    "**⚙️ System & Status**\n"
+    "`/status [job_id]` - Check system status or specific background job\n"
+    "`/settings` - View and manage your personal settings\n"
+    "`/help` - Show this comprehensive help guide\n\n"
+    "**🎯 Search Examples:**\n"
+    "• `/search quarterly revenue growth and market trends`\n"
+    "• `/search team meeting notes from last week`\n"
+    "• `/search project Alpha documentation and requirements`\n"
+    "• `/search customer feedback about new features`\n\n"
+    "**💡 Pro Tips:**\n"
+    "✅ **Natural Language:** Use conversational queries for better AI responses\n"
+    "✅ **Citations:** All answers include source links and document references  \n"
+    "✅ **Multi-Source:** Connect multiple platforms for comprehensive search\n"
+    "✅ **File Formats:** Supports PDF, DOC, TXT, CSV, images with text, and more\n"
+    "✅ **Real-time:** Upload files and search immediately after processing\n\n"
+    "**🚀 Quick Start:**\n"
+    "1. Use `/connect` to link your data sources\n"
+    "2. Upload documents with `/upload` \n"
+    "3. Search with `/search your question here`\n"
+    "4. Check status anytime with `/status`\n\n"
+    "**👨‍💼 Admin Commands** (if you're an admin):\n"
+    "`/admin stats` - View system statistics and usage metrics\n"
+    "`/admin users` - Manage authorized users and permissions\n\n"
+    "Need personalized help? Contact your system administrator."
+)
+
+HELP_KEYBOARD = StaticKeyboardMarkup([
+    [
+        InlineKeyboardButton("🔗 Connect Sources", callback_data="connect"),
+        InlineKeyboardButton("🔍 Try Demo Search", callback_data="search_demo")
+    ],
+    [
+        InlineKeyboardButton("📤 Upload File", callback_data="upload_file"),
+        InlineKeyboardButton("📊 Check Status", callback_data="refresh_status")
+    ]
+])
+
+CONNECT_TEXT = (
+    "🔗 **Connect Data Source**\n\n"
+    "Choose a platform to connect to your enterprise search:"
+)
+
+SEARCH_USAGE_TEXT = (
+    "🔍 **Search Usage**\n\n"
+    "Use: `/search <your query>`\n\n"
+    "**Examples:**\n"
+    "• `/search quarterly revenue growth`\n"
+    "• `/search team meeting notes from last week`\n"
+    "• `/search API documentation`\n\n"
+    "💡 **Tips:**\n"
+    "• Use natural language for better results\n"
+    "• I'll provide sources and citations\n"
+    "• Connect multiple sources for comprehensive search"
+)
+
+SEARCH_ACTIONS_KEYBOARD = StaticKeyboardMarkup([
+    [
+        InlineKeyboardButton("🔍 Refine Search", callback_data="refine_search"),
+        InlineKeyboardButton("📥 Get Documents", callback_data="get_documents")
+    ],
+    [
+        InlineKeyboardButton("📊 Summarize", callback_data="summarize_results"),
+        InlineKeyboardButton("🔄 Related Search", callback_data="related_search")
+    ]
+])
+
+UPLOAD_TEXT = (
+    "📤 **Upload File**\n\n"
+    "Send me a file to upload for indexing. Supported formats:\n"
+    "• PDF documents\n"
+    "• Word documents (.doc, .docx)\n"
+    "• Text files (.txt)\n"
+    "• Images with text\n\n"
+    "Or use `/cancel` to abort."
+)
+
+NO_SOURCES_KEYBOARD = StaticKeyboardMarkup([
+    [InlineKeyboardButton("🔗 Connect Sources", callback_data="connect")]
+])
+
+SOURCES_KEYBOARD = StaticKeyboardMarkup([
+    [
+        InlineKeyboardButton("🔄 Sync All", callback_data="sync_all_sources"),
+        InlineKeyboardButton("🔗 Add Source", callback_data="connect")
+    ],
+    [
+        InlineKeyboardButton("📊 Source Details", callback_data="source_details"),
+        InlineKeyboardButton("⚙️ Manage", callback_data="manage_sources")
+    ]
+])
+
+PROCESS_TEMPLATE = (
+    "✅ **Processing Complete**\n\n"
+    "📊 **Processed:** {document_count} document{plural}\n"
+    "⏱️ **Time:** {processing_time}\n\n"
+    "**Summary:**\n"
+    "{summary}\n\n"
+    "Your documents are now searchable!"
+)
+
+PROCESS_KEYBOARD = StaticKeyboardMarkup([
+    [
+        InlineKeyboardButton("🔍 Search Now", callback_data="search_demo"),
+        InlineKeyboardButton("📤 Upload More", callback_data="upload_file")
+    ]
+])
+
+STATUS_TEMPLATE = (
+    "📊 **System Status**\n\n"
+    "**🖥️ Backend Services:**\n"
+    "• Backend API: {backend_status}\n"
+    "• External APIs: {api_status}\n"
+    "• Requests Today: {requests_count}\n"
+    "• Avg Response: {avg_response_time}ms\n\n"
+    "**👤 Your Account:**\n"
+    "• Connected Sources: {connected_sources}\n"
+    "• Indexed Documents: {indexed_documents}\n"
+    "• Storage Used: {storage_used}\n"
+    "• Active Jobs: {active_jobs}\n\n"
+    "**🕐 Last Updated:** {timestamp}"
+)
+
+STATUS_KEYBOARD = StaticKeyboardMarkup([
+    [
+        InlineKeyboardButton("🔄 Refresh", callback_data="refresh_status"),
+        InlineKeyboardButton("📊 Detailed Stats", callback_data="detailed_stats")
+    ],
+    [
+        InlineKeyboardButton("🔗 Check Sources", callback_data="check_sources"),
+        InlineKeyboardButton("📋 View Jobs", callback_data="view_jobs")
+    ]
+])
 
-@require_auth
-async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle /start command."""
-    user = update.effective_user
+# Emoji shown for each source status; other statuses read as paused
+SOURCE_STATUS_EMOJI = {
+    "active": "✅",
+    "error": "❌"
+}
+
+# Emoji shown for each background job status
+JOB_STATUS_EMOJI = {
+    "running": "🔄",
+    "completed": "✅",
+    "failed": "❌",
+    "queued": "⏳",
+    "cancelled": "⏹️"
+}
+
+ADMIN_HELP_TEXT = (
+    "🔧 **Admin Commands**\n\n"
+    "`/admin stats` - Show system statistics\n"
+    "`/admin users` - List authorized users\n"
+    "`/admin add_user <user_id>` - Add user to whitelist\n"
+    "`/admin remove_user <user_id>` - Remove user from whitelist\n"
+    "`/admin backend <url>` - Update backend URL"
+)
+
+# Fire-and-forget tasks, referenced until done so they aren't garbage collected
+_background_tasks: Set[asyncio.Task] = set()
+
+# Last rendered /admin users list with the user sets it was built from;
+# AuthManager swaps in a new set on every change, so identity marks it stale
+_admin_users_cache: Tuple[Any, Any, str] = (None, None, "")
+
+RATE_LIMITED_TEXT = "⏳ Rate limit reached. Try again in {seconds} seconds."
+
+# Seconds a search result is reused for a repeated query from the same user
+SEARCH_CACHE_TTL = 300
+
+# Seconds a user's source list is served from Redis before re-fetching
+SOURCES_CACHE_TTL = 30
+# Seconds a source list prefetched on /start is kept; users usually run
+# /sources or /fetch within a minute of it
+SOURCES_PREFETCH_TTL = 60
+
+# Appended when a response is cut short to fit a message length budget
+TRUNCATION_NOTICE = "\n\n... (truncated)"
+
+# Result field holding [query, text] for a response already rendered for
+# that query; cached search results carry it
+FORMATTED_KEY = "_formatted"
+
+# Search results with at least this many citations and results combined are
+# formatted off the event loop; smaller ones aren't worth the thread hop
+FORMAT_IN_THREAD_MIN_ITEMS = 8
+
+
+def _search_version_key(user_id: int) -> str:
+    """Generate Redis key for a user's search cache version."""
+    return f"searchver:{user_id}"
+
+
+async def search_cache_key(user_id: int, query: str) -> str:
+    """Generate Redis key for a search, scoped to the user's current sources.
+    
+    Queries are normalized for case and whitespace, and the key includes the
+    version bumped by invalidate_search_cache, so results cached before a
+    connect or sync are never served afterwards.
+    """
+    version = await state_storage.get(_search_version_key(user_id)) or 0
+    normalized = " ".join(query.lower().split())
+    digest = hashlib.sha1(normalized.encode()).hexdigest()
+    return f"search:{user_id}:{version}:{digest}"
+
+
+async def _delete_quietly(bot, chat_id: int, message_id: int) -> None:
+    """Delete a message, ignoring failures (e.g. it is already gone)."""
+    try:
+        await bot.delete_message(chat_id=chat_id, message_id=message_id)
+    except Exception:
+        logger.debug("Message delete failed", chat_id=chat_id, message_id=message_id, exc_info=True)
+
+
+def _run_in_background(coro) -> None:
+    """Schedule a coroutine without awaiting it, keeping the task referenced."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def delete_message_later(context: ContextTypes.DEFAULT_TYPE, chat_id: int, message_id: int) -> None:
+    """Delete a loading message in the background.
     
-    welcome_message = f"""
-🚀 **Welcome to Enterprise Search Bot**
+    The reply doesn't depend on the delete, so handlers don't wait a round
+    trip for it.
+    """
+    _run_in_background(_delete_quietly(context.bot, chat_id, message_id))
 
-Hi {user.first_name}! I'm your AI-powered search assistant that can help you:
 
-🔍 **Search** across all your connected data sources
-📁 **Connect** to Google Drive, Slack, Notion, and more
-📤 **Upload** documents for instant indexing
-🔄 **Sync** your data sources automatically
-📊 **Process** documents with AI-powered analysis
+async def _prefetch_sources(user_id: int) -> None:
+    """Warm a user's cached source list, ignoring failures."""
+    try:
+        await get_sources_cached(user_id, SOURCES_PREFETCH_TTL)
+    except Exception:
+        logger.debug("Sources prefetch failed", user_id=user_id, exc_info=True)
 
-**Quick Start:**
-• Use `/connect` to link your data sources
-• Use `/search <query>` to find information
-• Use `/help` to see all available commands
 
-Let's get started! 🎯
+def enters_flow(flow: str):
+    """Decorator that puts the user into a conversation flow.
+    
+    The state write runs concurrently with the handler, so the reply doesn't
+    wait a Redis round trip for it.
     """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+            await asyncio.gather(
+                conversation_state.set_flow(update.effective_user.id, flow),
+                func(update, context)
+            )
+        return wrapper
+    return decorator
+
+
+async def _reject_if_rate_limited(update: Update, user_id: int, command: str) -> bool:
+    """Reply with a retry hint and return True if the user is over budget."""
+    wait = command_limiter.check(user_id, command)
+    if not wait:
+        return False
+    logger.info("Command rate limited", user_id=user_id, command=command, retry_in=wait)
+    await update.message.reply_text(RATE_LIMITED_TEXT.format(seconds=math.ceil(wait)))
+    return True
+
+
+async def invalidate_search_cache(user_id: int) -> None:
+    """Retire a user's cached search results after their sources change.
     
-    keyboard = [
-        [
-            InlineKeyboardButton("🔗 Connect Sources", callback_data="connect"),
-            InlineKeyboardButton("🔍 Search Demo", callback_data="search_demo")
-        ],
-        [
-            InlineKeyboardButton("📚 Help", callback_data="help"),
-            InlineKeyboardButton("⚙️ Settings", callback_data="settings")
-        ]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    The version only has to outlive the results cached under the old one,
+    so it expires with them.
+    """
+    await state_storage.set(_search_version_key(user_id), time.time_ns(), SEARCH_CACHE_TTL)
+
+
+def _sources_cache_key(user_id: int) -> str:
+    """Generate Redis key for a user's cached source list."""
+    return f"sources:{user_id}"
+
+
+async def get_sources_cached(user_id: int, ttl: int = SOURCES_CACHE_TTL):
+    """Get a user's sources, served from Redis while fresh.
+    
+    Shared by /sources, /fetch and the source callbacks, so browsing them in
+    a row costs one backend call. Storage errors read as a cache miss, so
+    Redis outages fall back to the backend.
+    """
+    key = _sources_cache_key(user_id)
+    cached = await state_storage.get(key)
+    if cached is not None:
+        return cached
+    
+    sources = await backend_client.get_sources(user_id)
+    if sources and "error" not in sources:
+        await state_storage.set(key, sources, ttl)
+    return sources
+
+
+async def invalidate_sources_cache(user_id: int) -> None:
+    """Drop a user's cached source list and search results after it may have changed."""
+    await asyncio.gather(
+        state_storage.delete(_sources_cache_key(user_id)),
+        invalidate_search_cache(user_id)
+    )
+
+
+@require_auth
+async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /start command."""
+    user = update.effective_user
     
     await update.message.reply_text(
-        welcome_message,
+        WELCOME_TEMPLATE.format(name=user.first_name),
         parse_mode="Markdown",
-        reply_markup=reply_markup
+        reply_markup=START_KEYBOARD
     )
     
     # Clear any existing conversation state
     await conversation_state.clear_state(user.id)
+    
+    # Warm the source list so a following /sources or /fetch is a cache hit
+    _run_in_background(_prefetch_sources(user.id))
 
 
 @require_auth
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /help command with comprehensive command guide."""
     
-    help_text = """
-� **Enterprise Search Bot - Command Guide**
-
-**🔍 Search & Discovery**
-`/search <query>` - AI-powered search with citations and sources
-`/fetch [source]` - Browse and fetch documents from connected sources
-
-**🔗 Data Source Management**
-`/connect` - Connect to external platforms (Drive, Slack, Notion, etc.)
-`/sources` - List all your connected data sources with status
-`/update [source_id]` - Manually sync data from specific sources
-
-**📤 File Management**
-`/upload` - Upload files for instant AI indexing and search
-`/process [doc_id]` - Process specific documents or all pending files
-
-**⚙️ System & Status**
-`/status [job_id]` - Check system status or specific background job
-`/settings` - View and manage your personal settings
-`/help` - Show this comprehensive help guide
-
-**🎯 Search Examples:**
-• `/search quarterly revenue growth and market trends`
-• `/search team meeting notes from last week`
-• `/search project Alpha documentation and requirements`
-• `/search customer feedback about new features`
-
-**💡 Pro Tips:**
-✅ **Natural Language:** Use conversational queries for better AI responses
-✅ **Citations:** All answers include source links and document references  
-✅ **Multi-Source:** Connect multiple platforms for comprehensive search
-✅ **File Formats:** Supports PDF, DOC, TXT, CSV, images with text, and more
-✅ **Real-time:** Upload files and search immediately after processing
-
-**🚀 Quick Start:**
-1. Use `/connect` to link your data sources
-2. Upload documents with `/upload` 
-3. Search with `/search your question here`
-4. Check status anytime with `/status`
-
-**👨‍💼 Admin Commands** (if you're an admin):
-`/admin stats` - View system statistics and usage metrics
-`/admin users` - Manage authorized users and permissions
-
-Need personalized help? Contact your system administrator.
-    """
-    
-    keyboard = [
-        [
-            InlineKeyboardButton("🔗 Connect Sources", callback_data="connect"),
-            InlineKeyboardButton("🔍 Try Demo Search", callback_data="search_demo")
-        ],
-        [
-            InlineKeyboardButton("📤 Upload File", callback_data="upload_file"),
-            InlineKeyboardButton("📊 Check Status", callback_data="refresh_status")
-        ]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
     await update.message.reply_text(
-        help_text,
+        HELP_TEXT,
         parse_mode="Markdown",
-        reply_markup=reply_markup
+        reply_markup=HELP_KEYBOARD
     )
 
 
 @require_auth
+@enters_flow("connect_platform")
 async def connect_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /connect command."""
-    user_id = update.effective_user.id
-    
-    # Set conversation flow
-    await conversation_state.set_flow(user_id, "connect_platform")
-    
-    keyboard = [
-        [
-            InlineKeyboardButton("📁 Google Drive", callback_data="connect_drive"),
-            InlineKeyboardButton("💬 Slack", callback_data="connect_slack")
-        ],
-        [
-            InlineKeyboardButton("📝 Notion", callback_data="connect_notion"),
-            InlineKeyboardButton("🌐 Custom URL", callback_data="connect_custom")
-        ],
-        [
-            InlineKeyboardButton("❌ Cancel", callback_data="cancel")
-        ]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
     await update.message.reply_text(
-        "🔗 **Connect Data Source**\n\n"
-        "Choose a platform to connect to your enterprise search:",
+        CONNECT_TEXT,
         parse_mode="Markdown",
-        reply_markup=reply_markup
+        reply_markup=CONNECT_KEYBOARD
     )
 
 
@@ -165,176 +409,235 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     user_id = update.effective_user.id
     
     if not context.args:
-        await update.message.reply_text(
-            "🔍 **Search Usage**\n\n"
-            "Use: `/search <your query>`\n\n"
-            "**Examples:**\n"
-            "• `/search quarterly revenue growth`\n"
-            "• `/search team meeting notes from last week`\n"
-            "• `/search API documentation`\n\n"
-            "💡 **Tips:**\n"
-            "• Use natural language for better results\n"
-            "• I'll provide sources and citations\n"
-            "• Connect multiple sources for comprehensive search",
-            parse_mode="Markdown"
-        )
+        await update.message.reply_text(SEARCH_USAGE_TEXT, parse_mode="Markdown")
         return
     
     query = " ".join(context.args)
+    loading_message = None
     
-    # Show enhanced loading message
-    loading_message = await update.message.reply_text("🔍 Searching across all sources...")
-    
-    # Show typing indicator
-    await context.bot.send_chat_action(chat_id=update.effective_chat.id, action="typing")
-    
-    # Perform search
     try:
-        result = await backend_client.search(user_id, query, include_citations=True)
-        
-        # Delete loading message
-        await context.bot.delete_message(
-            chat_id=update.effective_chat.id,
-            message_id=loading_message.message_id
-        )
+        # Repeated queries are answered from the cache, without a loading message
+        cache_key = await search_cache_key(user_id, query)
+        result: Optional[Dict[str, Any]] = await state_storage.get(cache_key)
         
-        if not result or "error" in result:
-            error_msg = result.get("error", "Unknown error") if result else "Backend unavailable"
-            await update.message.reply_text(
-                f"❌ Search failed: {error_msg}\n\n"
-                "Please try again or contact support if the issue persists."
+        if result is None:
+            # Only searches that reach the backend count against the budget
+            if await _reject_if_rate_limited(update, user_id, "search"):
+                return
+            
+            # Show the loading message and typing indicator while the search
+            # runs; they are cosmetic, so only a search failure is an error
+            loading_message, _, result = await asyncio.gather(
+                update.message.reply_text("🔍 Searching across all sources..."),
+                context.bot.send_chat_action(chat_id=update.effective_chat.id, action="typing"),
+                backend_client.search(user_id, query, include_citations=True),
+                return_exceptions=True
             )
-            return
-        
+            if isinstance(loading_message, Exception):
+                logger.warning("Loading message failed", error=str(loading_message))
+                loading_message = None
+            if isinstance(result, Exception):
+                raise result
+            
+            # Delete loading message without holding up the reply
+            if loading_message is not None:
+                delete_message_later(context, update.effective_chat.id, loading_message.message_id)
+                loading_message = None
+            
+            if not result or "error" in result:
+                error_msg = result.get("error", "Unknown error") if result else "Backend unavailable"
+                await update.message.reply_text(
+                    f"❌ Search failed: {error_msg}\n\n"
+                    "Please try again or contact support if the issue persists."
+                )
+                return
+            
         # Format response with citations
         response_text = await format_search_response(result, query)
         
-        # Send response (split if too long)
-        if len(response_text) > 4000:
-            # Split into chunks
-            chunks = split_long_message(response_text)
-            for i, chunk in enumerate(chunks):
-                if i == 0:
-                    await update.message.reply_text(chunk, parse_mode="Markdown", disable_web_page_preview=True)
-                else:
-                    await context.bot.send_message(
-                        chat_id=update.effective_chat.id,
-                        text=chunk,
-                        parse_mode="Markdown",
-                        disable_web_page_preview=True
-                    )
-        else:
-            await update.message.reply_text(response_text, parse_mode="Markdown", disable_web_page_preview=True)
-        
-        # Show quick actions if we have results
-        if result.get("results") and len(result["results"]) > 0:
-            keyboard = [
-                [
-                    InlineKeyboardButton("🔍 Refine Search", callback_data="refine_search"),
-                    InlineKeyboardButton("📥 Get Documents", callback_data="get_documents")
-                ],
-                [
-                    InlineKeyboardButton("📊 Summarize", callback_data="summarize_results"),
-                    InlineKeyboardButton("🔄 Related Search", callback_data="related_search")
-                ]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            await update.message.reply_text(
-                "**Quick Actions:**",
-                parse_mode="Markdown",
-                reply_markup=reply_markup
-            )
-            
-    except Exception as e:
-        # Delete loading message if it exists
-        try:
-            await context.bot.delete_message(
-                chat_id=update.effective_chat.id,
-                message_id=loading_message.message_id
-            )
-        except:
-            pass
+        if FORMATTED_KEY not in result:
+            # Cache the rendering with the result so repeats skip formatting
+            result[FORMATTED_KEY] = [query, response_text]
+            await state_storage.set(cache_key, result, SEARCH_CACHE_TTL)
+        
+        # Send response (split if too long), with quick actions if we have results
+        reply_markup = SEARCH_ACTIONS_KEYBOARD if result.get("results") else None
+        await reply_long_message(update, context, response_text, reply_markup=reply_markup)
             
-        logger.error("Search command error", error=str(e), user_id=user_id, query=query)
+    except Exception:
+        # Delete loading message if it is still shown
+        if loading_message is not None:
+            delete_message_later(context, update.effective_chat.id, loading_message.message_id)
+        
+        logger.exception("Search command error", user_id=user_id, query=query)
         await update.message.reply_text(
             "❌ Search error. Please try again or check your connections."
         )
 
 
-async def format_search_response(result: dict, query: str = "") -> str:
-    """Format search results with Perplexity-style citations."""
+def _search_response_sections(result: dict, query: str):
+    """Yield the pieces of a formatted search response in display order."""
     answer = result.get("answer", "")
     citations = result.get("citations", [])
     results = result.get("results", [])
     
-    if not answer and not results:
-        return "❌ No results found for your query.\n\n💡 Try:\n• Using different keywords\n• Connecting more data sources\n• Checking if your sources are properly synced"
-    
     # Start with the query header
-    response = f"🔍 **Search Results for: \"{query}\"**\n\n"
+    yield f"🔍 **Search Results for: \"{query}\"**\n\n"
     
     # Add the AI-generated answer if available
     if answer:
-        response += f"{answer}\n\n"
+        yield f"{answer}\n\n"
     
     # Add citations in Perplexity style
     if citations:
-        response += "📚 **Sources:**\n"
+        yield "📚 **Sources:**\n"
         for i, citation in enumerate(citations, 1):
-            cite_id = citation.get("id", i)
-            title = citation.get("title", f"Document {i}")
-            url = citation.get("url", "")
-            source = citation.get("source", "Unknown")
-            snippet = citation.get("snippet", "")
-            
-            # Format citation entry
-            if url:
-                response += f"[{cite_id}] [{title}]({url})\n"
-            else:
-                response += f"[{cite_id}] {title}\n"
-                
-            response += f"    📂 {source}"
+            get = citation.get
+            # Most citations have a title, so only build the default when needed
+            title = get("title")
+            if title is None:
+                title = f"Document {i}"
+            url = get("url")
+            link = f"[{title}]({url})" if url else title
+            snippet = get("snippet")
             
             if snippet:
                 # Clean and truncate snippet
                 clean_snippet = snippet.replace('\n', ' ').strip()
                 if len(clean_snippet) > 100:
                     clean_snippet = clean_snippet[:100] + "..."
-                response += f" | {clean_snippet}"
-            response += "\n\n"
+                yield f"[{get('id', i)}] {link}\n    📂 {get('source', 'Unknown')} | {clean_snippet}\n\n"
+            else:
+                yield f"[{get('id', i)}] {link}\n    📂 {get('source', 'Unknown')}\n\n"
     
     # Add raw results if no AI answer
     elif results:
-        response += "📄 **Found Documents:**\n"
+        yield "📄 **Found Documents:**\n"
         for i, result_item in enumerate(results[:5], 1):  # Limit to top 5
-            title = result_item.get("title", f"Document {i}")
-            source = result_item.get("source", "Unknown")
-            snippet = result_item.get("snippet", "")
-            url = result_item.get("url", "")
+            get = result_item.get
+            title = get("title")
+            if title is None:
+                title = f"Document {i}"
+            url = get("url")
+            link = f"[{title}]({url})" if url else title
+            snippet = get("snippet")
             
-            if url:
-                response += f"{i}. [{title}]({url})\n"
-            else:
-                response += f"{i}. {title}\n"
-                
-            response += f"   📂 {source}"
             if snippet:
                 clean_snippet = snippet.replace('\n', ' ').strip()[:80]
-                response += f" — {clean_snippet}..."
-            response += "\n\n"
+                yield f"{i}. {link}\n   📂 {get('source', 'Unknown')} — {clean_snippet}...\n\n"
+            else:
+                yield f"{i}. {link}\n   📂 {get('source', 'Unknown')}\n\n"
     
     # Add footer with search stats
     total_results = len(results) if results else len(citations)
     if total_results > 0:
-        response += f"📊 Found {total_results} result{'s' if total_results != 1 else ''}"
+        footer = f"📊 Found {total_results} result{'s' if total_results != 1 else ''}"
         
         # Add timing info if available
         search_time = result.get("search_time")
         if search_time:
-            response += f" in {search_time}ms"
+            footer += f" in {search_time}ms"
+        yield footer
+
+
+def _format_search_response(result: dict, query: str, max_length: Optional[int]) -> str:
+    """Format search results; the synchronous body of format_search_response."""
+    if not result.get("answer") and not result.get("results"):
+        return "❌ No results found for your query.\n\n💡 Try:\n• Using different keywords\n• Connecting more data sources\n• Checking if your sources are properly synced"
+    
+    sections = _search_response_sections(result, query)
+    if max_length is None:
+        return "".join(sections)
+    
+    budget = max_length - len(TRUNCATION_NOTICE)
+    parts = []
+    length = 0
+    for section in sections:
+        if length + len(section) > budget:
+            parts.append(section[:budget - length])
+            parts.append(TRUNCATION_NOTICE)
+            break
+        parts.append(section)
+        length += len(section)
+    
+    return "".join(parts)
+
+
+async def format_search_response(result: dict, query: str = "", max_length: Optional[int] = None) -> str:
+    """Format search results with Perplexity-style citations.
     
-    return response
+    With max_length, formatting stops once the budget is spent and the
+    response ends with TRUNCATION_NOTICE; the result never exceeds max_length.
+    Large results are formatted in a worker thread so cleaning their
+    snippets doesn't stall other updates on the event loop. A result that
+    carries its own rendering for this query (see FORMATTED_KEY) returns it
+    as is.
+    """
+    formatted = result.get(FORMATTED_KEY)
+    if formatted and max_length is None and formatted[0] == query:
+        return formatted[1]
+    
+    item_count = len(result.get("citations") or ()) + len(result.get("results") or ())
+    if item_count >= FORMAT_IN_THREAD_MIN_ITEMS:
+        return await asyncio.to_thread(_format_search_response, result, query, max_length)
+    return _format_search_response(result, query, max_length)
+
+
+async def reply_long_message(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    text: str,
+    reply_markup: Optional[InlineKeyboardMarkup] = None,
+    edit_message: Optional[Message] = None
+) -> None:
+    """Reply with a Markdown message, split into chunks if it is too long.
+    
+    Chunks go out one at a time, since concurrent sends to a chat may arrive
+    out of order, but through the outbound limiter so a long answer is paced
+    within Telegram's per-chat limit instead of tripping a RetryAfter.
+    reply_markup is attached to the last chunk. If edit_message is given
+    (e.g. a "Searching..." indicator), the first chunk replaces its text
+    instead of being sent as a new message; if that edit fails (say, the
+    answer has Markdown Telegram can't parse), edit_message is deleted so it
+    doesn't linger next to the caller's error reply.
+    """
+    chat_id = update.effective_chat.id
+    chunks = split_long_message(text)
+    last = len(chunks) - 1
+    first_send = edit_message.edit_text if edit_message is not None else update.message.reply_text
+    try:
+        await outbound_limiter.call(
+            chat_id, first_send,
+            chunks[0], parse_mode="Markdown", disable_web_page_preview=True,
+            reply_markup=reply_markup if last == 0 else None
+        )
+    except Exception:
+        if edit_message is not None:
+            delete_message_later(context, chat_id, edit_message.message_id)
+        raise
+    for i, chunk in enumerate(chunks[1:], 1):
+        await outbound_limiter.call(
+            chat_id, context.bot.send_message,
+            chat_id=chat_id, text=chunk, parse_mode="Markdown", disable_web_page_preview=True,
+            reply_markup=reply_markup if i == last else None
+        )
+
+
+def _split_long_line(line: str, max_length: int) -> list:
+    """Split a line with no newlines into pieces, preferring to break at spaces."""
+    pieces = []
+    start = 0
+    while len(line) - start > max_length:
+        end = line.rfind(' ', start, start + max_length + 1)
+        if end <= start:
+            # No space to break at; cut mid-word
+            pieces.append(line[start:start + max_length])
+            start += max_length
+        else:
+            pieces.append(line[start:end])
+            start = end + 1
+    pieces.append(line[start:])
+    return pieces
 
 
 def split_long_message(text: str, max_length: int = 4000) -> list:
@@ -342,40 +645,42 @@ def split_long_message(text: str, max_length: int = 4000) -> list:
     if len(text) <= max_length:
         return [text]
     
-    chunks = []
-    current_chunk = ""
+    # Single-paragraph text needs no line bookkeeping
+    if '\n' not in text:
+        return _split_long_line(text, max_length)
     
-    for line in text.split('\n'):
-        if len(current_chunk) + len(line) + 1 <= max_length:
-            current_chunk += line + '\n'
-        else:
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-            current_chunk = line + '\n'
+    chunks = []
+    start = 0
+    while len(text) - start > max_length:
+        # Break at the last newline that keeps the chunk within max_length
+        cut = text.rfind('\n', start, start + max_length + 1)
+        if cut == -1:
+            # The next line is too long for any chunk and is split on its own;
+            # its last piece starts the next chunk
+            line_end = text.find('\n', start)
+            if line_end == -1:
+                line_end = len(text)
+            *pieces, rest = _split_long_line(text[start:line_end], max_length)
+            chunks.extend(pieces)
+            start = line_end - len(rest)
+            continue
+        chunk = text[start:cut].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = cut + 1
     
-    if current_chunk:
-        chunks.append(current_chunk.strip())
+    chunk = text[start:].strip()
+    if chunk:
+        chunks.append(chunk)
     
     return chunks
 
 
 @require_auth
+@enters_flow("upload_file")
 async def upload_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /upload command."""
-    user_id = update.effective_user.id
-    
-    await conversation_state.set_flow(user_id, "upload_file")
-    
-    await update.message.reply_text(
-        "📤 **Upload File**\n\n"
-        "Send me a file to upload for indexing. Supported formats:\n"
-        "• PDF documents\n"
-        "• Word documents (.doc, .docx)\n"
-        "• Text files (.txt)\n"
-        "• Images with text\n\n"
-        "Or use `/cancel` to abort.",
-        parse_mode="Markdown"
-    )
+    await update.message.reply_text(UPLOAD_TEXT, parse_mode="Markdown")
 
 
 @require_auth
@@ -384,7 +689,7 @@ async def sources_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     user_id = update.effective_user.id
     
     try:
-        sources_data = await backend_client.get_sources(user_id)
+        sources_data = await get_sources_cached(user_id)
         
         if not sources_data or "error" in sources_data:
             error_msg = sources_data.get("error", "Unknown error") if sources_data else "Backend unavailable"
@@ -397,22 +702,17 @@ async def sources_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         sources = sources_data.get("sources", [])
         
         if not sources:
-            keyboard = [
-                [InlineKeyboardButton("🔗 Connect Sources", callback_data="connect")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
             await update.message.reply_text(
                 "📂 **No Sources Connected**\n\n"
                 "You haven't connected any data sources yet.\n"
                 "Use the button below to get started!",
                 parse_mode="Markdown",
-                reply_markup=reply_markup
+                reply_markup=NO_SOURCES_KEYBOARD
             )
             return
         
         # Format sources list
-        sources_message = "📂 **Your Connected Sources:**\n\n"
+        parts = ["📂 **Your Connected Sources:**\n\n"]
         
         for i, source in enumerate(sources, 1):
             name = source.get("name", f"Source {i}")
@@ -422,40 +722,38 @@ async def sources_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             doc_count = source.get("document_count", 0)
             
             # Status emoji
-            status_emoji = "✅" if status == "active" else "❌" if status == "error" else "⏸️"
+            status_emoji = SOURCE_STATUS_EMOJI.get(status, "⏸️")
             
-            sources_message += f"{i}. **{name}**\n"
-            sources_message += f"   🔧 Platform: {platform.title()}\n"
-            sources_message += f"   {status_emoji} Status: {status.title()}\n"
-            sources_message += f"   📄 Documents: {doc_count}\n"
-            sources_message += f"   🔄 Last Sync: {last_sync}\n\n"
+            parts.append(
+                f"{i}. **{name}**\n"
+                f"   🔧 Platform: {platform.title()}\n"
+                f"   {status_emoji} Status: {status.title()}\n"
+                f"   📄 Documents: {doc_count}\n"
+                f"   🔄 Last Sync: {last_sync}\n\n"
+            )
         
-        # Add quick action buttons
-        keyboard = [
-            [
-                InlineKeyboardButton("🔄 Sync All", callback_data="sync_all_sources"),
-                InlineKeyboardButton("🔗 Add Source", callback_data="connect")
-            ],
-            [
-                InlineKeyboardButton("📊 Source Details", callback_data="source_details"),
-                InlineKeyboardButton("⚙️ Manage", callback_data="manage_sources")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        sources_message = "".join(parts)
         
         await update.message.reply_text(
             sources_message,
             parse_mode="Markdown",
-            reply_markup=reply_markup
+            reply_markup=SOURCES_KEYBOARD
         )
         
-    except Exception as e:
-        logger.error("Sources command error", error=str(e), user_id=user_id)
+    except Exception:
+        logger.exception("Sources command error", user_id=user_id)
         await update.message.reply_text(
             "❌ Error fetching sources. Please try again."
         )
 
 
+def _fetch_button_text(source: Dict[str, Any]) -> str:
+    """Label a source's button in the /fetch keyboard."""
+    platform = source.get("platform")
+    name = source.get("name", "Unknown")
+    return f"📁 {name} ({platform})" if platform else f"📁 {name}"
+
+
 @require_auth
 async def fetch_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /fetch command - fetch data from specific source."""
@@ -469,7 +767,7 @@ async def fetch_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     
     # Show available sources for selection
     try:
-        sources_data = await backend_client.get_sources(user_id)
+        sources_data = await get_sources_cached(user_id)
         
         if not sources_data or "error" in sources_data:
             await update.message.reply_text(
@@ -480,44 +778,28 @@ async def fetch_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         sources = sources_data.get("sources", [])
         
         if not sources:
-            keyboard = [
-                [InlineKeyboardButton("🔗 Connect Sources", callback_data="connect")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
             await update.message.reply_text(
                 "📥 **No Sources to Fetch From**\n\n"
                 "Connect data sources first to fetch documents.",
                 parse_mode="Markdown",
-                reply_markup=reply_markup
+                reply_markup=NO_SOURCES_KEYBOARD
             )
             return
         
-        # Create source selection keyboard
-        keyboard = []
-        for source in sources:
-            source_id = source.get("id")
-            source_name = source.get("name", "Unknown")
-            platform = source.get("platform", "")
-            status = source.get("status", "")
-            
-            # Only show active sources
-            if status == "active":
-                button_text = f"📁 {source_name}"
-                if platform:
-                    button_text += f" ({platform})"
-                
-                keyboard.append([
-                    InlineKeyboardButton(button_text, callback_data=f"fetch_source_{source_id}")
-                ])
-        
-        if not keyboard:
+        # Only active sources can be fetched from
+        active_sources = [source for source in sources if source.get("status") == "active"]
+        if not active_sources:
             await update.message.reply_text(
                 "❌ No active sources available for fetching.\n"
                 "Please check your source connections."
             )
             return
         
+        # Create source selection keyboard
+        keyboard = [
+            [InlineKeyboardButton(_fetch_button_text(source), callback_data=f"fetch_source_{source.get('id')}")]
+            for source in active_sources
+        ]
         keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cancel")])
         reply_markup = InlineKeyboardMarkup(keyboard)
         
@@ -528,8 +810,8 @@ async def fetch_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
             reply_markup=reply_markup
         )
         
-    except Exception as e:
-        logger.error("Fetch command error", error=str(e), user_id=user_id)
+    except Exception:
+        logger.exception("Fetch command error", user_id=user_id)
         await update.message.reply_text(
             "❌ Error accessing sources. Please try again."
         )
@@ -544,11 +826,9 @@ async def handle_fetch_from_source(update: Update, context: ContextTypes.DEFAULT
     try:
         result = await backend_client.fetch_from_source(user_id, source_name)
         
-        # Delete loading message
-        await context.bot.delete_message(
-            chat_id=update.effective_chat.id,
-            message_id=loading_message.message_id
-        )
+        # Delete loading message without holding up the reply
+        delete_message_later(context, update.effective_chat.id, loading_message.message_id)
+        loading_message = None
         
         if not result or "error" in result:
             error_msg = result.get("error", "Unknown error") if result else "Fetch failed"
@@ -573,17 +853,12 @@ async def handle_fetch_from_source(update: Update, context: ContextTypes.DEFAULT
         
         await update.message.reply_text(fetch_message.strip(), parse_mode="Markdown")
         
-    except Exception as e:
-        # Delete loading message if it exists
-        try:
-            await context.bot.delete_message(
-                chat_id=update.effective_chat.id,
-                message_id=loading_message.message_id
-            )
-        except:
-            pass
+    except Exception:
+        # Delete loading message if it is still shown
+        if loading_message is not None:
+            delete_message_later(context, update.effective_chat.id, loading_message.message_id)
             
-        logger.error("Fetch source error", error=str(e), user_id=user_id, source=source_name)
+        logger.exception("Fetch source error", user_id=user_id, source=source_name)
         await update.message.reply_text(
             f"❌ Error fetching from {source_name}. Check if the source is properly connected."
         )
@@ -594,6 +869,9 @@ async def process_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     """Handle /process command - process uploaded documents."""
     user_id = update.effective_user.id
     
+    if await _reject_if_rate_limited(update, user_id, "process"):
+        return
+    
     # Check if specific document ID was provided
     if context.args:
         doc_id = context.args[0]
@@ -606,11 +884,9 @@ async def process_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     try:
         result = await backend_client.process_documents(user_id)
         
-        # Delete loading message
-        await context.bot.delete_message(
-            chat_id=update.effective_chat.id,
-            message_id=loading_message.message_id
-        )
+        # Delete loading message without holding up the reply
+        delete_message_later(context, update.effective_chat.id, loading_message.message_id)
+        loading_message = None
         
         if not result or "error" in result:
             error_msg = result.get("error", "Unknown error") if result else "Processing failed"
@@ -624,44 +900,25 @@ async def process_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         summary = result.get("summary", "Documents processed successfully.")
         processing_time = result.get("processing_time", "Unknown")
         
-        process_message = f"""
-✅ **Processing Complete**
-
-📊 **Processed:** {document_count} document{'s' if document_count != 1 else ''}
-⏱️ **Time:** {processing_time}
-
-**Summary:**
-{summary}
-
-Your documents are now searchable!
-        """
-        
-        # Add quick actions
-        keyboard = [
-            [
-                InlineKeyboardButton("🔍 Search Now", callback_data="search_demo"),
-                InlineKeyboardButton("📤 Upload More", callback_data="upload_file")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        process_message = PROCESS_TEMPLATE.format(
+            document_count=document_count,
+            plural="s" if document_count != 1 else "",
+            processing_time=processing_time,
+            summary=summary
+        )
         
         await update.message.reply_text(
-            process_message.strip(),
+            process_message,
             parse_mode="Markdown",
-            reply_markup=reply_markup
+            reply_markup=PROCESS_KEYBOARD
         )
         
-    except Exception as e:
-        # Delete loading message if it exists
-        try:
-            await context.bot.delete_message(
-                chat_id=update.effective_chat.id,
-                message_id=loading_message.message_id
-            )
-        except:
-            pass
+    except Exception:
+        # Delete loading message if it is still shown
+        if loading_message is not None:
+            delete_message_later(context, update.effective_chat.id, loading_message.message_id)
             
-        logger.error("Process command error", error=str(e), user_id=user_id)
+        logger.exception("Process command error", user_id=user_id)
         await update.message.reply_text(
             "❌ Error processing documents. Please try again."
         )
@@ -676,11 +933,9 @@ async def handle_process_document(update: Update, context: ContextTypes.DEFAULT_
     try:
         result = await backend_client.process_document(user_id, doc_id)
         
-        # Delete loading message
-        await context.bot.delete_message(
-            chat_id=update.effective_chat.id,
-            message_id=loading_message.message_id
-        )
+        # Delete loading message without holding up the reply
+        delete_message_later(context, update.effective_chat.id, loading_message.message_id)
+        loading_message = None
         
         if not result or "error" in result:
             error_msg = result.get("error", "Unknown error") if result else "Processing failed"
@@ -702,17 +957,12 @@ async def handle_process_document(update: Update, context: ContextTypes.DEFAULT_
             parse_mode="Markdown"
         )
         
-    except Exception as e:
-        # Delete loading message if it exists
-        try:
-            await context.bot.delete_message(
-                chat_id=update.effective_chat.id,
-                message_id=loading_message.message_id
-            )
-        except:
-            pass
+    except Exception:
+        # Delete loading message if it is still shown
+        if loading_message is not None:
+            delete_message_later(context, update.effective_chat.id, loading_message.message_id)
             
-        logger.error("Process document error", error=str(e), user_id=user_id, doc_id=doc_id)
+        logger.exception("Process document error", user_id=user_id, doc_id=doc_id)
         await update.message.reply_text(
             f"❌ Error processing document {doc_id}. Please try again."
         )
@@ -731,8 +981,20 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     
     # Show general system status
     try:
-        system_status = await backend_client.get_system_status()
-        user_status = await backend_client.get_user_status(user_id)
+        # The lookups are independent; a failed one shows defaults for its fields
+        system_status, user_status = await asyncio.gather(
+            backend_client.get_system_status(),
+            backend_client.get_user_status(user_id),
+            return_exceptions=True
+        )
+        if isinstance(system_status, Exception) and isinstance(user_status, Exception):
+            raise system_status
+        if isinstance(system_status, Exception):
+            logger.warning("System status lookup failed", error=str(system_status))
+            system_status = {}
+        if isinstance(user_status, Exception):
+            logger.warning("User status lookup failed", error=str(user_status))
+            user_status = {}
         
         # Format system status
         backend_status = "✅ Online" if system_status.get("backend", False) else "❌ Offline"
@@ -747,45 +1009,26 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         storage_used = user_status.get("storage_used", "0 MB")
         active_jobs = user_status.get("active_jobs", 0)
         
-        status_message = f"""
-📊 **System Status**
-
-**🖥️ Backend Services:**
-• Backend API: {backend_status}
-• External APIs: {api_status}
-• Requests Today: {requests_count}
-• Avg Response: {avg_response_time}ms
-
-**👤 Your Account:**
-• Connected Sources: {connected_sources}
-• Indexed Documents: {indexed_documents}
-• Storage Used: {storage_used}
-• Active Jobs: {active_jobs}
-
-**🕐 Last Updated:** {system_status.get('timestamp', 'Unknown')}
-        """
-        
-        # Add quick actions
-        keyboard = [
-            [
-                InlineKeyboardButton("🔄 Refresh", callback_data="refresh_status"),
-                InlineKeyboardButton("📊 Detailed Stats", callback_data="detailed_stats")
-            ],
-            [
-                InlineKeyboardButton("🔗 Check Sources", callback_data="check_sources"),
-                InlineKeyboardButton("📋 View Jobs", callback_data="view_jobs")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        status_message = STATUS_TEMPLATE.format(
+            backend_status=backend_status,
+            api_status=api_status,
+            requests_count=requests_count,
+            avg_response_time=avg_response_time,
+            connected_sources=connected_sources,
+            indexed_documents=indexed_documents,
+            storage_used=storage_used,
+            active_jobs=active_jobs,
+            timestamp=system_status.get("timestamp", "Unknown")
+        )
         
         await update.message.reply_text(
-            status_message.strip(),
+            status_message,
             parse_mode="Markdown",
-            reply_markup=reply_markup
+            reply_markup=STATUS_KEYBOARD
         )
         
-    except Exception as e:
-        logger.error("Status command error", error=str(e), user_id=user_id)
+    except Exception:
+        logger.exception("Status command error", user_id=user_id)
         
         # Fallback status message
         fallback_message = """
@@ -829,14 +1072,7 @@ async def handle_job_status(update: Update, context: ContextTypes.DEFAULT_TYPE,
         started_at = job_status.get("started_at", "Unknown")
         estimated_completion = job_status.get("estimated_completion", "Unknown")
         
-        # Status emoji
-        status_emoji = {
-            "running": "🔄",
-            "completed": "✅",
-            "failed": "❌",
-            "queued": "⏳",
-            "cancelled": "⏹️"
-        }.get(status.lower(), "❓")
+        status_emoji = JOB_STATUS_EMOJI.get(status.lower(), "❓")
         
         job_message = f"""
 📋 **Job Status**
@@ -864,8 +1100,8 @@ async def handle_job_status(update: Update, context: ContextTypes.DEFAULT_TYPE,
             parse_mode="Markdown"
         )
         
-    except Exception as e:
-        logger.error("Job status error", error=str(e), user_id=user_id, job_id=job_id)
+    except Exception:
+        logger.exception("Job status error", user_id=user_id, job_id=job_id)
         await update.message.reply_text(
             f"❌ Error checking job {job_id}. Please try again."
         )
@@ -875,15 +1111,7 @@ async def handle_job_status(update: Update, context: ContextTypes.DEFAULT_TYPE,
 async def admin_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle admin commands."""
     if not context.args:
-        await update.message.reply_text(
-            "🔧 **Admin Commands**\n\n"
-            "`/admin stats` - Show system statistics\n"
-            "`/admin users` - List authorized users\n"
-            "`/admin add_user <user_id>` - Add user to whitelist\n"
-            "`/admin remove_user <user_id>` - Remove user from whitelist\n"
-            "`/admin backend <url>` - Update backend URL",
-            parse_mode="Markdown"
-        )
+        await update.message.reply_text(ADMIN_HELP_TEXT, parse_mode="Markdown")
         return
     
     subcommand = context.args[0].lower()
@@ -927,12 +1155,18 @@ async def show_admin_stats(update: Update, context: ContextTypes.DEFAULT_TYPE) -
 
 async def show_admin_users(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show authorized users."""
+    global _admin_users_cache
     from ..auth import auth_manager
     
-    users_text = "👥 **Authorized Users**\n\n"
-    for user_id in auth_manager.allowed_users:
-        is_admin = "👑" if user_id in auth_manager.admin_users else "👤"
-        users_text += f"{is_admin} `{user_id}`\n"
+    allowed_users = auth_manager.allowed_users
+    admin_users = auth_manager.admin_users
+    cached_allowed, cached_admins, users_text = _admin_users_cache
+    if cached_allowed is not allowed_users or cached_admins is not admin_users:
+        users_text = "👥 **Authorized Users**\n\n" + "".join(
+            f"{'👑' if user_id in admin_users else '👤'} `{user_id}`\n"
+            for user_id in sorted(allowed_users)
+        )
+        _admin_users_cache = (allowed_users, admin_users, users_text)
     
     await update.message.reply_text(users_text, parse_mode="Markdown")
 
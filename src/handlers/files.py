@@ -1,11 +1,15 @@
 """
 File upload handlers for the Telegram bot.
 """
+import asyncio
 import os
-from typing import Optional
+import tempfile
+import time
+from typing import BinaryIO, Optional
 from datetime import datetime
 
-from telegram import Update, File, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import TelegramError
 from telegram.ext import ContextTypes
 
 from ..auth import require_auth
@@ -13,9 +17,47 @@ from ..storage import conversation_state, file_storage
 from ..backend import backend_client
 from ..config import settings
 from ..logging_config import get_logger
+from .keyboards import StaticKeyboardMarkup
 
 logger = get_logger(__name__)
 
+# Files up to this many bytes stay in memory for the backend upload; larger
+# ones are written to a temporary file once downloaded
+UPLOAD_SPOOL_MAX_SIZE = 2 * 1024 * 1024
+# The hosted Bot API only serves downloads up to this many MB; larger files
+# would fail in get_file, so they are turned away before any API call
+TELEGRAM_DOWNLOAD_MAX_MB = 20
+# Minimum seconds between intermediate upload progress edits
+UPLOAD_STATUS_MIN_INTERVAL = 1.5
+
+# File extensions the backend can index
+SUPPORTED_EXTENSIONS = frozenset({
+    '.pdf', '.doc', '.docx', '.txt', '.rtf',
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp',
+    '.mp3', '.wav', '.ogg', '.m4a',
+    '.csv', '.xlsx', '.xls',
+    '.md', '.html', '.xml', '.json'
+})
+
+# Reply to a message carrying no document, photo, voice note or audio
+UNSUPPORTED_FILE_TYPE_TEXT = (
+    "❌ **Unsupported File Type**\n\n"
+    "Supported formats:\n"
+    "• 📄 Documents: PDF, DOC, DOCX, TXT, RTF\n"
+    "• 🖼️ Images: JPG, PNG, GIF (with text)\n" 
+    "• 🎵 Audio: MP3, WAV, OGG\n"
+    "• 📊 Data: CSV, XLS, XLSX, JSON\n"
+    "• 📝 Text: MD, HTML, XML"
+)
+
+# Quick actions after a file that was indexed right away
+UPLOAD_INDEXED_KEYBOARD = StaticKeyboardMarkup([
+    [
+        InlineKeyboardButton("🔍 Search Now", callback_data="search_demo"),
+        InlineKeyboardButton("📤 Upload Another", callback_data="upload_file")
+    ]
+])
+
 
 @require_auth
 async def handle_file_upload(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -48,31 +90,27 @@ async def handle_file_upload(update: Update, context: ContextTypes.DEFAULT_TYPE)
         filename = file_obj.file_name or f"audio_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
     else:
         await update.message.reply_text(
-            "❌ **Unsupported File Type**\n\n"
-            "Supported formats:\n"
-            "• 📄 Documents: PDF, DOC, DOCX, TXT, RTF\n"
-            "• 🖼️ Images: JPG, PNG, GIF (with text)\n" 
-            "• 🎵 Audio: MP3, WAV, OGG\n"
-            "• 📊 Data: CSV, XLS, XLSX, JSON\n"
-            "• 📝 Text: MD, HTML, XML",
+            UNSUPPORTED_FILE_TYPE_TEXT,
             parse_mode="Markdown"
         )
         return
     
+    # Extension is reused for the type check, metadata and every status message
+    ext = get_file_extension(filename)
+    ext_label = ext[1:].upper()
+    
     # Check file size
+    max_size_mb = min(settings.max_file_size_mb, TELEGRAM_DOWNLOAD_MAX_MB)
     file_size_mb = file_obj.file_size / (1024 * 1024) if file_obj.file_size else 0
-    if file_size_mb > settings.max_file_size_mb:
+    if file_size_mb > max_size_mb:
         await update.message.reply_text(
-            f"❌ **File Too Large**\n\n"
-            f"Maximum size: {settings.max_file_size_mb}MB\n"
-            f"Your file: {file_size_mb:.1f}MB\n\n"
-            f"💡 Try compressing the file or splitting it into smaller parts.",
+            _file_too_large_text(max_size_mb, file_size_mb),
             parse_mode="Markdown"
         )
         return
     
     # Check if file type is supported
-    if not is_supported_file_type(filename):
+    if ext not in SUPPORTED_EXTENSIONS:
         await update.message.reply_text(
             f"❌ **Unsupported File Extension**\n\n"
             f"File: `{filename}`\n"
@@ -82,32 +120,36 @@ async def handle_file_upload(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
         return
     
+    spool = None
     try:
         # Show enhanced processing message
+        status_header = _upload_status_header(filename, file_size_mb, ext_label)
         processing_msg = await update.message.reply_text(
-            f"📤 **Uploading and Processing File**\n\n"
-            f"📄 **File:** `{filename}`\n"
-            f"📊 **Size:** {file_size_mb:.1f} MB\n"
-            f"🔧 **Type:** {get_file_extension(filename).upper()[1:]}\n"
-            f"⏳ **Status:** Downloading from Telegram...",
+            status_header + "Downloading from Telegram...",
             parse_mode="Markdown"
         )
+        editor = ThrottledEditor(processing_msg, status_header)
         
-        # Download file from Telegram with progress
-        telegram_file: File = await file_obj.get_file()
-        
-        # Update status
-        await processing_msg.edit_text(
-            f"📤 **Uploading and Processing File**\n\n"
-            f"📄 **File:** `{filename}`\n"
-            f"📊 **Size:** {file_size_mb:.1f} MB\n"
-            f"🔧 **Type:** {get_file_extension(filename).upper()[1:]}\n"
-            f"⏳ **Status:** Uploading to backend...",
-            parse_mode="Markdown"
-        )
+        # Download file from Telegram
+        telegram_file = await file_obj.get_file()
         
         file_data = await telegram_file.download_as_bytearray()
         
+        # file_size is optional in the Bot API, so check what arrived
+        if len(file_data) > max_size_mb * 1024 * 1024:
+            await processing_msg.edit_text(
+                _file_too_large_text(max_size_mb, len(file_data) / (1024 * 1024)),
+                parse_mode="Markdown"
+            )
+            return
+        
+        # Large files are handed to the backend upload as a temporary file it
+        # streams from, so the download buffer isn't held until it finishes.
+        # The disk write runs in a thread to keep it off the event loop
+        if len(file_data) > UPLOAD_SPOOL_MAX_SIZE:
+            spool = await asyncio.to_thread(_spool_to_disk, file_data)
+            file_data = spool
+        
         # Prepare enhanced metadata
         metadata = {
             "original_filename": filename,
@@ -117,8 +159,8 @@ async def handle_file_upload(update: Update, context: ContextTypes.DEFAULT_TYPE)
             "user_id": user_id,
             "telegram_file_id": file_obj.file_id,
             "mime_type": getattr(file_obj, 'mime_type', None),
-            "file_extension": get_file_extension(filename),
-            "supported": is_supported_file_type(filename)
+            "file_extension": ext,
+            "supported": True
         }
         
         # Add additional metadata based on file type
@@ -132,22 +174,16 @@ async def handle_file_upload(update: Update, context: ContextTypes.DEFAULT_TYPE)
             metadata["caption"] = update.message.caption
             metadata["has_caption"] = True
         
-        # Update status
-        await processing_msg.edit_text(
-            f"📤 **Uploading and Processing File**\n\n"
-            f"📄 **File:** `{filename}`\n"
-            f"📊 **Size:** {file_size_mb:.1f} MB\n"
-            f"🔧 **Type:** {get_file_extension(filename).upper()[1:]}\n"
-            f"⏳ **Status:** Processing and indexing...",
-            parse_mode="Markdown"
-        )
-        
-        # Upload to backend
-        result = await backend_client.upload_file(
-            user_id=user_id,
-            file_data=file_data,
-            filename=filename,
-            metadata=metadata
+        # Upload to backend, updating the status alongside; the edit only goes
+        # out if the download took long enough to pass the throttle
+        _, result = await asyncio.gather(
+            editor.maybe_edit("Processing and indexing..."),
+            backend_client.upload_file(
+                user_id=user_id,
+                file_data=file_data,
+                filename=filename,
+                metadata=metadata
+            )
         )
         
         if result and "error" not in result:
@@ -161,7 +197,7 @@ async def handle_file_upload(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 📄 **File:** {filename}
 📊 **Size:** {file_size_mb:.1f} MB
-🔧 **Type:** {get_file_extension(filename).upper()[1:]}
+🔧 **Type:** {ext_label}
 🆔 **Document ID:** `{document_id or 'Assigned'}`
             """
             
@@ -174,41 +210,28 @@ async def handle_file_upload(update: Update, context: ContextTypes.DEFAULT_TYPE)
                 success_msg += f"⏱️ **Processing Time:** {processing_time}\n\n"
                 success_msg += f"**Status:** ✅ File has been indexed and is ready for search!"
             
-            await processing_msg.edit_text(success_msg.strip(), parse_mode="Markdown")
-            
-            # Store job info for tracking
+            # Quick action buttons ride on the success message itself
             if job_id:
-                await conversation_state.update_state(user_id, {
-                    "last_upload_job": job_id,
-                    "last_upload_file": filename,
-                    "last_upload_document_id": document_id
-                })
-            
-            # Add quick action buttons
-            
-            if job_id:
-                keyboard = [
+                reply_markup = InlineKeyboardMarkup([
                     [
                         InlineKeyboardButton("📋 Check Status", callback_data=f"check_job_{job_id}"),
                         InlineKeyboardButton("📤 Upload Another", callback_data="upload_file")
                     ]
-                ]
+                ])
             else:
-                keyboard = [
-                    [
-                        InlineKeyboardButton("🔍 Search Now", callback_data="search_demo"),
-                        InlineKeyboardButton("📤 Upload Another", callback_data="upload_file")
-                    ]
-                ]
-            
-            reply_markup = InlineKeyboardMarkup(keyboard)
+                reply_markup = UPLOAD_INDEXED_KEYBOARD
             
-            await context.bot.send_message(
-                chat_id=update.effective_chat.id,
-                text="**Quick Actions:**",
-                parse_mode="Markdown",
-                reply_markup=reply_markup
+            await processing_msg.edit_text(
+                success_msg.strip(), parse_mode="Markdown", reply_markup=reply_markup
             )
+            
+            # Store job info for tracking
+            if job_id:
+                await conversation_state.update_state(user_id, {
+                    "last_upload_job": job_id,
+                    "last_upload_file": filename,
+                    "last_upload_document_id": document_id
+                })
         
         else:
             error_msg = result.get("error", "Unknown error") if result else "Upload failed"
@@ -220,8 +243,8 @@ async def handle_file_upload(update: Update, context: ContextTypes.DEFAULT_TYPE)
                 parse_mode="Markdown"
             )
     
-    except Exception as e:
-        logger.error("File upload error", error=str(e), user_id=user_id, filename=filename)
+    except Exception:
+        logger.exception("File upload error", user_id=user_id, filename=filename)
         
         # Try to update the processing message
         try:
@@ -239,10 +262,74 @@ async def handle_file_upload(update: Update, context: ContextTypes.DEFAULT_TYPE)
             )
     
     finally:
+        if spool is not None:
+            spool.close()
+        
         # Clear upload flow
         await conversation_state.clear_state(user_id)
 
 
+def _spool_to_disk(data: bytes) -> BinaryIO:
+    """Write data to a temporary file, rewound for reading."""
+    spool = tempfile.TemporaryFile()
+    spool.write(data)
+    spool.seek(0)
+    return spool
+
+
+def _file_too_large_text(max_size_mb: float, file_size_mb: float) -> str:
+    """Build the reply for a file over the upload size limit."""
+    return (
+        f"❌ **File Too Large**\n\n"
+        f"Maximum size: {max_size_mb}MB\n"
+        f"Your file: {file_size_mb:.1f}MB\n\n"
+        f"💡 Try compressing the file or splitting it into smaller parts."
+    )
+
+
+def _upload_status_header(filename: str, file_size_mb: float, ext_label: str) -> str:
+    """Build the part of the upload progress message that doesn't change."""
+    return (
+        f"📤 **Uploading and Processing File**\n\n"
+        f"📄 **File:** `{filename}`\n"
+        f"📊 **Size:** {file_size_mb:.1f} MB\n"
+        f"🔧 **Type:** {ext_label}\n"
+        f"⏳ **Status:** "
+    )
+
+
+async def _edit_status(message, text: str) -> None:
+    """Edit a progress message; a failed edit must not abort the upload."""
+    try:
+        await message.edit_text(text, parse_mode="Markdown")
+    except TelegramError as e:
+        logger.warning("Upload status edit failed", error=str(e))
+
+
+class ThrottledEditor:
+    """Coalesces progress edits of a single message.
+    
+    A status arriving within UPLOAD_STATUS_MIN_INTERVAL of the previous edit
+    is dropped, so fast uploads go straight from the first status to the
+    result instead of flashing every step past the user.
+    """
+    
+    __slots__ = ("message", "header", "last_edit")
+    
+    def __init__(self, message, header: str):
+        self.message = message
+        self.header = header
+        self.last_edit = time.monotonic()
+    
+    async def maybe_edit(self, status: str) -> None:
+        """Show a new status unless the message was edited too recently."""
+        now = time.monotonic()
+        if now - self.last_edit < UPLOAD_STATUS_MIN_INTERVAL:
+            return
+        self.last_edit = now
+        await _edit_status(self.message, self.header + status)
+
+
 async def get_file_info(file_obj) -> dict:
     """Extract file information for logging and metadata."""
     info = {
@@ -276,13 +363,4 @@ def is_supported_file_type(filename: str) -> bool:
     if not filename:
         return False
     
-    supported_extensions = {
-        '.pdf', '.doc', '.docx', '.txt', '.rtf',
-        '.jpg', '.jpeg', '.png', '.gif', '.bmp',
-        '.mp3', '.wav', '.ogg', '.m4a',
-        '.csv', '.xlsx', '.xls',
-        '.md', '.html', '.xml', '.json'
-    }
-    
-    ext = get_file_extension(filename)
-    return ext in supported_extensions
+    return get_file_extension(filename) in SUPPORTED_EXTENSIONS
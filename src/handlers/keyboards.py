@@ -0,0 +1,53 @@
+"""
+Inline keyboards shared across handler modules.
+"""
+from typing import Any, Dict
+
+import orjson
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+
+class StaticKeyboardMarkup(InlineKeyboardMarkup):
+    """Inline keyboard that serializes itself once, at construction.
+    
+    python-telegram-bot calls to_dict() on every send; module-level keyboards
+    never change, so they hand back the same precomputed dict instead. The
+    JSON encoding is precomputed too: PTB sends a str parameter verbatim, so
+    hot paths can pass to_json() as reply_markup and skip encoding entirely.
+    """
+    
+    __slots__ = ("_dict", "_json")
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        with self._unfrozen():
+            self._dict = super().to_dict()
+            self._json = orjson.dumps(self._dict).decode()
+    
+    def to_dict(self, recursive: bool = True) -> Dict[str, Any]:
+        """Return the precomputed serialized keyboard."""
+        if not recursive:
+            return super().to_dict(recursive=False)
+        return self._dict
+    
+    def to_json(self, *args, **kwargs) -> str:
+        """Return the precomputed JSON keyboard."""
+        if args or kwargs:
+            return super().to_json(*args, **kwargs)
+        return self._json
+
+
+# Shared by /connect and the connect button
+CONNECT_KEYBOARD = StaticKeyboardMarkup([
+    [
+        InlineKeyboardButton("📁 Google Drive", callback_data="connect_drive"),
+        InlineKeyboardButton("💬 Slack", callback_data="connect_slack")
+    ],
+    [
+        InlineKeyboardButton("📝 Notion", callback_data="connect_notion"),
+        InlineKeyboardButton("🌐 Custom URL", callback_data="connect_custom")
+    ],
+    [
+        InlineKeyboardButton("❌ Cancel", callback_data="cancel")
+    ]
+])
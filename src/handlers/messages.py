@@ -1,17 +1,62 @@
 """
 Message handlers for natural language queries and general text processing.
 """
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Update
 from telegram.ext import ContextTypes
 
 from ..auth import require_auth
-from ..storage import conversation_state
+from ..storage import conversation_state, state_storage
 from ..backend import backend_client
 from ..logging_config import get_logger
-from .commands import format_search_response, split_long_message
+from .commands import (
+    FORMATTED_KEY,
+    SEARCH_ACTIONS_KEYBOARD,
+    SEARCH_CACHE_TTL,
+    delete_message_later,
+    format_search_response,
+    reply_long_message,
+    search_cache_key
+)
 
 logger = get_logger(__name__)
 
+# Small talk that gets a greeting instead of being searched
+NON_SEARCH_PHRASES = frozenset({
+    "hello", "hi", "hey", "thanks", "thank you", "ok", "okay",
+    "yes", "no", "sure", "fine", "good", "great", "nice"
+})
+
+# Reply to a query under three characters
+QUERY_TOO_SHORT_TEXT = (
+    "🤔 **Query too short**\n\n"
+    "Please provide a more detailed search query.\n\n"
+    "**Examples:**\n"
+    "• \"Find documents about quarterly sales reports\"\n"
+    "• \"Show me meeting notes from last week\"\n"
+    "• \"What are our company policies on remote work?\""
+)
+
+# Reply to small talk
+GREETING_TEXT = (
+    "👋 **Hello!**\n\n"
+    "I'm here to help you search your enterprise data.\n\n"
+    "**Try asking me:**\n"
+    "• \"Find documents about project Alpha\"\n"
+    "• \"Show me last quarter's sales reports\"\n"
+    "• \"What are the latest customer feedback?\"\n\n"
+    "Or use `/help` to see all available commands!"
+)
+
+# Reply when a natural language search raises
+SEARCH_ERROR_TEXT = (
+    "❌ **Search Error**\n\n"
+    "I encountered an error while processing your query.\n\n"
+    "**Please try:**\n"
+    "• Using the `/search` command instead\n"
+    "• Being more specific with your query\n"
+    "• Checking if your data sources are connected"
+)
+
 
 @require_auth
 async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -49,119 +94,77 @@ async def handle_natural_language_search(update: Update, context: ContextTypes.D
     """Handle natural language search queries."""
     user_id = update.effective_user.id
     
+    stripped = query.strip()
+    
     # Filter out very short or unclear queries
-    if len(query.strip()) < 3:
+    if len(stripped) < 3:
         await update.message.reply_text(
-            "🤔 **Query too short**\n\n"
-            "Please provide a more detailed search query.\n\n"
-            "**Examples:**\n"
-            "• \"Find documents about quarterly sales reports\"\n"
-            "• \"Show me meeting notes from last week\"\n"
-            "• \"What are our company policies on remote work?\"",
+            QUERY_TOO_SHORT_TEXT,
             parse_mode="Markdown"
         )
         return
     
     # Check for common non-search phrases
-    non_search_phrases = [
-        "hello", "hi", "hey", "thanks", "thank you", "ok", "okay", 
-        "yes", "no", "sure", "fine", "good", "great", "nice"
-    ]
-    
-    if query.lower().strip() in non_search_phrases:
+    if stripped.lower() in NON_SEARCH_PHRASES:
         await update.message.reply_text(
-            "👋 **Hello!**\n\n"
-            "I'm here to help you search your enterprise data.\n\n"
-            "**Try asking me:**\n"
-            "• \"Find documents about project Alpha\"\n"
-            "• \"Show me last quarter's sales reports\"\n"
-            "• \"What are the latest customer feedback?\"\n\n"
-            "Or use `/help` to see all available commands!",
+            GREETING_TEXT,
             parse_mode="Markdown"
         )
         return
     
-    # Show natural language search indicator
-    search_msg = await update.message.reply_text(
-        f"🔍 **Searching for:** \"{query}\"\n\n"
-        "🤖 Processing your natural language query...",
-        parse_mode="Markdown"
-    )
-    
-    # Show typing indicator
-    await context.bot.send_chat_action(chat_id=update.effective_chat.id, action="typing")
-    
+    search_msg = None
     try:
-        # Perform the search
-        result = await backend_client.search(user_id, query, include_citations=True)
+        # Repeated queries, including ones already run with /search, are
+        # answered from the shared search cache without an indicator
+        cache_key = await search_cache_key(user_id, query)
+        result = await state_storage.get(cache_key)
         
-        # Delete the search indicator message
-        await context.bot.delete_message(
-            chat_id=update.effective_chat.id,
-            message_id=search_msg.message_id
-        )
-        
-        if not result or "error" in result:
-            error_msg = result.get("error", "Unknown error") if result else "Backend unavailable"
-            
-            # Provide helpful error message
-            await update.message.reply_text(
-                f"❌ **Search Error**\n\n"
-                f"I couldn't process your query: \"{query[:50]}{'...' if len(query) > 50 else ''}\"\n\n"
-                f"**Error:** {error_msg}\n\n"
-                f"**Try:**\n"
-                f"• Using `/connect` to add data sources\n"
-                f"• Uploading documents with `/upload`\n"
-                f"• Checking system status with `/status`",
+        if result is None:
+            # Show natural language search indicator
+            search_msg = await update.message.reply_text(
+                f"🔍 **Searching for:** \"{query}\"\n\n"
+                "🤖 Processing your natural language query...",
                 parse_mode="Markdown"
             )
-            return
+            
+            # Show typing indicator
+            await context.bot.send_chat_action(chat_id=update.effective_chat.id, action="typing")
+            
+            # Perform the search
+            result = await backend_client.search(user_id, query, include_citations=True)
+            
+            if not result or "error" in result:
+                error_msg = result.get("error", "Unknown error") if result else "Backend unavailable"
+                
+                # Provide helpful error message in place of the search indicator
+                await search_msg.edit_text(
+                    f"❌ **Search Error**\n\n"
+                    f"I couldn't process your query: \"{query[:50]}{'...' if len(query) > 50 else ''}\"\n\n"
+                    f"**Error:** {error_msg}\n\n"
+                    f"**Try:**\n"
+                    f"• Using `/connect` to add data sources\n"
+                    f"• Uploading documents with `/upload`\n"
+                    f"• Checking system status with `/status`",
+                    parse_mode="Markdown"
+                )
+                return
         
-        # Format and send the response
+        # Format the response and show it in place of the search indicator,
+        # splitting long responses into follow-up messages
         response_text = await format_search_response(result, query)
         
-        # Handle long responses
-        if len(response_text) > 4000:
-            chunks = split_long_message(response_text)
-            for i, chunk in enumerate(chunks):
-                if i == 0:
-                    await update.message.reply_text(
-                        chunk, 
-                        parse_mode="Markdown", 
-                        disable_web_page_preview=True
-                    )
-                else:
-                    await context.bot.send_message(
-                        chat_id=update.effective_chat.id,
-                        text=chunk,
-                        parse_mode="Markdown",
-                        disable_web_page_preview=True
-                    )
-        else:
-            await update.message.reply_text(
-                response_text, 
-                parse_mode="Markdown", 
-                disable_web_page_preview=True
-            )
-        
-        # Show quick actions for natural language searches
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("🔍 Refine Search", callback_data="refine_search"),
-                InlineKeyboardButton("🔄 Related Search", callback_data="related_search")
-            ],
-            [
-                InlineKeyboardButton("📥 Get Documents", callback_data="get_documents"),
-                InlineKeyboardButton("📊 Summarize", callback_data="summarize_results")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        if FORMATTED_KEY not in result:
+            # Cache the rendering with the result so repeats skip formatting
+            result[FORMATTED_KEY] = [query, response_text]
+            await state_storage.set(cache_key, result, SEARCH_CACHE_TTL)
         
-        await update.message.reply_text(
-            "**What would you like to do next?**",
-            parse_mode="Markdown",
-            reply_markup=reply_markup
+        # reply_long_message takes over the indicator: it either becomes the
+        # first chunk or is deleted if that edit fails
+        indicator, search_msg = search_msg, None
+        # Quick actions go on the last chunk of the answer
+        await reply_long_message(
+            update, context, response_text,
+            reply_markup=SEARCH_ACTIONS_KEYBOARD, edit_message=indicator
         )
         
         # Log successful natural language search
@@ -172,25 +175,15 @@ async def handle_natural_language_search(update: Update, context: ContextTypes.D
             results_count=len(result.get("results", []))
         )
         
-    except Exception as e:
-        # Delete search indicator message if it exists
-        try:
-            await context.bot.delete_message(
-                chat_id=update.effective_chat.id,
-                message_id=search_msg.message_id
-            )
-        except:
-            pass
+    except Exception:
+        # Delete search indicator message if it is still shown
+        if search_msg is not None:
+            delete_message_later(context, update.effective_chat.id, search_msg.message_id)
             
-        logger.error("Natural language search error", error=str(e), user_id=user_id, query=query)
+        logger.exception("Natural language search error", user_id=user_id, query=query)
         
         await update.message.reply_text(
-            "❌ **Search Error**\n\n"
-            "I encountered an error while processing your query.\n\n"
-            "**Please try:**\n"
-            "• Using the `/search` command instead\n"
-            "• Being more specific with your query\n"
-            "• Checking if your data sources are connected",
+            SEARCH_ERROR_TEXT,
             parse_mode="Markdown"
         )
 
@@ -218,54 +211,31 @@ async def handle_refined_search(update: Update, context: ContextTypes.DEFAULT_TY
             top_k=15  # Get more results for refined search
         )
         
-        # Delete the refined search indicator
-        await context.bot.delete_message(
-            chat_id=update.effective_chat.id,
-            message_id=refined_msg.message_id
-        )
-        
         if result and "error" not in result:
             response_text = await format_search_response(result, query)
             
             # Add a refined search header
             refined_response = f"🎯 **Refined Search Results**\n\n{response_text}"
             
-            # Send the refined results
-            if len(refined_response) > 4000:
-                chunks = split_long_message(refined_response)
-                for chunk in chunks:
-                    await context.bot.send_message(
-                        chat_id=update.effective_chat.id,
-                        text=chunk,
-                        parse_mode="Markdown",
-                        disable_web_page_preview=True
-                    )
-            else:
-                await update.message.reply_text(
-                    refined_response,
-                    parse_mode="Markdown",
-                    disable_web_page_preview=True
-                )
+            # Send the refined results in place of the indicator, which
+            # reply_long_message deletes if that edit fails
+            indicator, refined_msg = refined_msg, None
+            await reply_long_message(update, context, refined_response, edit_message=indicator)
         else:
             error_msg = result.get("error", "No results") if result else "Search failed"
-            await update.message.reply_text(
+            await refined_msg.edit_text(
                 f"🎯 **Refined Search Results**\n\n"
                 f"❌ {error_msg}\n\n"
                 f"Try a different approach or check your data sources.",
                 parse_mode="Markdown"
             )
             
-    except Exception as e:
-        # Delete refined search indicator if it exists
-        try:
-            await context.bot.delete_message(
-                chat_id=update.effective_chat.id,
-                message_id=refined_msg.message_id
-            )
-        except:
-            pass
+    except Exception:
+        # Delete refined search indicator if it is still shown
+        if refined_msg is not None:
+            delete_message_later(context, update.effective_chat.id, refined_msg.message_id)
             
-        logger.error("Refined search error", error=str(e), user_id=user_id, query=query)
+        logger.exception("Refined search error", user_id=user_id, query=query)
         await update.message.reply_text(
             "❌ Error processing your refined search. Please try again."
         )
@@ -3,8 +3,10 @@ Logging configuration for the Enterprise Search Telegram Bot.
 """
 import logging
 import sys
-from typing import Optional
+import time
+from typing import Any, Dict, Optional, Tuple
 
+import orjson
 import structlog
 
 try:
@@ -16,6 +18,47 @@ except ImportError:
 
 from .config import settings
 
+# Identical errors (same event and exception type) are logged at this
+# sustained rate with this burst; the rest are counted and reported on the
+# next line that gets through, so an outage can't flood the logs
+ERROR_LOG_RATE = 5.0
+ERROR_LOG_BURST = 20
+
+
+class ErrorSampler:
+    """structlog processor that rate limits repeated error events."""
+    
+    __slots__ = ("rate", "burst", "_buckets")
+    
+    def __init__(self, rate: float = ERROR_LOG_RATE, burst: int = ERROR_LOG_BURST):
+        self.rate = rate
+        self.burst = burst
+        # key -> (tokens, last update, suppressed count)
+        self._buckets: Dict[Tuple[str, str], Tuple[float, float, int]] = {}
+    
+    def __call__(self, logger: Any, method_name: str, event_dict: dict) -> dict:
+        if method_name not in ("error", "exception", "critical"):
+            return event_dict
+        
+        exc_info = event_dict.get("exc_info")
+        if isinstance(exc_info, BaseException):
+            exc_type = type(exc_info)
+        else:
+            exc_type = sys.exc_info()[0] if exc_info else None
+        key = (str(event_dict.get("event")), exc_type.__name__ if exc_type else "")
+        now = time.monotonic()
+        tokens, updated, suppressed = self._buckets.get(key, (self.burst, now, 0))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        
+        if tokens < 1:
+            self._buckets[key] = (tokens, now, suppressed + 1)
+            raise structlog.DropEvent
+        
+        self._buckets[key] = (tokens - 1, now, 0)
+        if suppressed:
+            event_dict["suppressed"] = suppressed
+        return event_dict
+
 
 def setup_logging(level: Optional[str] = None) -> None:
     """Set up structured logging with optional Sentry integration."""
@@ -41,18 +84,31 @@ def setup_logging(level: Optional[str] = None) -> None:
             traces_sample_rate=0.1,
         )
     
+    processors = [
+        structlog.contextvars.merge_contextvars,
+        structlog.processors.add_log_level,
+        ErrorSampler(),
+        structlog.processors.TimeStamper(fmt="iso"),
+    ]
+    
+    if settings.log_format == "json":
+        # orjson renders straight to bytes, so write them without re-encoding
+        processors += [
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(serializer=orjson.dumps)
+        ]
+        logger_factory = structlog.BytesLoggerFactory()
+    else:
+        processors.append(structlog.dev.ConsoleRenderer())
+        logger_factory = structlog.WriteLoggerFactory()
+    
     # Configure structlog
     structlog.configure(
-        processors=[
-            structlog.contextvars.merge_contextvars,
-            structlog.processors.add_log_level,
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.dev.ConsoleRenderer()
-        ],
+        processors=processors,
         wrapper_class=structlog.make_filtering_bound_logger(
             getattr(logging, log_level.upper())
         ),
-        logger_factory=structlog.WriteLoggerFactory(),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
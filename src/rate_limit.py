@@ -0,0 +1,173 @@
+"""
+Outbound rate limiting for Telegram API calls.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from telegram.error import BadRequest, RetryAfter, TimedOut
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Telegram allows roughly one message per second per chat (short bursts are
+# tolerated) and about 30 per second across all chats
+CHAT_RATE = 1.0
+CHAT_BURST = 3
+GLOBAL_RATE = 30.0
+# Idle chat buckets are pruned once the table grows past this size
+CHAT_BUCKETS_MAX_SIZE = 4096
+# Backoff in seconds before each retry of a timed out message edit
+EDIT_RETRY_DELAYS = (0.5, 1.0, 2.0)
+# Expensive commands (search, processing) a user may run per period
+COMMAND_RATE_LIMIT = 5
+COMMAND_RATE_PERIOD = 60.0
+# Idle user buckets are pruned once the table grows past this size
+COMMAND_BUCKETS_MAX_SIZE = 4096
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations rather than blocking."""
+    
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+    
+    def _refill(self, now: float) -> None:
+        """Add the tokens accrued since the last update."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def reserve(self, now: float) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        self._refill(now)
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+    
+    def take(self, now: float) -> float:
+        """Take a token if one is available; otherwise return seconds until one is."""
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+    
+    def is_idle(self, now: float) -> bool:
+        """Check if the bucket has refilled completely."""
+        return self.tokens + (now - self.updated) * self.rate >= self.capacity
+
+
+class OutboundLimiter:
+    """Paces outbound Telegram calls per chat and globally.
+    
+    A RetryAfter from Telegram pauses only the chat that hit it; other chats
+    keep sending concurrently.
+    """
+    
+    __slots__ = ("_global", "_chats", "_paused_until")
+    
+    def __init__(self):
+        self._global = TokenBucket(GLOBAL_RATE, GLOBAL_RATE)
+        self._chats: Dict[Any, TokenBucket] = {}
+        self._paused_until: Dict[Any, float] = {}
+    
+    async def acquire(self, chat_id: Any) -> None:
+        """Wait until a call to the given chat is allowed."""
+        now = time.monotonic()
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) >= CHAT_BUCKETS_MAX_SIZE:
+                self._chats = {
+                    cid: b for cid, b in self._chats.items() if not b.is_idle(now)
+                }
+            bucket = self._chats[chat_id] = TokenBucket(CHAT_RATE, CHAT_BURST)
+        
+        delay = max(
+            bucket.reserve(now),
+            self._global.reserve(now),
+            self._paused_until.get(chat_id, 0.0) - now
+        )
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    def pause(self, chat_id: Any, seconds: float) -> None:
+        """Hold back calls to a chat for the given number of seconds."""
+        until = time.monotonic() + seconds
+        if until > self._paused_until.get(chat_id, 0.0):
+            self._paused_until[chat_id] = until
+    
+    async def call(self, chat_id: Any, func: Callable[..., Awaitable], /, *args, **kwargs) -> Any:
+        """Call a Telegram API method within limits, retrying once on RetryAfter."""
+        await self.acquire(chat_id)
+        try:
+            return await func(*args, **kwargs)
+        except RetryAfter as e:
+            logger.warning("Telegram rate limit hit", chat_id=chat_id, retry_after=e.retry_after)
+            self.pause(chat_id, e.retry_after)
+            await self.acquire(chat_id)
+            self._paused_until.pop(chat_id, None)
+            return await func(*args, **kwargs)
+
+
+class CommandLimiter:
+    """Per-user budget for commands that hit expensive backend endpoints.
+    
+    Unlike OutboundLimiter this never waits: a command over budget is
+    rejected so the handler can tell the user when to retry.
+    """
+    
+    __slots__ = ("rate", "capacity", "_buckets")
+    
+    def __init__(self, limit: int = COMMAND_RATE_LIMIT, period: float = COMMAND_RATE_PERIOD):
+        self.rate = limit / period
+        self.capacity = limit
+        self._buckets: Dict[Tuple[int, str], TokenBucket] = {}
+    
+    def check(self, user_id: int, command: str) -> float:
+        """Use up one run of a command; return 0.0 if allowed, else seconds to wait."""
+        now = time.monotonic()
+        key = (user_id, command)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= COMMAND_BUCKETS_MAX_SIZE:
+                self._buckets = {
+                    k: b for k, b in self._buckets.items() if not b.is_idle(now)
+                }
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.capacity)
+        return bucket.take(now)
+
+
+async def safe_edit(query, *args, **kwargs) -> Any:
+    """Edit a callback query's message through the outbound limiter.
+    
+    Edits are idempotent, so a timed out edit is retried with exponential
+    backoff. A retry reporting the message as not modified means an earlier
+    attempt landed after all.
+    """
+    chat_id = query.message.chat_id if query.message else query.from_user.id
+    retried = False
+    for delay in (*EDIT_RETRY_DELAYS, None):
+        try:
+            return await outbound_limiter.call(chat_id, query.edit_message_text, *args, **kwargs)
+        except TimedOut:
+            if delay is None:
+                raise
+            logger.warning("Message edit timed out", chat_id=chat_id, retry_in=delay)
+            await asyncio.sleep(delay)
+            retried = True
+        except BadRequest as e:
+            if retried and "not modified" in e.message:
+                return True
+            raise
+
+
+# Global outbound limiter instance
+outbound_limiter = OutboundLimiter()
+
+# Global per-user command limiter instance
+command_limiter = CommandLimiter()
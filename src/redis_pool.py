@@ -0,0 +1,18 @@
+"""
+Shared Redis connection pool for the Enterprise Search Telegram Bot.
+"""
+import redis.asyncio as redis
+
+from .config import settings
+
+
+# Process-wide pool; clients created with connection_pool=redis_pool share sockets.
+# Blocking, so a burst of concurrent updates waits for a free connection instead
+# of failing with "Too many connections" once max_connections are in use
+redis_pool = redis.BlockingConnectionPool.from_url(
+    settings.redis_url,
+    db=settings.redis_db,
+    max_connections=settings.redis_max_connections,
+    timeout=settings.redis_pool_timeout,
+    decode_responses=True
+)
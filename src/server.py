@@ -2,11 +2,11 @@
 Web server for webhook handling and admin endpoints.
 """
 from typing import Dict, Any
-import json
 
 from fastapi import FastAPI, Request, HTTPException, Depends, BackgroundTasks
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
+import orjson
 import uvicorn
 
 from .config import settings
@@ -24,13 +24,6 @@ app = FastAPI(
 security = HTTPBearer()
 
 
-class WebhookUpdate(BaseModel):
-    """Telegram webhook update model."""
-    update_id: int
-    message: Dict[str, Any] = None
-    callback_query: Dict[str, Any] = None
-
-
 class JobCallback(BaseModel):
     """Backend job completion callback model."""
     job_id: str
@@ -64,21 +57,25 @@ async def verify_admin_token(credentials: HTTPAuthorizationCredentials = Depends
 
 
 @app.post("/telegram/webhook")
-async def telegram_webhook(
-    update_data: WebhookUpdate,
-    request: Request,
-    background_tasks: BackgroundTasks
-):
+async def telegram_webhook(request: Request, background_tasks: BackgroundTasks):
     """Handle Telegram webhook updates."""
     
     # Verify webhook secret
     if not await verify_webhook_secret(request):
         raise HTTPException(status_code=401, detail="Invalid webhook secret")
     
-    logger.info("Webhook received", update_id=update_data.update_id)
+    # Parse the body once with orjson and hand the dict straight to PTB; a
+    # pydantic model would parse it twice and drop fields it doesn't declare
+    try:
+        update_data = orjson.loads(await request.body())
+        update_id = update_data["update_id"]
+    except (orjson.JSONDecodeError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid update")
+    
+    logger.info("Webhook received", update_id=update_id)
     
     # Process update in background
-    background_tasks.add_task(process_telegram_update, update_data.dict())
+    background_tasks.add_task(process_telegram_update, update_data)
     
     return {"status": "ok"}
 
@@ -96,8 +93,8 @@ async def process_telegram_update(update_data: Dict[str, Any]) -> None:
         if update:
             await bot_application.process_update(update)
         
-    except Exception as e:
-        logger.error("Error processing update", error=str(e), update_data=update_data)
+    except Exception:
+        logger.exception("Error processing update", update_data=update_data)
 
 
 @app.post("/api/job-callback")
@@ -145,8 +142,8 @@ async def process_job_callback(callback_data: Dict[str, Any]) -> None:
         
         logger.info("Job callback processed", job_id=job_id, status=status)
         
-    except Exception as e:
-        logger.error("Error processing job callback", error=str(e), callback_data=callback_data)
+    except Exception:
+        logger.exception("Error processing job callback", callback_data=callback_data)
 
 
 @app.get("/admin/stats")
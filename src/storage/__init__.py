@@ -11,14 +11,21 @@ import aiofiles
 import aiofiles.os
 from pathlib import Path
 
+import orjson
 import redis.asyncio as redis
 
 from ..config import settings
+from ..redis_pool import redis_pool
 from ..logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+def _dumps(value: Any) -> bytes:
+    """Serialize a stored value; unknown types fall back to str()."""
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
 class StateStorage(ABC):
     """Abstract base class for state storage."""
     
@@ -41,6 +48,32 @@ class StateStorage(ABC):
     async def exists(self, key: str) -> bool:
         """Check if key exists."""
         pass
+    
+    @abstractmethod
+    async def set_if_absent(self, key: str, value: Any, ttl: int) -> bool:
+        """Set a value with TTL only if the key is absent; True if it was set."""
+        pass
+    
+    @abstractmethod
+    async def get_field(self, key: str, field: str) -> Optional[Any]:
+        """Get one field of a hash."""
+        pass
+    
+    @abstractmethod
+    async def get_fields(self, key: str) -> Dict[str, Any]:
+        """Get all fields of a hash."""
+        pass
+    
+    @abstractmethod
+    async def set_fields(
+        self,
+        key: str,
+        fields: Dict[str, Any],
+        ttl: Optional[int] = None,
+        replace: bool = False
+    ) -> None:
+        """Set hash fields with optional TTL; replace drops fields not given."""
+        pass
 
 
 class RedisStateStorage(StateStorage):
@@ -53,19 +86,20 @@ class RedisStateStorage(StateStorage):
     async def connect(self):
         """Initialize Redis connection."""
         if not self._connected:
-            self.redis_client = redis.from_url(
-                settings.redis_url,
-                db=settings.redis_db,
-                decode_responses=True
-            )
-            await self.redis_client.ping()
+            self.redis_client = redis.Redis(connection_pool=redis_pool)
             self._connected = True
-            logger.info("Redis connection established")
+            logger.info("Redis client initialized")
+    
+    async def ping(self) -> None:
+        """Verify Redis is reachable; raises if it is not."""
+        await self.connect()
+        await self.redis_client.ping()
     
     async def disconnect(self):
         """Close Redis connection."""
         if self.redis_client:
-            await self.redis_client.close()
+            await self.redis_client.aclose()
+            await redis_pool.disconnect()
             self._connected = False
             logger.info("Redis connection closed")
     
@@ -75,7 +109,7 @@ class RedisStateStorage(StateStorage):
         try:
             data = await self.redis_client.get(key)
             if data:
-                return json.loads(data)
+                return orjson.loads(data)
         except Exception as e:
             logger.error("Redis get error", key=key, error=str(e))
         return None
@@ -84,7 +118,7 @@ class RedisStateStorage(StateStorage):
         """Set a value with optional TTL in seconds."""
         await self.connect()
         try:
-            data = json.dumps(value, default=str)
+            data = _dumps(value)
             if ttl:
                 await self.redis_client.setex(key, ttl, data)
             else:
@@ -108,6 +142,63 @@ class RedisStateStorage(StateStorage):
         except Exception as e:
             logger.error("Redis exists error", key=key, error=str(e))
             return False
+    
+    async def set_if_absent(self, key: str, value: Any, ttl: int) -> bool:
+        """Set a value with TTL only if the key is absent; True if it was set.
+        
+        Fails open: on Redis errors the key is treated as newly set.
+        """
+        await self.connect()
+        try:
+            data = _dumps(value)
+            return bool(await self.redis_client.set(key, data, nx=True, ex=ttl))
+        except Exception as e:
+            logger.error("Redis set nx error", key=key, error=str(e))
+            return True
+    
+    async def get_field(self, key: str, field: str) -> Optional[Any]:
+        """Get one field of a hash."""
+        await self.connect()
+        try:
+            data = await self.redis_client.hget(key, field)
+            if data:
+                return orjson.loads(data)
+        except Exception as e:
+            logger.error("Redis hget error", key=key, field=field, error=str(e))
+        return None
+    
+    async def get_fields(self, key: str) -> Dict[str, Any]:
+        """Get all fields of a hash."""
+        await self.connect()
+        try:
+            data = await self.redis_client.hgetall(key)
+            return {field: orjson.loads(value) for field, value in data.items()}
+        except Exception as e:
+            logger.error("Redis hgetall error", key=key, error=str(e))
+        return {}
+    
+    async def set_fields(
+        self,
+        key: str,
+        fields: Dict[str, Any],
+        ttl: Optional[int] = None,
+        replace: bool = False
+    ) -> None:
+        """Set hash fields with optional TTL; replace drops fields not given."""
+        await self.connect()
+        try:
+            mapping = {field: _dumps(value) for field, value in fields.items()}
+            # Pipeline the writes so an update costs a single round trip
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                if replace:
+                    pipe.delete(key)
+                if mapping:
+                    pipe.hset(key, mapping=mapping)
+                if ttl:
+                    pipe.expire(key, ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.error("Redis hset error", key=key, error=str(e))
 
 
 class ConversationState:
@@ -118,26 +209,26 @@ class ConversationState:
         self.default_ttl = settings.session_timeout_minutes * 60
     
     def _get_key(self, user_id: int, conversation_type: str = "main") -> str:
-        """Generate Redis key for user conversation."""
-        return f"conversation:{user_id}:{conversation_type}"
+        """Generate Redis key for user conversation (a hash of state fields)."""
+        return f"convstate:{user_id}:{conversation_type}"
     
     async def get_state(self, user_id: int) -> Dict[str, Any]:
         """Get current conversation state for user."""
         key = self._get_key(user_id)
-        state = await self.storage.get(key)
-        return state or {}
+        return await self.storage.get_fields(key)
     
     async def set_state(self, user_id: int, state: Dict[str, Any]) -> None:
         """Set conversation state for user."""
         key = self._get_key(user_id)
         state["updated_at"] = datetime.utcnow().isoformat()
-        await self.storage.set(key, state, self.default_ttl)
+        await self.storage.set_fields(key, state, self.default_ttl, replace=True)
     
     async def update_state(self, user_id: int, updates: Dict[str, Any]) -> None:
         """Update specific fields in conversation state."""
-        current_state = await self.get_state(user_id)
-        current_state.update(updates)
-        await self.set_state(user_id, current_state)
+        # Fields live in a hash, so updates are written without reading first
+        key = self._get_key(user_id)
+        fields = {**updates, "updated_at": datetime.utcnow().isoformat()}
+        await self.storage.set_fields(key, fields, self.default_ttl)
     
     async def clear_state(self, user_id: int) -> None:
         """Clear conversation state for user."""
@@ -153,13 +244,13 @@ class ConversationState:
     
     async def get_flow(self, user_id: int) -> Optional[str]:
         """Get current conversation flow."""
-        state = await self.get_state(user_id)
-        return state.get("current_flow")
+        # Checked on every message, so fetch just the one field
+        return await self.storage.get_field(self._get_key(user_id), "current_flow")
     
     async def get_flow_data(self, user_id: int) -> Dict[str, Any]:
         """Get current flow data."""
-        state = await self.get_state(user_id)
-        return state.get("flow_data", {})
+        data = await self.storage.get_field(self._get_key(user_id), "flow_data")
+        return data if data is not None else {}
 
 
 class FileStorage(ABC):
@@ -3,11 +3,6 @@
 Quick start script for Enterprise Search Telegram Bot
 """
 import asyncio
-import sys
-from pathlib import Path
-
-# Add src to Python path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.config import settings
 from src.logging_config import setup_logging, get_logger
@@ -22,7 +17,7 @@ def main():
     logger.info("🚀 Starting Enterprise Search Telegram Bot")
     logger.info(f"📋 Bot Token: {settings.telegram_bot_token[:10]}...")
     logger.info(f"🔗 Backend URL: {settings.backend_base_url}")
-    logger.info(f"👥 Allowed Users: {len(settings.get_allowed_user_ids())}")
+    logger.info(f"👥 Allowed Users: {len(settings.allowed_user_ids_set)}")
     
     # Use run_polling_sync for simpler startup
     bot_application.run_polling_sync()
@@ -4,10 +4,6 @@ Enhanced start script with better error handling and network timeouts
 """
 import sys
 import signal
-from pathlib import Path
-
-# Add src to Python path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.config import settings
 from src.logging_config import setup_logging, get_logger
@@ -31,7 +27,7 @@ def main():
     logger.info("🚀 Starting Enterprise Search Telegram Bot")
     logger.info(f"📋 Bot Token: {settings.telegram_bot_token[:10]}...")
     logger.info(f"🔗 Backend URL: {settings.backend_base_url}")
-    logger.info(f"👥 Allowed Users: {len(settings.get_allowed_user_ids())}")
+    logger.info(f"👥 Allowed Users: {len(settings.allowed_user_ids_set)}")
     
     try:
         # Import here to avoid early loading issues
@@ -5,14 +5,10 @@ Enterprise Search Telegram Bot startup with IPv4 preference
 import asyncio
 import sys
 import os
-from pathlib import Path
 
 # Force IPv4 connectivity for potential IPv6 issues
 os.environ['PYTHONHTTPSVERIFY'] = '0'  # Disable SSL verification if needed
 
-# Add src to Python path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
-
 from src.config import settings
 from src.logging_config import setup_logging, get_logger
 
@@ -56,7 +52,7 @@ async def main():
     logger.info(f"📋 Bot Token: {settings.telegram_bot_token[:10]}...")
     logger.info(f"🔗 Backend URL: {settings.backend_base_url}")
     
-    allowed_users = settings.get_allowed_user_ids()
+    allowed_users = settings.allowed_user_ids_set
     if allowed_users:
         logger.info(f"👥 Allowed Users: {len(allowed_users)} users")
     else:
@@ -5,12 +5,8 @@ Robust startup script for Enterprise Search Telegram Bot with network error hand
 import asyncio
 import sys
 import time
-from pathlib import Path
 from telegram.error import NetworkError, TelegramError
 
-# Add src to Python path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
-
 from src.config import settings
 from src.logging_config import setup_logging, get_logger
 from src.bot import bot_application
@@ -28,7 +24,7 @@ async def start_bot_with_retry(max_retries=5, retry_delay=10):
             logger.info(f"📋 Bot Token: {settings.telegram_bot_token[:10]}...")
             logger.info(f"🔗 Backend URL: {settings.backend_base_url}")
             
-            allowed_users = settings.get_allowed_user_ids()
+            allowed_users = settings.allowed_user_ids_set
             if allowed_users:
                 logger.info(f"👥 Allowed Users: {len(allowed_users)} users")
             else:
@@ -4,10 +4,6 @@ Simple and robust startup script for Enterprise Search Telegram Bot
 """
 import sys
 import time
-from pathlib import Path
-
-# Add src to Python path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.config import settings
 from src.logging_config import setup_logging, get_logger
@@ -28,7 +24,7 @@ def main():
             logger.info(f"📋 Bot Token: {settings.telegram_bot_token[:10]}...")
             logger.info(f"🔗 Backend URL: {settings.backend_base_url}")
             
-            allowed_users = settings.get_allowed_user_ids()
+            allowed_users = settings.allowed_user_ids_set
             if allowed_users:
                 logger.info(f"👥 Allowed Users: {len(allowed_users)} users")
             else:
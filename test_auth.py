@@ -2,12 +2,6 @@
 """
 Test script to verify authentication configuration
 """
-import sys
-from pathlib import Path
-
-# Add src to Python path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
-
 from src.config import settings
 from src.auth import auth_manager
 
@@ -18,8 +12,8 @@ def test_auth():
     print("=" * 40)
     
     # Check configuration
-    allowed_users = settings.get_allowed_user_ids()
-    admin_users = settings.get_admin_user_ids()
+    allowed_users = settings.allowed_user_ids_set
+    admin_users = settings.admin_user_ids_set
     
     print(f"📋 ALLOWED_USER_IDS from .env: '{settings.allowed_user_ids}'")
     print(f"👥 Parsed allowed users: {allowed_users}")
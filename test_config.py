@@ -3,10 +3,7 @@
 Test configuration and basic bot setup
 """
 import sys
-from pathlib import Path
 
-# Add src to Python path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 def test_config():
     """Test configuration loading"""
@@ -15,7 +12,7 @@ def test_config():
         print("✅ Configuration loaded successfully!")
         print(f"🤖 Bot Token: {settings.telegram_bot_token[:10]}...{settings.telegram_bot_token[-5:]}")
         print(f"🔗 Backend URL: {settings.backend_base_url}")
-        print(f"👥 Allowed Users: {settings.get_allowed_user_ids()}")
+        print(f"👥 Allowed Users: {settings.allowed_user_ids_set}")
         print(f"📁 Storage Type: {settings.file_storage_type}")
         print(f"🐛 Debug: {settings.debug}")
         print(f"🌐 Webhook: {settings.webhook_mode}")
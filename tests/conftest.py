@@ -28,6 +28,10 @@ def mock_storage():
     storage.set = AsyncMock()
     storage.delete = AsyncMock()
     storage.exists = AsyncMock(return_value=False)
+    storage.set_if_absent = AsyncMock(return_value=True)
+    storage.get_field = AsyncMock(return_value=None)
+    storage.get_fields = AsyncMock(return_value={})
+    storage.set_fields = AsyncMock()
     return storage
 
 
@@ -78,6 +82,7 @@ def mock_context():
     context = Mock()
     context.args = []
     context.bot_data = {}
+    context.user_data = {}
     context.bot.send_chat_action = AsyncMock()
     context.bot.send_message = AsyncMock()
     return context
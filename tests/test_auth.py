@@ -1,8 +1,10 @@
 """
 Tests for authentication and authorization.
 """
+import time
+
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, AsyncMock, patch
 
 from src.auth import AuthManager, require_auth, require_admin
 
@@ -81,6 +83,35 @@ def test_create_backend_token():
     assert len(token) > 0
 
 
+def test_create_backend_token_cached():
+    """Test JWT tokens are reused per user until near expiry."""
+    auth = AuthManager()
+    auth.jwt_secret = "test_secret"
+    
+    token = auth.create_backend_token(123)
+    assert auth.create_backend_token(123) == token
+    assert auth.create_backend_token(456) != token
+    
+    # A token close to expiry is re-issued
+    auth._token_cache[(123, 60)] = ("stale_token", time.time() + 60)
+    assert auth.create_backend_token(123) != "stale_token"
+
+
+def test_create_backend_token_honours_expiry_when_cached():
+    """Test a cached default token isn't returned for a shorter lifetime."""
+    auth = AuthManager()
+    auth.jwt_secret = "test_secret"
+    
+    long_token = auth.create_backend_token(123)
+    short_token = auth.create_backend_token(123, expires_minutes=10)
+    assert short_token != long_token
+    
+    now = time.time()
+    assert auth.verify_backend_token(short_token)["exp"] <= now + 10 * 60
+    assert auth.verify_backend_token(long_token)["exp"] > now + 50 * 60
+    assert auth.create_backend_token(123, expires_minutes=10) == short_token
+
+
 def test_verify_backend_token():
     """Test JWT token verification."""
     auth = AuthManager()
@@ -119,19 +150,17 @@ def test_get_auth_headers():
 async def test_require_auth_decorator_authorized():
     """Test require_auth decorator with authorized user."""
     # Mock function to decorate
-    mock_func = Mock(return_value="success")
+    mock_func = AsyncMock(return_value="success")
     decorated_func = require_auth(mock_func)
     
     # Mock update and context
     mock_update = Mock()
     mock_update.effective_user.id = 123
     mock_context = Mock()
-    mock_context.bot_data = {
-        'auth_manager': Mock()
-    }
-    mock_context.bot_data['auth_manager'].is_user_allowed.return_value = True
     
-    result = await decorated_func(mock_update, mock_context)
+    with patch('src.auth.auth_manager') as mock_auth_manager:
+        mock_auth_manager.is_user_allowed.return_value = True
+        result = await decorated_func(mock_update, mock_context)
     
     # Verify original function was called
     mock_func.assert_called_once_with(mock_update, mock_context)
@@ -141,20 +170,18 @@ async def test_require_auth_decorator_authorized():
 async def test_require_auth_decorator_unauthorized():
     """Test require_auth decorator with unauthorized user."""
     # Mock function to decorate
-    mock_func = Mock()
+    mock_func = AsyncMock()
     decorated_func = require_auth(mock_func)
     
     # Mock update and context
     mock_update = Mock()
     mock_update.effective_user.id = 999
-    mock_update.message.reply_text = Mock()
+    mock_update.message.reply_text = AsyncMock()
     mock_context = Mock()
-    mock_context.bot_data = {
-        'auth_manager': Mock()
-    }
-    mock_context.bot_data['auth_manager'].is_user_allowed.return_value = False
     
-    result = await decorated_func(mock_update, mock_context)
+    with patch('src.auth.auth_manager') as mock_auth_manager:
+        mock_auth_manager.is_user_allowed.return_value = False
+        result = await decorated_func(mock_update, mock_context)
     
     # Verify original function was NOT called
     mock_func.assert_not_called()
@@ -167,19 +194,17 @@ async def test_require_auth_decorator_unauthorized():
 async def test_require_admin_decorator_admin():
     """Test require_admin decorator with admin user."""
     # Mock function to decorate
-    mock_func = Mock(return_value="admin_success")
+    mock_func = AsyncMock(return_value="admin_success")
     decorated_func = require_admin(mock_func)
     
     # Mock update and context
     mock_update = Mock()
     mock_update.effective_user.id = 123
     mock_context = Mock()
-    mock_context.bot_data = {
-        'auth_manager': Mock()
-    }
-    mock_context.bot_data['auth_manager'].is_user_admin.return_value = True
     
-    result = await decorated_func(mock_update, mock_context)
+    with patch('src.auth.auth_manager') as mock_auth_manager:
+        mock_auth_manager.is_user_admin.return_value = True
+        result = await decorated_func(mock_update, mock_context)
     
     # Verify original function was called
     mock_func.assert_called_once_with(mock_update, mock_context)
@@ -189,20 +214,18 @@ async def test_require_admin_decorator_admin():
 async def test_require_admin_decorator_non_admin():
     """Test require_admin decorator with non-admin user."""
     # Mock function to decorate
-    mock_func = Mock()
+    mock_func = AsyncMock()
     decorated_func = require_admin(mock_func)
     
     # Mock update and context
     mock_update = Mock()
     mock_update.effective_user.id = 456
-    mock_update.message.reply_text = Mock()
+    mock_update.message.reply_text = AsyncMock()
     mock_context = Mock()
-    mock_context.bot_data = {
-        'auth_manager': Mock()
-    }
-    mock_context.bot_data['auth_manager'].is_user_admin.return_value = False
     
-    result = await decorated_func(mock_update, mock_context)
+    with patch('src.auth.auth_manager') as mock_auth_manager:
+        mock_auth_manager.is_user_admin.return_value = False
+        result = await decorated_func(mock_update, mock_context)
     
     # Verify original function was NOT called
     mock_func.assert_not_called()
@@ -19,12 +19,10 @@ async def test_make_request_success(backend_client):
     """Test successful backend request."""
     mock_response = Mock()
     mock_response.status_code = 200
-    mock_response.json.return_value = {"status": "success", "data": "test"}
+    mock_response.content = b'{"status": "success", "data": "test"}'
     
-    with patch('httpx.AsyncClient') as mock_client_class:
-        mock_client = AsyncMock()
-        mock_client.request.return_value = mock_response
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+    with patch.object(backend_client, '_client') as mock_client:
+        mock_client.request = AsyncMock(return_value=mock_response)
         
         result = await backend_client._make_request("GET", "/test", 123)
         
@@ -38,10 +36,8 @@ async def test_make_request_unauthorized(backend_client):
     mock_response = Mock()
     mock_response.status_code = 401
     
-    with patch('httpx.AsyncClient') as mock_client_class:
-        mock_client = AsyncMock()
-        mock_client.request.return_value = mock_response
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+    with patch.object(backend_client, '_client') as mock_client:
+        mock_client.request = AsyncMock(return_value=mock_response)
         
         result = await backend_client._make_request("GET", "/test", 123)
         
@@ -51,10 +47,8 @@ async def test_make_request_unauthorized(backend_client):
 @pytest.mark.asyncio
 async def test_make_request_timeout(backend_client):
     """Test backend request timeout."""
-    with patch('httpx.AsyncClient') as mock_client_class:
-        mock_client = AsyncMock()
-        mock_client.request.side_effect = httpx.TimeoutException("Timeout")
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+    with patch.object(backend_client, '_client') as mock_client:
+        mock_client.request = AsyncMock(side_effect=httpx.TimeoutException("Timeout"))
         
         result = await backend_client._make_request("GET", "/test", 123)
         
@@ -64,7 +58,7 @@ async def test_make_request_timeout(backend_client):
 @pytest.mark.asyncio
 async def test_connect_platform(backend_client):
     """Test platform connection."""
-    with patch.object(backend_client, '_make_request') as mock_request:
+    with patch.object(BackendClient, '_make_request') as mock_request:
         mock_request.return_value = {"status": "success", "oauth_url": "https://oauth.example.com"}
         
         result = await backend_client.connect_platform(123, "drive", {"param": "value"})
@@ -83,7 +77,7 @@ async def test_connect_platform(backend_client):
 @pytest.mark.asyncio
 async def test_get_sources(backend_client):
     """Test getting connected sources."""
-    with patch.object(backend_client, '_make_request') as mock_request:
+    with patch.object(BackendClient, '_make_request') as mock_request:
         mock_request.return_value = {"sources": [{"id": "source1", "name": "Test Source"}]}
         
         result = await backend_client.get_sources(123)
@@ -95,7 +89,7 @@ async def test_get_sources(backend_client):
 @pytest.mark.asyncio
 async def test_search(backend_client):
     """Test search functionality."""
-    with patch.object(backend_client, '_make_request') as mock_request:
+    with patch.object(BackendClient, '_make_request') as mock_request:
         mock_request.return_value = {
             "answer": "Test answer [1]",
             "citations": [{"id": 1, "title": "Test Doc"}]
@@ -119,7 +113,7 @@ async def test_search(backend_client):
 @pytest.mark.asyncio
 async def test_upload_file(backend_client):
     """Test file upload."""
-    with patch.object(backend_client, '_make_request') as mock_request:
+    with patch.object(BackendClient, '_make_request') as mock_request:
         mock_request.return_value = {"job_id": "job123", "document_id": "doc456"}
         
         file_data = b"test file content"
@@ -134,7 +128,7 @@ async def test_upload_file(backend_client):
 @pytest.mark.asyncio
 async def test_get_job_status(backend_client):
     """Test job status checking."""
-    with patch.object(backend_client, '_make_request') as mock_request:
+    with patch.object(BackendClient, '_make_request') as mock_request:
         mock_request.return_value = {"status": "completed", "progress": 100}
         
         result = await backend_client.get_job_status(123, "job123")
@@ -0,0 +1,75 @@
+"""
+Tests for in-process caching helpers.
+"""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from src.cache import async_ttl_cache
+
+
+@pytest.mark.asyncio
+async def test_async_ttl_cache_reuses_results():
+    """Test results are cached per arguments until the TTL passes."""
+    backend = AsyncMock(side_effect=lambda user_id: {"user": user_id})
+    cached = async_ttl_cache(60)(backend)
+    
+    assert await cached(1) == {"user": 1}
+    assert await cached(1) == {"user": 1}
+    assert await cached(2) == {"user": 2}
+    assert backend.call_count == 2
+    
+    cached.cache_clear()
+    await cached(1)
+    assert backend.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_async_ttl_cache_skips_rejected_results():
+    """Test results rejected by should_cache are not stored."""
+    backend = AsyncMock(return_value={"error": "Request timeout"})
+    cached = async_ttl_cache(60, should_cache=lambda result: "error" not in result)(backend)
+    
+    await cached(1)
+    await cached(1)
+    assert backend.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_async_ttl_cache_collapses_concurrent_misses():
+    """Test concurrent misses for the same key share one call."""
+    calls = 0
+    
+    async def slow_backend(user_id):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"user": user_id}
+    
+    cached = async_ttl_cache(60)(slow_backend)
+    results = await asyncio.gather(*(cached(1) for _ in range(5)))
+    
+    assert results == [{"user": 1}] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_async_ttl_cache_collapses_uncached_misses():
+    """Test concurrent misses share one call even when the result isn't cached."""
+    calls = 0
+    
+    async def failing_backend(user_id):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"error": "Request timeout"}
+    
+    cached = async_ttl_cache(60, should_cache=lambda result: "error" not in result)(failing_backend)
+    results = await asyncio.gather(*(cached(1) for _ in range(5)))
+    
+    assert results == [{"error": "Request timeout"}] * 5
+    assert calls == 1
+    
+    await cached(1)
+    assert calls == 2
@@ -0,0 +1,322 @@
+"""
+Tests for callback query handlers.
+"""
+import asyncio
+import html
+
+import orjson
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+
+from telegram import InlineKeyboardMarkup
+
+from src.backend import BackendError
+from src.handlers import callbacks
+from src.handlers.callbacks import button_callback
+
+
+@pytest.fixture(autouse=True)
+def callback_storage(mock_storage):
+    """Route callback state storage, and the shared caches in commands, to the mock storage."""
+    with patch('src.handlers.callbacks.state_storage', mock_storage), \
+            patch('src.handlers.commands.state_storage', mock_storage):
+        yield mock_storage
+
+
+@pytest.fixture(autouse=True)
+def status_breaker():
+    """Give each test closed status circuit breakers, yielding the per-user one."""
+    system_breaker = callbacks.CircuitBreaker(callbacks.STATUS_FAIL_THRESHOLD, callbacks.STATUS_RESET_AFTER)
+    user_breaker = callbacks.CircuitBreaker(callbacks.STATUS_FAIL_THRESHOLD, callbacks.STATUS_RESET_AFTER)
+    with patch('src.handlers.callbacks._system_status_breaker', system_breaker), \
+            patch('src.handlers.callbacks._user_status_breaker', user_breaker):
+        yield user_breaker
+
+
+@pytest.fixture
+def mock_callback_update(mock_update):
+    """Mock Telegram Update carrying a callback query."""
+    mock_update.callback_query = Mock()
+    mock_update.callback_query.answer = AsyncMock()
+    mock_update.callback_query.edit_message_text = AsyncMock()
+    mock_update.callback_query.from_user.id = 123456789
+    return mock_update
+
+
+@pytest.mark.asyncio
+async def test_button_callback_exact_dispatch(mock_callback_update, mock_context):
+    """Test exact callback data is routed to its handler."""
+    mock_callback_update.callback_query.data = "help"
+    handler = AsyncMock()
+    
+    with patch('src.auth.auth_manager') as mock_auth_manager, \
+            patch.dict(callbacks.EXACT_HANDLERS, {"help": handler}):
+        mock_auth_manager.is_user_allowed.return_value = True
+        await button_callback(mock_callback_update, mock_context)
+    
+    handler.assert_called_once_with(mock_callback_update.callback_query, mock_context, 123456789)
+
+
+@pytest.mark.asyncio
+async def test_button_callback_prefix_dispatch(mock_callback_update, mock_context):
+    """Test prefixed callback data prefers the longest matching prefix."""
+    mock_callback_update.callback_query.data = "fetch_source_abc"
+    
+    with patch('src.auth.auth_manager') as mock_auth_manager, \
+            patch.dict(callbacks.PREFIX_HANDLERS, {"fetch": (
+                ("source_", AsyncMock()),
+                ("", AsyncMock()),
+            )}):
+        fetch_handlers = callbacks.PREFIX_HANDLERS["fetch"]
+        mock_auth_manager.is_user_allowed.return_value = True
+        await button_callback(mock_callback_update, mock_context)
+    
+    fetch_handlers[0][1].assert_called_once_with(
+        mock_callback_update.callback_query, mock_context, 123456789, "fetch_source_abc"
+    )
+    fetch_handlers[1][1].assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_button_callback_unknown(mock_callback_update, mock_context):
+    """Test unknown callback data reports an unknown command."""
+    mock_callback_update.callback_query.data = "check_unknown"
+    
+    with patch('src.auth.auth_manager') as mock_auth_manager:
+        mock_auth_manager.is_user_allowed.return_value = True
+        await button_callback(mock_callback_update, mock_context)
+    
+    mock_callback_update.callback_query.edit_message_text.assert_called_once_with("❌ Unknown command.")
+
+
+@pytest.mark.asyncio
+async def test_sync_all_callback_tolerates_failures(mock_callback_update, mock_context):
+    """Test sync all reports per-source results when one sync raises."""
+    query = mock_callback_update.callback_query
+    
+    with patch('src.handlers.callbacks.backend_client') as mock_backend, \
+            patch('src.handlers.commands.backend_client', mock_backend):
+        mock_backend.get_sources = AsyncMock(return_value={"sources": [
+            {"id": "s1", "name": "Drive", "status": "active"},
+            {"id": "s2", "name": "Slack", "status": "active"},
+            {"id": "s3", "name": "Notion", "status": "paused"},
+        ]})
+        mock_backend.sync_source = AsyncMock(side_effect=[{"status": "ok"}, RuntimeError("boom")])
+        
+        await callbacks.handle_sync_all_callback(query, mock_context, 123)
+    
+    assert mock_backend.sync_source.call_count == 2
+    final_text = query.edit_message_text.call_args[0][0]
+    assert "1/2 sources synced" in final_text
+    assert "✅ Drive" in final_text
+    assert "❌ Slack" in final_text
+
+
+@pytest.mark.asyncio
+async def test_await_with_placeholder():
+    """Test the placeholder is only shown for slow calls."""
+    query = Mock()
+    query.edit_message_text = AsyncMock()
+    
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "slow"
+    
+    async def fast():
+        return "fast"
+    
+    assert await callbacks._await_with_placeholder(query, "Working...", fast()) == "fast"
+    query.edit_message_text.assert_not_called()
+    
+    with patch.object(callbacks, 'PLACEHOLDER_DELAY', 0.01):
+        assert await callbacks._await_with_placeholder(query, "Working...", slow()) == "slow"
+    query.edit_message_text.assert_called_once_with("Working...", parse_mode="Markdown")
+
+
+def test_unwrap():
+    """Test backend results are returned or surfaced as BackendError."""
+    assert callbacks._unwrap({"status": "ok"}) == {"status": "ok"}
+    
+    with pytest.raises(BackendError, match="Request timeout"):
+        callbacks._unwrap({"error": "Request timeout"})
+    
+    with pytest.raises(BackendError, match="Fetch failed"):
+        callbacks._unwrap(None, "Fetch failed")
+
+
+@pytest.mark.asyncio
+async def test_document_page_cache(mock_callback_update, mock_context):
+    """Test rendered document pages are reused until the source is synced."""
+    query = mock_callback_update.callback_query
+    callbacks._document_page_cache.clear()
+    
+    with patch('src.handlers.callbacks.backend_client') as mock_backend:
+        mock_backend.fetch_documents = AsyncMock(return_value={"documents": [
+            {"id": "d1", "name": "Plan", "snippet": "Q3 plan"}
+        ]})
+        
+        await callbacks.fetch_documents_from_source(query, mock_context, 123, "s1")
+        await callbacks.fetch_documents_from_source(query, mock_context, 123, "s1")
+        assert mock_backend.fetch_documents.call_count == 1
+        assert query.edit_message_text.call_args_list[0] == query.edit_message_text.call_args_list[1]
+        
+        callbacks._invalidate_document_pages(123, "s1")
+        await callbacks.fetch_documents_from_source(query, mock_context, 123, "s1")
+        assert mock_backend.fetch_documents.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_button_callback_ignores_duplicates(mock_callback_update, mock_context, callback_storage):
+    """Test a callback delivered twice is only handled once."""
+    mock_callback_update.callback_query.data = "help"
+    mock_callback_update.callback_query.id = "query-1"
+    handler = AsyncMock()
+    callback_storage.set_if_absent.side_effect = [True, False]
+    
+    with patch('src.auth.auth_manager') as mock_auth_manager, \
+            patch.dict(callbacks.EXACT_HANDLERS, {"help": handler}):
+        mock_auth_manager.is_user_allowed.return_value = True
+        await button_callback(mock_callback_update, mock_context)
+        await button_callback(mock_callback_update, mock_context)
+    
+    handler.assert_called_once()
+    callback_storage.set_if_absent.assert_called_with(
+        "cb:123456789:query-1", 1, callbacks.CALLBACK_DEDUP_TTL
+    )
+
+
+def test_static_keyboard_serializes_once():
+    """Test static keyboards reuse their precomputed dict."""
+    keyboard = callbacks.SEARCH_DEMO_KEYBOARD
+    
+    assert keyboard.to_dict() is keyboard.to_dict()
+    assert keyboard.to_dict() == InlineKeyboardMarkup.to_dict(keyboard)
+    assert keyboard.to_json() is keyboard.to_json()
+    assert orjson.loads(keyboard.to_json()) == InlineKeyboardMarkup.to_dict(keyboard)
+
+
+@pytest.mark.asyncio
+async def test_fetch_status_falls_back_to_last_good():
+    """Test failed status lookups reuse the last successful responses."""
+    callbacks._last_system_status = {}
+    callbacks._last_user_status.clear()
+    
+    with patch('src.handlers.callbacks.backend_client') as mock_backend:
+        mock_backend.get_system_status = AsyncMock(return_value={"backend": True})
+        mock_backend.get_user_status = AsyncMock(return_value={"connected_sources": 2})
+        assert await callbacks._fetch_status(123) == ({"backend": True}, {"connected_sources": 2}, False)
+        
+        mock_backend.get_system_status = AsyncMock(return_value={"error": "Request timeout"})
+        mock_backend.get_user_status = AsyncMock(side_effect=RuntimeError("boom"))
+        assert await callbacks._fetch_status(123) == ({"backend": True}, {"connected_sources": 2}, True)
+        
+        # Nothing cached for this user, so only the system status is stale
+        assert await callbacks._fetch_status(456) == ({"backend": True}, {}, True)
+
+
+@pytest.mark.asyncio
+async def test_detailed_stats_fills_defaults(mock_callback_update, mock_context):
+    """Test detailed stats escape values and fall back to defaults for missing fields."""
+    query = mock_callback_update.callback_query
+    
+    with patch('src.handlers.callbacks._fetch_status',
+               AsyncMock(return_value=({"uptime": "3d"}, {"connected_sources": 4, "storage_used": "<5 MB>"}, False))):
+        await callbacks.handle_detailed_stats_callback(query, mock_context, 123)
+    
+    text = query.edit_message_text.call_args[0][0]
+    assert "• Uptime: 3d" in text
+    assert "• Connected Sources: 4" in text
+    assert "• API Response Time: N/A" in text
+    assert "• Storage Used: &lt;5 MB&gt;" in text
+    assert query.edit_message_text.call_args[1]["reply_markup"] == callbacks.BACK_TO_STATUS_KEYBOARD.to_json()
+
+
+@pytest.mark.asyncio
+async def test_refresh_status_skips_unchanged_edit(mock_callback_update, mock_context):
+    """Test refreshing an unchanged status does not edit the message again."""
+    query = mock_callback_update.callback_query
+    query.message.message_id = 42
+    
+    with patch('src.handlers.callbacks._fetch_status',
+               AsyncMock(return_value=({"backend": True}, {"connected_sources": 1}, False))) as mock_fetch:
+        await callbacks.handle_refresh_status_callback(query, mock_context, 123)
+        await callbacks.handle_refresh_status_callback(query, mock_context, 123)
+        assert query.edit_message_text.call_count == 1
+        
+        mock_fetch.return_value = ({"backend": True}, {"connected_sources": 2}, False)
+        await callbacks.handle_refresh_status_callback(query, mock_context, 123)
+        assert query.edit_message_text.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_request_status_uses_dashboard():
+    """Test the dashboard call replaces the two status calls when enabled."""
+    with patch('src.handlers.callbacks.backend_client') as mock_backend, \
+            patch.object(callbacks.settings, 'backend_dashboard_enabled', True):
+        mock_backend.get_dashboard = AsyncMock(return_value={
+            "system": {"backend": True}, "user": {"connected_sources": 3}
+        })
+        mock_backend.get_system_status = AsyncMock(return_value={"backend": False})
+        mock_backend.get_user_status = AsyncMock(return_value={"connected_sources": 1})
+        
+        assert await callbacks._request_status(123) == ({"backend": True}, {"connected_sources": 3})
+        mock_backend.get_system_status.assert_not_called()
+        
+        # A failed dashboard falls back to the separate calls
+        mock_backend.get_dashboard = AsyncMock(return_value={"error": "Endpoint not found"})
+        assert await callbacks._request_status(123) == ({"backend": False}, {"connected_sources": 1})
+
+
+def test_render_html_matches_template():
+    """Test split templates render like format_map with escaped values."""
+    values = {**callbacks.STATS_DEFAULTS, "storage_used": "<5 MB>", "requests": 7}
+    escaped = {key: html.escape(str(value)) for key, value in values.items()}
+    
+    assert callbacks._render_html(callbacks.STATS_PARTS, values) == \
+        callbacks.STATS_TEMPLATE.format_map(escaped)
+
+
+def test_render_stats_memoizes_values():
+    """Test identical stats values reuse the earlier render."""
+    callbacks._render_stats_values.cache_clear()
+    
+    first = callbacks._render_stats({"uptime": "3d"}, {"connected_sources": 4})
+    assert callbacks._render_stats({"uptime": "3d", "backend": True}, {"connected_sources": 4}) is first
+    assert callbacks._render_stats_values.cache_info().hits == 1
+    
+    # Unhashable values are rendered without the cache
+    assert "[1, 2]" in callbacks._render_stats({"uptime": [1, 2]}, {})
+
+
+@pytest.mark.asyncio
+async def test_guarded_status_times_out_and_trips_breaker(status_breaker):
+    """Test hung status lookups time out and repeated failures skip the backend."""
+    async def hung():
+        await asyncio.sleep(10)
+    
+    backend = AsyncMock(return_value={"backend": True})
+    
+    with patch.object(callbacks, 'STATUS_TIMEOUT', 0.01):
+        for _ in range(callbacks.STATUS_FAIL_THRESHOLD):
+            assert await callbacks._guarded_status(hung(), status_breaker) == {"error": "Request timeout"}
+    
+    assert status_breaker.is_open
+    assert await callbacks._guarded_status(backend(), status_breaker) == {"error": "Status backend unavailable"}
+    assert not callbacks._system_status_breaker.is_open
+
+
+@pytest.mark.asyncio
+async def test_guarded_status_per_user_errors_leave_breaker_closed(status_breaker):
+    """Test a user's repeated 404s don't open the breaker for everyone."""
+    not_found = AsyncMock(return_value={"error": "Endpoint not found"})
+    
+    for _ in range(callbacks.STATUS_FAIL_THRESHOLD * 2):
+        assert await callbacks._guarded_status(not_found(), status_breaker) == {"error": "Endpoint not found"}
+    
+    assert not status_breaker.is_open
+    assert status_breaker.failures == 0
+    
+    server_error = AsyncMock(return_value={"error": "Request failed with status 503"})
+    for _ in range(callbacks.STATUS_FAIL_THRESHOLD):
+        await callbacks._guarded_status(server_error(), status_breaker)
+    assert status_breaker.is_open
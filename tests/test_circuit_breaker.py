@@ -0,0 +1,27 @@
+"""
+Tests for the circuit breaker.
+"""
+from unittest.mock import patch
+
+from src.circuit_breaker import CircuitBreaker
+
+
+def test_circuit_breaker_opens_and_recovers():
+    """Test the breaker opens after consecutive failures and closes on a trial success."""
+    breaker = CircuitBreaker(fail_threshold=2, reset_after=30.0)
+    
+    with patch('src.circuit_breaker.time.monotonic', return_value=100.0) as mock_time:
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.is_open
+        assert not breaker.allow()
+        
+        # One trial call per window once reset_after has passed
+        mock_time.return_value = 130.0
+        assert breaker.allow()
+        assert not breaker.allow()
+        
+        breaker.record_success()
+        assert not breaker.is_open
+        assert breaker.allow()
@@ -1,6 +1,8 @@
 """
 Tests for command handlers.
 """
+import asyncio
+
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 
@@ -8,7 +10,21 @@ from src.handlers.commands import (
     start_command,
     help_command,
     search_command,
-    format_search_response
+    upload_command,
+    fetch_command,
+    show_admin_users,
+    format_search_response,
+    split_long_message,
+    reply_long_message,
+    invalidate_search_cache,
+    get_sources_cached,
+    delete_message_later,
+    search_cache_key,
+    FORMAT_IN_THREAD_MIN_ITEMS,
+    FORMATTED_KEY,
+    SEARCH_CACHE_TTL,
+    SOURCES_CACHE_TTL,
+    SOURCES_PREFETCH_TTL
 )
 
 
@@ -88,6 +104,28 @@ async def test_search_command_backend_error(mock_update, mock_context, mock_auth
             assert "Search failed" in call_args[0][0]
 
 
+@pytest.mark.asyncio
+async def test_search_command_failure_removes_loading_message(mock_update, mock_context, mock_storage):
+    """Test a search that raises still cleans up the concurrently sent loading message."""
+    mock_update.message.reply_text = AsyncMock(return_value=Mock(message_id=42))
+    mock_context.bot.delete_message = AsyncMock()
+    mock_context.args = ["test"]
+    
+    with patch('src.auth.auth_manager') as mock_auth_manager, \
+            patch('src.handlers.commands.state_storage', mock_storage), \
+            patch('src.handlers.commands.backend_client') as mock_backend:
+        mock_auth_manager.is_user_allowed.return_value = True
+        mock_backend.search = AsyncMock(side_effect=RuntimeError("boom"))
+        
+        await search_command(mock_update, mock_context)
+        # Let the background delete run
+        await asyncio.sleep(0)
+    
+    mock_context.bot.send_chat_action.assert_called_once()
+    mock_context.bot.delete_message.assert_called_once_with(chat_id=123456789, message_id=42)
+    assert "Search error" in mock_update.message.reply_text.call_args[0][0]
+
+
 def test_format_search_response():
     """Test search response formatting."""
     result = {
@@ -128,3 +166,291 @@ def test_format_search_response_empty():
     response = format_search_response(result)
     
     assert "No results found" in response
+
+
+@pytest.mark.asyncio
+async def test_format_search_response_max_length():
+    """Test search response formatting stops at the length budget."""
+    result = {
+        "answer": "Test answer",
+        "citations": [
+            {"id": i, "title": f"Doc {i}", "url": f"https://example.com/{i}", "snippet": "x" * 200}
+            for i in range(100)
+        ]
+    }
+    
+    response = await format_search_response(result, max_length=1000)
+    
+    assert len(response) == 1000
+    assert response.endswith("... (truncated)")
+    assert "Test answer" in response
+
+
+@pytest.mark.asyncio
+async def test_format_search_response_citation_lines():
+    """Test citation lines with and without a URL, title and snippet."""
+    result = {
+        "answer": "Answer",
+        "citations": [
+            {"id": 7, "title": "Spec", "url": "https://example.com", "source": "Drive"},
+            {"snippet": "line one\nline two"}
+        ]
+    }
+    
+    response = await format_search_response(result)
+    
+    assert "[7] [Spec](https://example.com)\n    📂 Drive\n\n" in response
+    assert "[2] Document 2\n    📂 Unknown | line one line two\n\n" in response
+
+
+@pytest.mark.asyncio
+async def test_format_search_response_offloads_large_results():
+    """Test only large results are formatted in a worker thread."""
+    small = {"answer": "Answer", "citations": [{"title": "Doc"}]}
+    large = {"answer": "Answer", "citations": [{"title": f"Doc {i}"} for i in range(FORMAT_IN_THREAD_MIN_ITEMS)]}
+    
+    with patch('src.handlers.commands.asyncio.to_thread', wraps=asyncio.to_thread) as mock_to_thread:
+        assert "Doc" in await format_search_response(small)
+        mock_to_thread.assert_not_called()
+        
+        assert "Doc 0" in await format_search_response(large)
+        mock_to_thread.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_format_search_response_reuses_rendering():
+    """Test a stored rendering is returned only for the query it was made for."""
+    result = {"answer": "Answer", FORMATTED_KEY: ["revenue", "cached text"]}
+    
+    assert await format_search_response(result, "revenue") == "cached text"
+    assert "Answer" in await format_search_response(result, "Revenue")
+    assert "Answer" in await format_search_response(result, "revenue", max_length=1000)
+
+
+@pytest.mark.asyncio
+async def test_search_command_caches_rendered_response(mock_update, mock_context, mock_storage, mock_backend_client):
+    """Test a fresh search is cached together with its rendered text."""
+    mock_context.args = ["test", "query"]
+    
+    with patch('src.auth.auth_manager') as mock_auth_manager, \
+            patch('src.handlers.commands.state_storage', mock_storage), \
+            patch('src.handlers.commands.backend_client', mock_backend_client):
+        mock_auth_manager.is_user_allowed.return_value = True
+        
+        await search_command(mock_update, mock_context)
+    
+    stored = mock_storage.set.call_args[0][1]
+    sent = mock_update.message.reply_text.call_args_list[-1][0][0]
+    assert stored[FORMATTED_KEY] == ["test query", sent]
+
+
+@pytest.mark.asyncio
+async def test_search_cache_key_normalizes_and_versions(mock_storage):
+    """Test search cache keys ignore case/whitespace and change on invalidation."""
+    with patch('src.handlers.commands.state_storage', mock_storage):
+        key = await search_cache_key(123, "Quarterly  Revenue")
+        assert key == await search_cache_key(123, " quarterly revenue ")
+        assert key != await search_cache_key(456, "quarterly revenue")
+        
+        await invalidate_search_cache(123)
+        version_key, version, ttl = mock_storage.set.call_args[0]
+        assert version_key == "searchver:123"
+        assert ttl == SEARCH_CACHE_TTL
+        
+        mock_storage.get.return_value = version
+        assert await search_cache_key(123, "quarterly revenue") != key
+
+
+def test_split_long_message():
+    """Test long messages split on line boundaries within the length limit."""
+    text = "\n".join(f"line {i}" for i in range(100))
+    
+    chunks = split_long_message(text, max_length=50)
+    
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    assert "\n".join(chunks) == text
+    assert split_long_message("short", max_length=50) == ["short"]
+
+
+def test_split_long_message_without_newlines():
+    """Test text without line breaks splits at spaces, or mid-word if it must."""
+    text = " ".join(f"word{i}" for i in range(50))
+    
+    chunks = split_long_message(text, max_length=50)
+    
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    assert " ".join(chunks) == text
+    assert split_long_message("x" * 120, max_length=50) == ["x" * 50, "x" * 50, "x" * 20]
+
+
+def test_split_long_message_overlong_line():
+    """Test a single line longer than the limit never produces an oversized chunk."""
+    chunks = split_long_message("head\n" + "y" * 120 + "\ntail", max_length=50)
+    
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    assert "".join(chunks).replace("\n", "") == "head" + "y" * 120 + "tail"
+
+
+def test_split_long_message_skips_blank_chunks():
+    """Test a run of blank lines at a chunk boundary doesn't yield an empty message."""
+    chunks = split_long_message("a" * 49 + "\n\n" + "b" * 60, max_length=50)
+    
+    assert chunks == ["a" * 49, "b" * 50, "b" * 10]
+
+
+@pytest.mark.asyncio
+async def test_reply_long_message_sends_chunks_in_order(mock_update, mock_context):
+    """Test long replies are split and sent in order, the first as a reply."""
+    text = "\n".join("x" * 100 for _ in range(100))
+    
+    # Skip the outbound limiter's pacing between chunks
+    with patch('src.rate_limit.asyncio.sleep', new=AsyncMock()):
+        await reply_long_message(mock_update, mock_context, text)
+    
+    first = mock_update.message.reply_text.call_args[0][0]
+    rest = [c[1]["text"] for c in mock_context.bot.send_message.call_args_list]
+    assert "\n".join([first] + rest) == text
+    assert len(rest) >= 2
+
+
+@pytest.mark.asyncio
+async def test_reply_long_message_attaches_markup_to_last_chunk(mock_update, mock_context):
+    """Test a keyboard goes on the final chunk only, or on a single reply."""
+    markup = Mock()
+    
+    # Skip the outbound limiter's pacing between chunks
+    with patch('src.rate_limit.asyncio.sleep', new=AsyncMock()):
+        await reply_long_message(mock_update, mock_context, "\n".join("x" * 100 for _ in range(100)), markup)
+        
+        assert mock_update.message.reply_text.call_args[1]["reply_markup"] is None
+        sends = mock_context.bot.send_message.call_args_list
+        assert [c[1]["reply_markup"] for c in sends] == [None] * (len(sends) - 1) + [markup]
+        
+        await reply_long_message(mock_update, mock_context, "short", markup)
+        assert mock_update.message.reply_text.call_args[1]["reply_markup"] is markup
+
+
+@pytest.mark.asyncio
+async def test_reply_long_message_edits_indicator(mock_update, mock_context):
+    """Test the first chunk replaces a given indicator message's text."""
+    indicator = Mock()
+    indicator.edit_text = AsyncMock()
+    text = "\n".join("x" * 100 for _ in range(100))
+    
+    # Skip the outbound limiter's pacing between chunks
+    with patch('src.rate_limit.asyncio.sleep', new=AsyncMock()):
+        await reply_long_message(mock_update, mock_context, text, edit_message=indicator)
+    
+    mock_update.message.reply_text.assert_not_called()
+    first = indicator.edit_text.call_args[0][0]
+    rest = [c[1]["text"] for c in mock_context.bot.send_message.call_args_list]
+    assert "\n".join([first] + rest) == text
+
+
+@pytest.mark.asyncio
+async def test_get_sources_cached():
+    """Test source lists are served from Redis and only successes are cached."""
+    sources = {"sources": [{"id": "s1", "name": "Drive"}]}
+    
+    with patch('src.handlers.commands.backend_client') as mock_backend, \
+            patch('src.handlers.commands.state_storage') as mock_storage:
+        mock_backend.get_sources = AsyncMock(return_value=sources)
+        mock_storage.set = AsyncMock()
+        
+        # Cache hit skips the backend
+        mock_storage.get = AsyncMock(return_value=sources)
+        assert await get_sources_cached(123) == sources
+        mock_backend.get_sources.assert_not_called()
+        
+        # Cache miss fetches and stores the result
+        mock_storage.get = AsyncMock(return_value=None)
+        assert await get_sources_cached(123) == sources
+        mock_storage.set.assert_called_once_with("sources:123", sources, SOURCES_CACHE_TTL)
+        
+        # Backend errors are not cached
+        mock_storage.set.reset_mock()
+        mock_backend.get_sources = AsyncMock(return_value={"error": "Request timeout"})
+        assert await get_sources_cached(123) == {"error": "Request timeout"}
+        mock_storage.set.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_delete_message_later_ignores_failures(mock_context):
+    """Test background deletes run without being awaited and swallow errors."""
+    mock_context.bot.delete_message = AsyncMock(side_effect=RuntimeError("gone"))
+    
+    delete_message_later(mock_context, 1, 2)
+    await asyncio.sleep(0)
+    
+    mock_context.bot.delete_message.assert_called_once_with(chat_id=1, message_id=2)
+
+
+@pytest.mark.asyncio
+async def test_start_command_prefetches_sources(mock_update, mock_context, mock_storage):
+    """Test /start warms the source list cache in the background."""
+    with patch('src.auth.auth_manager') as mock_auth_manager, \
+            patch('src.handlers.commands.conversation_state') as mock_conv_state, \
+            patch('src.handlers.commands.state_storage', mock_storage), \
+            patch('src.handlers.commands.backend_client') as mock_backend:
+        mock_auth_manager.is_user_allowed.return_value = True
+        mock_conv_state.clear_state = AsyncMock()
+        mock_backend.get_sources = AsyncMock(return_value={"sources": []})
+        
+        await start_command(mock_update, mock_context)
+        await asyncio.sleep(0)
+    
+    mock_backend.get_sources.assert_called_once_with(123456789)
+    mock_storage.set.assert_called_once_with("sources:123456789", {"sources": []}, SOURCES_PREFETCH_TTL)
+
+
+@pytest.mark.asyncio
+async def test_upload_command_enters_flow(mock_update, mock_context):
+    """Test /upload sets the upload flow alongside its reply."""
+    with patch('src.auth.auth_manager') as mock_auth_manager, \
+            patch('src.handlers.commands.conversation_state') as mock_conv_state:
+        mock_auth_manager.is_user_allowed.return_value = True
+        mock_conv_state.set_flow = AsyncMock()
+        
+        await upload_command(mock_update, mock_context)
+    
+    mock_conv_state.set_flow.assert_called_once_with(123456789, "upload_file")
+    assert "Upload File" in mock_update.message.reply_text.call_args[0][0]
+
+
+@pytest.mark.asyncio
+async def test_fetch_command_lists_only_active_sources(mock_update, mock_context):
+    """Test /fetch offers a button per active source plus cancel."""
+    sources = {"sources": [
+        {"id": "s1", "name": "Drive", "platform": "google", "status": "active"},
+        {"id": "s2", "name": "Slack", "status": "paused"},
+        {"id": "s3", "name": "Wiki", "status": "active"},
+    ]}
+    
+    with patch('src.auth.auth_manager') as mock_auth_manager, \
+            patch('src.handlers.commands.get_sources_cached', new=AsyncMock(return_value=sources)):
+        mock_auth_manager.is_user_allowed.return_value = True
+        
+        await fetch_command(mock_update, mock_context)
+    
+    keyboard = mock_update.message.reply_text.call_args[1]["reply_markup"].inline_keyboard
+    assert [(row[0].text, row[0].callback_data) for row in keyboard] == [
+        ("📁 Drive (google)", "fetch_source_s1"),
+        ("📁 Wiki", "fetch_source_s3"),
+        ("❌ Cancel", "cancel"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_show_admin_users_rerenders_after_change(mock_update, mock_context, mock_auth_manager):
+    """Test the /admin users list is reused until the whitelist changes."""
+    with patch('src.auth.auth_manager', mock_auth_manager):
+        await show_admin_users(mock_update, mock_context)
+        first = mock_update.message.reply_text.call_args[0][0]
+        await show_admin_users(mock_update, mock_context)
+        assert mock_update.message.reply_text.call_args[0][0] is first
+        
+        mock_auth_manager.add_user(555)
+        await show_admin_users(mock_update, mock_context)
+    
+    text = mock_update.message.reply_text.call_args[0][0]
+    assert text.endswith("👤 `555`\n👑 `123456789`\n👤 `987654321`\n")
@@ -0,0 +1,124 @@
+"""
+Tests for file upload handlers.
+"""
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+
+from telegram.error import TimedOut
+
+from src.handlers.files import handle_file_upload
+
+
+@pytest.fixture
+def document_update(mock_update):
+    """Update carrying a small PDF document."""
+    document = mock_update.message.document
+    document.file_name = "report.pdf"
+    document.file_size = 1024
+    document.file_id = "file_1"
+    telegram_file = Mock()
+    telegram_file.download_as_bytearray = AsyncMock(return_value=bytearray(b"%PDF"))
+    document.get_file = AsyncMock(return_value=telegram_file)
+    mock_update.message.caption = None
+    return mock_update
+
+
+@pytest.mark.asyncio
+async def test_upload_survives_failed_status_edit(document_update, mock_context, mock_backend_client):
+    """A status edit that fails doesn't abort the backend upload."""
+    processing_msg = Mock()
+    processing_msg.edit_text = AsyncMock(side_effect=[TimedOut(), None])
+    document_update.message.reply_text = AsyncMock(return_value=processing_msg)
+    
+    with patch('src.auth.auth_manager') as mock_auth, \
+         patch('src.handlers.files.conversation_state') as mock_conv_state, \
+         patch('src.handlers.files.backend_client', mock_backend_client), \
+         patch('src.handlers.files.UPLOAD_STATUS_MIN_INTERVAL', 0):
+        mock_auth.is_user_allowed.return_value = True
+        mock_conv_state.get_flow = AsyncMock(return_value="upload_file")
+        mock_conv_state.update_state = AsyncMock()
+        mock_conv_state.clear_state = AsyncMock()
+        
+        await handle_file_upload(document_update, mock_context)
+    
+    assert processing_msg.edit_text.await_count == 2
+    mock_backend_client.upload_file.assert_awaited_once()
+    assert mock_backend_client.upload_file.call_args[1]["file_data"] == b"%PDF"
+    assert "File Uploaded Successfully" in processing_msg.edit_text.call_args[0][0]
+    mock_conv_state.clear_state.assert_awaited_once_with(123456789)
+
+
+@pytest.mark.asyncio
+async def test_fast_upload_skips_intermediate_edits(document_update, mock_context, mock_backend_client):
+    """An upload finishing within the edit interval only edits in the result."""
+    processing_msg = Mock()
+    processing_msg.edit_text = AsyncMock()
+    document_update.message.reply_text = AsyncMock(return_value=processing_msg)
+    
+    with patch('src.auth.auth_manager') as mock_auth, \
+         patch('src.handlers.files.conversation_state') as mock_conv_state, \
+         patch('src.handlers.files.backend_client', mock_backend_client):
+        mock_auth.is_user_allowed.return_value = True
+        mock_conv_state.get_flow = AsyncMock(return_value="upload_file")
+        mock_conv_state.update_state = AsyncMock()
+        mock_conv_state.clear_state = AsyncMock()
+        
+        await handle_file_upload(document_update, mock_context)
+    
+    processing_msg.edit_text.assert_awaited_once()
+    assert "File Uploaded Successfully" in processing_msg.edit_text.call_args[0][0]
+    
+    # Quick actions ride on the success message rather than a second one
+    keyboard = processing_msg.edit_text.call_args[1]["reply_markup"].inline_keyboard
+    assert keyboard[0][0].callback_data == "check_job_test_job_123"
+    mock_context.bot.send_message.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_file_over_download_limit_rejected_before_download(document_update, mock_context, mock_backend_client):
+    """A file the Bot API won't serve is turned away without fetching it."""
+    document_update.message.document.file_size = 30 * 1024 * 1024
+    
+    with patch('src.auth.auth_manager') as mock_auth, \
+         patch('src.handlers.files.conversation_state') as mock_conv_state, \
+         patch('src.handlers.files.backend_client', mock_backend_client), \
+         patch('src.handlers.files.settings') as mock_settings:
+        mock_auth.is_user_allowed.return_value = True
+        mock_conv_state.get_flow = AsyncMock(return_value="upload_file")
+        mock_settings.max_file_size_mb = 50
+        
+        await handle_file_upload(document_update, mock_context)
+    
+    assert "File Too Large" in document_update.message.reply_text.call_args[0][0]
+    assert "Maximum size: 20MB" in document_update.message.reply_text.call_args[0][0]
+    document_update.message.document.get_file.assert_not_called()
+    mock_backend_client.upload_file.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_large_upload_streams_from_temporary_file(document_update, mock_context, mock_backend_client):
+    """A file over the spool threshold is uploaded from a temporary file, closed afterwards."""
+    processing_msg = Mock()
+    processing_msg.edit_text = AsyncMock()
+    document_update.message.reply_text = AsyncMock(return_value=processing_msg)
+    uploaded = {}
+    
+    async def upload_file(**kwargs):
+        uploaded["file"] = kwargs["file_data"]
+        uploaded["content"] = kwargs["file_data"].read()
+        return {"document_id": "doc_456"}
+    
+    mock_backend_client.upload_file = AsyncMock(side_effect=upload_file)
+    
+    with patch('src.auth.auth_manager') as mock_auth, \
+         patch('src.handlers.files.conversation_state') as mock_conv_state, \
+         patch('src.handlers.files.backend_client', mock_backend_client), \
+         patch('src.handlers.files.UPLOAD_SPOOL_MAX_SIZE', 2):
+        mock_auth.is_user_allowed.return_value = True
+        mock_conv_state.get_flow = AsyncMock(return_value="upload_file")
+        mock_conv_state.clear_state = AsyncMock()
+        
+        await handle_file_upload(document_update, mock_context)
+    
+    assert uploaded["content"] == b"%PDF"
+    assert uploaded["file"].closed
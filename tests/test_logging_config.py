@@ -0,0 +1,42 @@
+"""
+Tests for logging configuration.
+"""
+import pytest
+import structlog
+from unittest.mock import patch
+
+from src.logging_config import ErrorSampler
+
+
+def test_error_sampler_limits_repeated_errors():
+    """Test repeated errors beyond the burst are dropped and counted."""
+    sampler = ErrorSampler(rate=1.0, burst=2)
+    
+    with patch('src.logging_config.time.monotonic', return_value=100.0) as mock_time:
+        for _ in range(2):
+            assert sampler(None, "error", {"event": "Backend down"}) == {"event": "Backend down"}
+        for _ in range(3):
+            with pytest.raises(structlog.DropEvent):
+                sampler(None, "error", {"event": "Backend down"})
+        
+        # Other events and levels are unaffected
+        assert sampler(None, "error", {"event": "Other failure"}) == {"event": "Other failure"}
+        assert sampler(None, "info", {"event": "Backend down"}) == {"event": "Backend down"}
+        
+        # Once tokens refill, the next line reports how many were dropped
+        mock_time.return_value = 101.0
+        assert sampler(None, "error", {"event": "Backend down"})["suppressed"] == 3
+
+
+def test_error_sampler_keys_on_passed_exception():
+    """Test an exception passed as exc_info is sampled by its own type."""
+    sampler = ErrorSampler(rate=1.0, burst=1)
+    
+    with patch('src.logging_config.time.monotonic', return_value=100.0):
+        sampler(None, "error", {"event": "Bot error", "exc_info": ValueError()})
+        with pytest.raises(structlog.DropEvent):
+            sampler(None, "error", {"event": "Bot error", "exc_info": ValueError()})
+        
+        # A different exception type has its own budget
+        event = {"event": "Bot error", "exc_info": KeyError()}
+        assert sampler(None, "error", event) is event
@@ -0,0 +1,69 @@
+"""
+Tests for message handlers.
+"""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from telegram.error import BadRequest
+
+from src.handlers.commands import FORMATTED_KEY
+from src.handlers.messages import SEARCH_ERROR_TEXT, handle_natural_language_search
+
+
+@pytest.mark.asyncio
+async def test_natural_language_search_answers_repeats_from_cache(mock_update, mock_context, mock_storage, mock_backend_client):
+    """A cached query skips the backend and the searching indicator."""
+    cached = {"answer": "Cached answer", FORMATTED_KEY: ["revenue report", "Cached answer text"]}
+    mock_storage.get.side_effect = lambda key: cached if key.startswith("search:") else None
+    
+    with patch('src.handlers.messages.state_storage', mock_storage), \
+         patch('src.handlers.commands.state_storage', mock_storage), \
+         patch('src.handlers.messages.backend_client', mock_backend_client), \
+         patch('src.rate_limit.asyncio.sleep', new=AsyncMock()):
+        await handle_natural_language_search(mock_update, mock_context, "revenue report")
+    
+    mock_backend_client.search.assert_not_called()
+    mock_context.bot.send_chat_action.assert_not_called()
+    mock_storage.set.assert_not_called()
+    mock_update.message.reply_text.assert_called_once()
+    assert mock_update.message.reply_text.call_args[0][0] == "Cached answer text"
+
+
+@pytest.mark.asyncio
+async def test_natural_language_search_caches_fresh_results(mock_update, mock_context, mock_storage, mock_backend_client):
+    """A fresh result is cached with its rendering and edited into the indicator."""
+    indicator = AsyncMock()
+    mock_update.message.reply_text = AsyncMock(return_value=indicator)
+    
+    with patch('src.handlers.messages.state_storage', mock_storage), \
+         patch('src.handlers.commands.state_storage', mock_storage), \
+         patch('src.handlers.messages.backend_client', mock_backend_client), \
+         patch('src.rate_limit.asyncio.sleep', new=AsyncMock()):
+        await handle_natural_language_search(mock_update, mock_context, "revenue report")
+    
+    mock_backend_client.search.assert_awaited_once()
+    key, stored, _ = mock_storage.set.call_args[0]
+    assert key.startswith("search:123456789:")
+    assert stored[FORMATTED_KEY] == ["revenue report", indicator.edit_text.call_args[0][0]]
+
+
+@pytest.mark.asyncio
+async def test_natural_language_search_removes_indicator_when_answer_edit_fails(mock_update, mock_context, mock_storage, mock_backend_client):
+    """An answer Telegram rejects doesn't leave the indicator next to the error."""
+    indicator = AsyncMock()
+    indicator.message_id = 42
+    indicator.edit_text.side_effect = BadRequest("Can't parse entities")
+    mock_update.message.reply_text = AsyncMock(return_value=indicator)
+    mock_context.bot.delete_message = AsyncMock()
+    
+    with patch('src.handlers.messages.state_storage', mock_storage), \
+         patch('src.handlers.commands.state_storage', mock_storage), \
+         patch('src.handlers.messages.backend_client', mock_backend_client), \
+         patch('src.rate_limit.asyncio.sleep', new=AsyncMock()):
+        await handle_natural_language_search(mock_update, mock_context, "revenue report")
+    await asyncio.sleep(0)
+    
+    mock_context.bot.delete_message.assert_awaited_once_with(chat_id=123456789, message_id=42)
+    assert mock_update.message.reply_text.call_args[0][0] == SEARCH_ERROR_TEXT
@@ -0,0 +1,87 @@
+"""
+Tests for outbound rate limiting.
+"""
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from telegram.error import RetryAfter, TimedOut
+
+from src.rate_limit import (
+    TokenBucket, OutboundLimiter, CommandLimiter, CHAT_BURST, EDIT_RETRY_DELAYS, safe_edit
+)
+
+
+def test_token_bucket_reserve():
+    """Test reservations are free within the burst and delayed beyond it."""
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    now = bucket.updated
+    
+    assert bucket.reserve(now) == 0.0
+    assert bucket.reserve(now) == 0.0
+    assert bucket.reserve(now) == pytest.approx(1.0)
+    assert bucket.reserve(now) == pytest.approx(2.0)
+    
+    # Tokens refill over time
+    assert bucket.reserve(now + 4) == 0.0
+    assert bucket.is_idle(now + 10)
+
+
+@pytest.mark.asyncio
+async def test_limiter_spaces_calls_per_chat():
+    """Test calls beyond a chat's burst wait while other chats do not."""
+    limiter = OutboundLimiter()
+    
+    with patch('src.rate_limit.asyncio.sleep', new=AsyncMock()) as mock_sleep:
+        for _ in range(CHAT_BURST):
+            await limiter.acquire(1)
+        mock_sleep.assert_not_called()
+        
+        await limiter.acquire(2)
+        mock_sleep.assert_not_called()
+        
+        await limiter.acquire(1)
+        mock_sleep.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_limiter_retries_once_after_retry_after():
+    """Test RetryAfter pauses the chat and the call is retried once."""
+    limiter = OutboundLimiter()
+    func = AsyncMock(side_effect=[RetryAfter(5), "ok"])
+    
+    with patch('src.rate_limit.asyncio.sleep', new=AsyncMock()) as mock_sleep:
+        assert await limiter.call(1, func, "text") == "ok"
+    
+    assert func.call_count == 2
+    assert mock_sleep.call_args[0][0] == pytest.approx(5, abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_safe_edit_retries_timeouts():
+    """Test timed out edits are retried with backoff."""
+    query = Mock()
+    query.edit_message_text = AsyncMock(side_effect=[TimedOut(), TimedOut(), "ok"])
+    
+    with patch('src.rate_limit.asyncio.sleep', new=AsyncMock()) as mock_sleep:
+        assert await safe_edit(query, "text") == "ok"
+    
+    assert query.edit_message_text.call_count == 3
+    assert [c[0][0] for c in mock_sleep.call_args_list] == list(EDIT_RETRY_DELAYS[:2])
+
+
+def test_command_limiter_rejects_over_budget():
+    """Test a user's command budget is enforced per command and refills."""
+    limiter = CommandLimiter(limit=2, period=10.0)
+    
+    with patch('src.rate_limit.time.monotonic', return_value=100.0):
+        assert limiter.check(1, "search") == 0.0
+        assert limiter.check(1, "search") == 0.0
+        assert limiter.check(1, "search") == pytest.approx(5.0)
+        
+        # Other commands and users have their own budgets
+        assert limiter.check(1, "process") == 0.0
+        assert limiter.check(2, "search") == 0.0
+    
+    # A rejected attempt does not use up a token
+    with patch('src.rate_limit.time.monotonic', return_value=105.0):
+        assert limiter.check(1, "search") == 0.0
@@ -0,0 +1,29 @@
+"""
+Tests for the webhook server.
+"""
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from src.server import app
+
+
+def test_webhook_passes_raw_update_through():
+    """Test the webhook hands the full parsed update to the processor."""
+    update = {"update_id": 1, "edited_message": {"message_id": 2, "text": "hi"}}
+    
+    with patch('src.server.verify_webhook_secret', new=AsyncMock(return_value=True)), \
+            patch('src.server.process_telegram_update', new=AsyncMock()) as mock_process:
+        response = TestClient(app).post("/telegram/webhook", json=update)
+    
+    assert response.status_code == 200
+    mock_process.assert_called_once_with(update)
+
+
+def test_webhook_rejects_invalid_update():
+    """Test bodies that aren't a Telegram update are rejected."""
+    with patch('src.server.verify_webhook_secret', new=AsyncMock(return_value=True)):
+        client = TestClient(app)
+        assert client.post("/telegram/webhook", content=b"not json").status_code == 400
+        assert client.post("/telegram/webhook", json={"message": {}}).status_code == 400
+        assert client.post("/telegram/webhook", json=[1]).status_code == 400
@@ -0,0 +1,80 @@
+"""
+Tests for state storage.
+"""
+import asyncio
+
+import pytest
+import redis.asyncio as redis
+from unittest.mock import patch
+
+from src.redis_pool import redis_pool
+from src.storage import RedisStateStorage
+
+
+@pytest.mark.asyncio
+async def test_set_flow_writes_fields_without_reading(mock_conversation_state, mock_storage):
+    """Test flow updates are a single hash write."""
+    await mock_conversation_state.set_flow(123, "connecting", {"platform": "drive"})
+    
+    mock_storage.get_fields.assert_not_called()
+    mock_storage.set_fields.assert_called_once()
+    key, fields, ttl = mock_storage.set_fields.call_args[0]
+    assert key == "convstate:123:main"
+    assert fields["current_flow"] == "connecting"
+    assert fields["flow_data"] == {"platform": "drive"}
+    assert "updated_at" in fields
+    assert ttl == mock_conversation_state.default_ttl
+
+
+@pytest.mark.asyncio
+async def test_get_flow(mock_conversation_state, mock_storage):
+    """Test flow is read as a single hash field, not the whole state."""
+    mock_storage.get_field.side_effect = lambda key, field: {"current_flow": "upload_file"}.get(field)
+    
+    assert await mock_conversation_state.get_flow(123) == "upload_file"
+    assert await mock_conversation_state.get_flow_data(123) == {}
+    mock_storage.get_field.assert_called_with("convstate:123:main", "flow_data")
+    mock_storage.get_fields.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_redis_pool_waits_for_free_connection():
+    """Test a burst past max_connections waits instead of failing as a miss."""
+    in_use = 0
+    peak = 0
+    
+    class FakeConnection(redis.Connection):
+        """Connection that answers every command after a short delay."""
+        
+        async def connect(self):
+            pass
+        
+        async def disconnect(self, nowait: bool = False):
+            pass
+        
+        async def can_read_destructive(self):
+            return False
+        
+        async def send_command(self, *args, **kwargs):
+            nonlocal in_use, peak
+            in_use += 1
+            peak = max(peak, in_use)
+        
+        async def read_response(self, *args, **kwargs):
+            nonlocal in_use
+            await asyncio.sleep(0.01)
+            in_use -= 1
+            return '"cached"'
+    
+    pool = type(redis_pool)(
+        connection_class=FakeConnection,
+        max_connections=2,
+        timeout=redis_pool.timeout
+    )
+    storage = RedisStateStorage()
+    
+    with patch('src.storage.redis_pool', pool):
+        results = await asyncio.gather(*(storage.get(f"key:{i}") for i in range(10)))
+    
+    assert results == ["cached"] * 10
+    assert peak <= 2